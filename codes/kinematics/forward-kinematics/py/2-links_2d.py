@@ -2,11 +2,17 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "toolkit"))
+from blit_render import SliderRenderer  # blitted, rate-limited slider redraws
+from trajectory_recorder import session_from_env  # record / replay sessions
+from latency import instrument  # ARM_PROFILE=1: per-call latency histograms
 
 # --- predefined link lengths (in arbitrary units) ---
 L1 = 1.5
 L2 = 1.0
 
+@instrument
 def fk(theta1, theta2):
     """Forward kinematics for a 2R planar arm (angles in radians)."""
     x1 = L1*np.cos(theta1)
@@ -44,16 +50,20 @@ slider_ax2 = plt.axes([0.15, 0.01, 0.7, 0.03])
 s_theta1 = Slider(slider_ax1, 'θ1 (deg)', -180.0, 180.0, valinit=np.rad2deg(theta1_0))
 s_theta2 = Slider(slider_ax2, 'θ2 (deg)', -180.0, 180.0, valinit=np.rad2deg(theta2_0))
 
+@instrument
 def update(_):
     th1 = np.deg2rad(s_theta1.val)
     th2 = np.deg2rad(s_theta2.val)
     b, j, e = fk(th1, th2)
     link_line.set_data([b[0], j[0], e[0]], [b[1], j[1], e[1]])
     ee_text.set_text(f"EE: x={e[0]:.3f}, y={e[1]:.3f}\nθ1={np.rad2deg(th1):.1f}°, θ2={np.rad2deg(th2):.1f}°")
-    plt.draw()
 
-s_theta1.on_changed(update)
-s_theta2.on_changed(update)
+# the renderer hooks up the sliders, calls update() at most once per display
+# frame and blits only the arm and EE text (ARM_RENDER=draw: full redraws)
+renderer = SliderRenderer(plt.gcf(), [link_line, ee_text], update,
+                          sliders=[s_theta1, s_theta2])
+# ARM_RECORD=file.bin records the slider moves, ARM_REPLAY=file.bin plays them back
+session = session_from_env(plt.gcf(), [s_theta1, s_theta2])
 update(None)
 
 plt.show()
@@ -2,24 +2,22 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "toolkit"))
+from blit_render import SliderRenderer  # blitted, rate-limited slider redraws
+from trajectory_recorder import session_from_env  # record / replay sessions
+from rotations import rot_y, rot_z  # batched rotation matrices
+from latency import instrument  # ARM_PROFILE=1: per-call latency histograms
 from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 (needed for 3D)
 
 # --------- link lengths (units) ----------
 L1 = 1.5
 L2 = 1.0
 
-def Rz(t):
-    c, s = np.cos(t), np.sin(t)
-    return np.array([[c,-s,0],
-                     [s, c,0],
-                     [0, 0,1]])
-
-def Ry(t):
-    c, s = np.cos(t), np.sin(t)
-    return np.array([[ c,0, s],
-                     [ 0,1, 0],
-                     [-s,0, c]])
+# Rz / Ry are shared with the other 3D tools (toolkit/rotations.py)
+Rz, Ry = rot_z, rot_y
 
+@instrument
 def fk_3d(q_yaw, q_sh, q_el):
     """Return 3D points (base, joint, ee) for a 2-link arm with
        base-yaw (about z), then shoulder pitch (about y), then elbow pitch (about y)."""
@@ -60,6 +58,7 @@ s_yaw = Slider(ax_yaw, 'yaw (°)', -180, 180, valinit=yaw0)
 s_sh  = Slider(ax_sh,  'shoulder (°)', -179, 179, valinit=sh0)
 s_el  = Slider(ax_el,  'elbow (°)',   -179, 179, valinit=el0)
 
+@instrument
 def update(_):
     q0 = np.deg2rad(s_yaw.val)
     q1 = np.deg2rad(s_sh.val)
@@ -70,9 +69,11 @@ def update(_):
                      [b[2], j[2], e[2]])
     txt.set_text(f"EE: x={e[0]:.3f}, y={e[1]:.3f}, z={e[2]:.3f}\n"
                  f"yaw={s_yaw.val:.1f}°, sh={s_sh.val:.1f}°, el={s_el.val:.1f}°")
-    fig.canvas.draw_idle()
 
-for s in (s_yaw, s_sh, s_el):
-    s.on_changed(update)
+# the renderer hooks up the sliders, calls update() at most once per display
+# frame and blits only the arm and EE text (ARM_RENDER=draw: full redraws)
+renderer = SliderRenderer(fig, [line, txt], update, sliders=[s_yaw, s_sh, s_el])
+# ARM_RECORD=file.bin records the slider moves, ARM_REPLAY=file.bin plays them back
+session = session_from_env(fig, [s_yaw, s_sh, s_el])
 update(None)
 plt.show()
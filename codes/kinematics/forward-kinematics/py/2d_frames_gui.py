@@ -5,31 +5,14 @@
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
-from math import cos, sin, radians
+from math import radians
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
-
-# ---------- 2D transform helpers (3x3 homogeneous) ----------
-def T_translate(dx, dy):
-    T = np.eye(3)
-    T[:2, 2] = [dx, dy]
-    return T
-
-def Rz(theta_deg):
-    t = radians(theta_deg)
-    c, s = cos(t), sin(t)
-    T = np.eye(3)
-    T[:2, :2] = np.array([[c, -s],
-                          [s,  c]])
-    return T
-
-def frame_axes_points(T, length=1.0):
-    """Return line segments ((x0,y0)->(x1,y1)) for X(red) and Y(green) axes in world coords."""
-    o = T[:2, 2]
-    R = T[:2, :2]
-    x_end = o + R @ np.array([length, 0.0])
-    y_end = o + R @ np.array([0.0, length])
-    return (o, x_end), (o, y_end)
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "toolkit"))
+from rigid import RigidTransform  # closed-form SE(2) composition
+from latency import instrument  # ARM_PROFILE=1: per-call latency histograms
 
 # ---------- App ----------
 class Frames2DApp:
@@ -39,6 +22,11 @@ class Frames2DApp:
 
         # State: list of world transforms (3x3), start with base at origin
         self.frames = [np.eye(3)]
+        # Origins and rotation matrices of all frames, in growable arrays so a
+        # redraw never has to walk the frame list
+        self._origins = np.zeros((16, 2))
+        self._rots = np.zeros((16, 2, 2))
+        self._store_frame(0, self.frames[0])
 
         # --- Controls ---
         panel = ttk.Frame(root, padding=8)
@@ -63,11 +51,30 @@ class Frames2DApp:
         ttk.Button(panel, text="Reset", command=self.reset).grid(row=r, column=2, sticky="ew", pady=(6,0))
         ttk.Button(panel, text="Fit View", command=self.fit_view).grid(row=r, column=3, sticky="ew", pady=(6,0))
 
+        r += 1
+        self.labels_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(panel, text="Labels", variable=self.labels_var,
+                        command=self.toggle_labels).grid(row=r, column=0, columnspan=2, sticky="w", pady=(6,0))
+
         # --- Matplotlib canvas (2D) ---
         fig = Figure(figsize=(6.2, 6.2), dpi=100)
         self.ax = fig.add_subplot(111)
         self.ax.set_aspect("equal", adjustable="box")
         self.ax.grid(True, linestyle=":", linewidth=0.6)
+        self.ax.set_xlabel("X")
+        self.ax.set_ylabel("Y")
+
+        # Persistent artists: all triads and links live in three collections that
+        # are updated in place, so adding a frame never creates new lines
+        self.links = LineCollection([], lw=2, colors='k')
+        self.x_axes = LineCollection([], lw=2, colors='r')
+        self.y_axes = LineCollection([], lw=2, colors='g')
+        for coll in (self.x_axes, self.y_axes, self.links):
+            self.ax.add_collection(coll)
+        (self.origin_pts,) = self.ax.plot([], [], ls="", marker="o", ms=4.5, color='0.25')
+        (self.base_pt,) = self.ax.plot([0], [0], ls="", marker="o", ms=4.5, color='k')
+        self.labels = []   # text artists, only created while labels are shown
+
         self.canvas = FigureCanvasTkAgg(fig, master=root)
         self.canvas.get_tk_widget().grid(row=0, column=1, sticky="nsew")
 
@@ -78,6 +85,7 @@ class Frames2DApp:
         self.update_plot(initial=True)
 
     # ---- actions ----
+    @instrument
     def add_frame(self):
         try:
             dx = float(self.dx_var.get())
@@ -87,10 +95,14 @@ class Frames2DApp:
             print("Please enter valid numbers for Δx, Δy, and Angle.")
             return
 
-        T_prev = self.frames[-1]
         # Convention: translation then rotation w.r.t. previous frame axes
-        # T_new = T_prev * Trans(dx,dy) * Rz(theta)
-        T_new = T_prev @ T_translate(dx, dy) @ Rz(ang)
+        # T_new = T_prev * Trans(dx,dy) * Rz(theta), composed in closed form
+        # (R_prev·R, p_prev + R_prev·d) straight into the frame buffers
+        i = len(self.frames)
+        self._reserve(i)
+        step = RigidTransform.planar(radians(ang), dx, dy)
+        prev = RigidTransform(self._rots[i - 1], self._origins[i - 1])
+        T_new = prev.compose(step, out=RigidTransform(self._rots[i], self._origins[i])).as_matrix()
         self.frames.append(T_new)
 
         # Print 3x3 homogeneous transform
@@ -102,10 +114,30 @@ class Frames2DApp:
 
     def reset(self):
         self.frames = [np.eye(3)]
+        self._store_frame(0, self.frames[0])
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+        self.update_plot()
+
+    def toggle_labels(self):
+        show = self.labels_var.get()
+        for label in self.labels:
+            label.set_visible(show)
         self.update_plot()
 
+    def _reserve(self, i):
+        if i >= len(self._origins):
+            self._origins = np.concatenate([self._origins, np.zeros_like(self._origins)])
+            self._rots = np.concatenate([self._rots, np.zeros_like(self._rots)])
+
+    def _store_frame(self, i, T):
+        self._reserve(i)
+        self._origins[i] = T[:2, 2]
+        self._rots[i] = T[:2, :2]
+
     def fit_view(self):
-        pts = np.array([T[:2, 2] for T in self.frames])
+        pts = self._origins[:len(self.frames)]
         if len(pts) == 0:
             pts = np.zeros((1,2))
         mins = pts.min(axis=0) - 0.5
@@ -119,34 +151,30 @@ class Frames2DApp:
         self.canvas.draw_idle()
 
     # ---- drawing ----
+    @instrument
     def update_plot(self, initial=False):
-        self.ax.cla()
-        self.ax.set_aspect("equal", adjustable="box")
-        self.ax.grid(True, linestyle=":", linewidth=0.6)
-        self.ax.set_xlabel("X")
-        self.ax.set_ylabel("Y")
-
-        origins = np.array([T[:2,2] for T in self.frames])
-        if len(origins) >= 2:
+        n = len(self.frames)
+        origins = self._origins[:n]
+        if n >= 2:
             span = np.linalg.norm(origins.max(axis=0) - origins.min(axis=0))
         else:
             span = 1.0
         axis_len = max(0.2, 0.18*span)
 
-        # Draw frames
-        for i, T in enumerate(self.frames):
-            (o, x_end), (_, y_end) = frame_axes_points(T, length=axis_len)
-            self.ax.plot([o[0], x_end[0]], [o[1], x_end[1]], lw=2, color='r')  # X
-            self.ax.plot([o[0], y_end[0]], [o[1], y_end[1]], lw=2, color='g')  # Y
-            self.ax.scatter([o[0]], [o[1]], s=20, color='k' if i==0 else '0.25')
-            self.ax.text(o[0], o[1], f" {i}", fontsize=9, va="center", ha="left")
+        # Frame triads: X (red), Y (green) as (n, 2, 2) segment arrays;
+        # column k of each rotation matrix is the direction of axis k
+        self.x_axes.set_segments(np.stack([origins, origins + axis_len*self._rots[:n, :, 0]], axis=1))
+        self.y_axes.set_segments(np.stack([origins, origins + axis_len*self._rots[:n, :, 1]], axis=1))
+        self.origin_pts.set_data(origins[1:, 0], origins[1:, 1])
 
         # Links between consecutive origins
-        if len(self.frames) >= 2:
-            for i in range(1, len(self.frames)):
-                a = self.frames[i-1][:2, 2]
-                b = self.frames[i][:2, 2]
-                self.ax.plot([a[0], b[0]], [a[1], b[1]], lw=2, color='k')
+        self.links.set_segments(np.stack([origins[:-1], origins[1:]], axis=1))
+
+        # Labels are only created for frames added since the last redraw
+        if self.labels_var.get():
+            for i in range(len(self.labels), n):
+                o = origins[i]
+                self.labels.append(self.ax.text(o[0], o[1], f" {i}", fontsize=9, va="center", ha="left"))
 
         # Bounds
         if initial:
@@ -5,41 +5,15 @@
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
-from math import cos, sin, radians
+from math import radians
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "toolkit"))
+from rotations import rot_axis  # shared rotation library
+from rigid import RigidTransform  # closed-form SE(3) composition
+from latency import instrument  # ARM_PROFILE=1: per-call latency histograms
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-
-# ---------- Transform helpers ----------
-def T_translate(dx, dy, dz):
-    T = np.eye(4)
-    T[:3, 3] = [dx, dy, dz]
-    return T
-
-def R_axis_angle(axis, theta_deg):
-    t = radians(theta_deg)
-    R = np.eye(4)
-    if axis == 'X':
-        R[:3, :3] = np.array([[1, 0, 0],
-                              [0, cos(t), -sin(t)],
-                              [0, sin(t),  cos(t)]])
-    elif axis == 'Y':
-        R[:3, :3] = np.array([[ cos(t), 0, sin(t)],
-                              [ 0,      1, 0     ],
-                              [-sin(t), 0, cos(t)]])
-    else:  # 'Z'
-        R[:3, :3] = np.array([[cos(t), -sin(t), 0],
-                              [sin(t),  cos(t), 0],
-                              [0,       0,      1]])
-    return R
-
-def frame_axes_points(T, length=1.0):
-    """Return 3 axis segments (start,end) for X(red), Y(green), Z(blue) in world coords."""
-    o = T[:3, 3]
-    R = T[:3, :3]
-    x_end = o + R @ np.array([length, 0, 0])
-    y_end = o + R @ np.array([0, length, 0])
-    z_end = o + R @ np.array([0, 0, length])
-    return (o, x_end), (o, y_end), (o, z_end)
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 
 # ---------- App ----------
 class FramesApp:
@@ -49,6 +23,11 @@ class FramesApp:
 
         # State: list of world transforms T_i, start with base at origin
         self.frames = [np.eye(4)]
+        # Origins and rotation matrices of all frames, in growable arrays so a
+        # redraw never has to walk the frame list
+        self._origins = np.zeros((16, 3))
+        self._rots = np.zeros((16, 3, 3))
+        self._store_frame(0, self.frames[0])
 
         # --- UI controls ---
         ctrl = ttk.Frame(root, padding=8)
@@ -80,10 +59,30 @@ class FramesApp:
         ttk.Button(ctrl, text="Reset", command=self.reset).grid(row=row, column=2, columnspan=2, sticky="ew", pady=(6,0))
         ttk.Button(ctrl, text="Fit View", command=self.fit_view).grid(row=row, column=4, columnspan=2, sticky="ew", pady=(6,0))
 
+        row += 1
+        self.labels_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(ctrl, text="Labels", variable=self.labels_var,
+                        command=self.toggle_labels).grid(row=row, column=0, columnspan=2, sticky="w", pady=(6,0))
+
         # --- Matplotlib 3D canvas ---
         fig = Figure(figsize=(6.5, 6.5), dpi=100)
         self.ax = fig.add_subplot(111, projection='3d')
         self.ax.set_box_aspect([1,1,1])
+        self.ax.set_xlabel("X")
+        self.ax.set_ylabel("Y")
+        self.ax.set_zlabel("Z")
+        self.ax.view_init(elev=22, azim=-60)
+
+        # Persistent artists: all triads and links live in four collections that
+        # are updated in place, so adding a frame never creates new lines
+        self.links = Line3DCollection([], lw=2, linestyle='-', colors='k')
+        self.axes_colls = [Line3DCollection([], lw=2, colors=c) for c in ('r', 'g', 'b')]
+        for coll in self.axes_colls + [self.links]:
+            self.ax.add_collection(coll, autolim=False)
+        (self.origin_pts,) = self.ax.plot([], [], [], ls="", marker="o", ms=4.2, color='0.25')
+        (self.base_pt,) = self.ax.plot([0], [0], [0], ls="", marker="o", ms=4.2, color='k')
+        self.labels = []   # text artists, only created while labels are shown
+
         self.canvas = FigureCanvasTkAgg(fig, master=root)
         self.canvas.get_tk_widget().grid(row=0, column=1, sticky="nsew")
 
@@ -94,6 +93,7 @@ class FramesApp:
         self.update_plot(initial=True)
 
     # ---- actions ----
+    @instrument
     def add_frame(self):
         try:
             dx = float(self.dx_var.get())
@@ -105,10 +105,14 @@ class FramesApp:
             print("Please enter valid numbers for dx, dy, dz, and angle.")
             return
 
-        T_prev = self.frames[-1]
         # Convention: apply translation then rotation w.r.t. the *previous frame axes*
-        # i.e., T_new = T_prev * Trans(dx,dy,dz) * R_axis(ang)
-        T_new = T_prev @ T_translate(dx, dy, dz) @ R_axis_angle(axis, ang)
+        # i.e., T_new = T_prev * Trans(dx,dy,dz) * R_axis(ang), composed in closed
+        # form (R_prev·R, p_prev + R_prev·d) straight into the frame buffers
+        i = len(self.frames)
+        self._reserve(i)
+        step = RigidTransform(rot_axis(axis, radians(ang)), [dx, dy, dz])
+        prev = RigidTransform(self._rots[i - 1], self._origins[i - 1])
+        T_new = prev.compose(step, out=RigidTransform(self._rots[i], self._origins[i])).as_matrix()
         self.frames.append(T_new)
 
         # Print the 4x4 homogeneous transform to terminal
@@ -120,11 +124,31 @@ class FramesApp:
 
     def reset(self):
         self.frames = [np.eye(4)]
+        self._store_frame(0, self.frames[0])
+        for label in self.labels:
+            label.remove()
+        self.labels = []
         self.update_plot()
 
+    def toggle_labels(self):
+        show = self.labels_var.get()
+        for label in self.labels:
+            label.set_visible(show)
+        self.update_plot()
+
+    def _reserve(self, i):
+        if i >= len(self._origins):
+            self._origins = np.concatenate([self._origins, np.zeros_like(self._origins)])
+            self._rots = np.concatenate([self._rots, np.zeros_like(self._rots)])
+
+    def _store_frame(self, i, T):
+        self._reserve(i)
+        self._origins[i] = T[:3, 3]
+        self._rots[i] = T[:3, :3]
+
     def fit_view(self):
         # Autoscale to include all origins
-        pts = np.array([T[:3,3] for T in self.frames])
+        pts = self._origins[:len(self.frames)]
         if len(pts) == 0:
             pts = np.zeros((1,3))
         mins = pts.min(axis=0) - 0.5
@@ -140,38 +164,31 @@ class FramesApp:
         self.canvas.draw_idle()
 
     # ---- drawing ----
+    @instrument
     def update_plot(self, initial=False):
-        self.ax.cla()
-        self.ax.set_xlabel("X")
-        self.ax.set_ylabel("Y")
-        self.ax.set_zlabel("Z")
-        self.ax.view_init(elev=22, azim=-60)
-
-        # Draw frames as triads and links between origins
         # Choose axis length based on spread
-        origins = np.array([T[:3,3] for T in self.frames])
-        if len(origins) >= 2:
+        n = len(self.frames)
+        origins = self._origins[:n]
+        if n >= 2:
             span = np.linalg.norm(origins.max(axis=0) - origins.min(axis=0))
         else:
             span = 1.0
         axis_len = max(0.2, 0.12*span)
 
-        # Draw base frame in darker tones, subsequent in brighter
-        for i, T in enumerate(self.frames):
-            (o,x_end), (o2,y_end), (o3,z_end) = frame_axes_points(T, length=axis_len)
-            # X (red), Y (green), Z (blue)
-            self.ax.plot([o[0], x_end[0]], [o[1], x_end[1]], [o[2], x_end[2]], lw=2, color='r')
-            self.ax.plot([o2[0], y_end[0]], [o2[1], y_end[1]], [o2[2], y_end[2]], lw=2, color='g')
-            self.ax.plot([o3[0], z_end[0]], [o3[1], z_end[1]], [o3[2], z_end[2]], lw=2, color='b')
-            self.ax.scatter([o[0]], [o[1]], [o[2]], s=18, color='k' if i==0 else '0.25')
-            self.ax.text(o[0], o[1], o[2], f" {i}", fontsize=9)
+        # Frame triads: X (red), Y (green), Z (blue) as (n, 2, 3) segment arrays;
+        # column k of each rotation matrix is the direction of axis k
+        for k, coll in enumerate(self.axes_colls):
+            coll.set_segments(np.stack([origins, origins + axis_len*self._rots[:n, :, k]], axis=1))
+        self.origin_pts.set_data_3d(origins[1:, 0], origins[1:, 1], origins[1:, 2])
 
         # Links between consecutive origins
-        if len(self.frames) >= 2:
-            for i in range(1, len(self.frames)):
-                a = self.frames[i-1][:3,3]
-                b = self.frames[i][:3,3]
-                self.ax.plot([a[0], b[0]], [a[1], b[1]], [a[2], b[2]], lw=2, linestyle='-', color='k')
+        self.links.set_segments(np.stack([origins[:-1], origins[1:]], axis=1))
+
+        # Labels are only created for frames added since the last redraw
+        if self.labels_var.get():
+            for i in range(len(self.labels), n):
+                o = origins[i]
+                self.labels.append(self.ax.text(o[0], o[1], o[2], f" {i}", fontsize=9))
 
         # Set bounds
         if initial:
@@ -1,22 +1,9 @@
 import math
-
-def Rx(t):
-    c, s = math.cos(t), math.sin(t)
-    return [[1, 0, 0],
-            [0, c,-s],
-            [0, s, c]]
-
-def Ry(t):
-    c, s = math.cos(t), math.sin(t)
-    return [[ c, 0, s],
-            [ 0, 1, 0],
-            [-s, 0, c]]
-
-def Rz(t):
-    c, s = math.cos(t), math.sin(t)
-    return [[c,-s, 0],
-            [s, c, 0],
-            [0, 0, 1]]
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "toolkit"))
+# Rx / Ry / Rz come from the shared rotation library; they accept a single
+# angle (-> 3x3 matrix) or an array of N angles (-> N x 3 x 3 stack)
+from rotations import rot_x as Rx, rot_y as Ry, rot_z as Rz
 
 def pretty_print(M, width=9, prec=4, label="R"):
     fmt = f"{{:{width}.{prec}f}}"
@@ -11,7 +11,7 @@ from IPython.display import display
 # Importing the symbols function from sympy
 # The symbols function allows the creation of symbolic variables that can be used in equations.
 # The cos and sin functions are used for symbolic trigonometric calculations.
-from sympy import symbols,cos, sin, pprint, simplify
+from sympy import symbols,cos, sin, pprint
 
 # Importing the Matrix class from sympy's matrices module
 # This class is used to create and manipulate matrices
@@ -35,13 +35,20 @@ TA_E = Matrix([[cos(theta2),-sin(theta2), L_2*cos(theta2)],
 #Multiplying all the transformation matrix to get the final matrix
 TO_E = TO_A * TA_E
 
-# Simplifying each component of the resulting transformation matrix
-TO_E_simplified = simplify(TO_E)
+# Simplifying TO_E and turning it into a vectorized NumPy function.
+# compile_kernel (../../toolkit/symbolic_kernels.py) only runs simplify and the
+# code generation the first time; later runs load the cached kernel from disk.
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "toolkit"))
+from symbolic_kernels import compile_kernel
+
+TO_E_fn = compile_kernel(TO_E, [theta1, theta2, L_1, L_2], name="TO_E")
+TO_E_simplified = TO_E_fn.simplified
 
 # Displaying the simplified transformation matrix
 print("  \n\n")
-#pprint(TO_E_simplified)
-
-#pprint(simplify(TO_A * TA_E))
-pprint(simplify(TO_A * TA_E))
+pprint(TO_E_simplified)
 
+# The same matrix evaluated numerically, e.g. theta1 = theta2 = 30°, L_1 = 1.5, L_2 = 1.0
+print()
+print(TO_E_fn(math.radians(30), math.radians(30), 1.5, 1.0))
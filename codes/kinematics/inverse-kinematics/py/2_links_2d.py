@@ -1,12 +1,16 @@
 # two_link_click_ik.py
 import numpy as np
 import matplotlib.pyplot as plt
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "toolkit"))
+from latency import instrument  # ARM_PROFILE=1: per-call latency histograms
 
 # ----- link lengths (units) -----
 L1 = 1.5
 L2 = 1.0
 R  = L1 + L2
 
+@instrument
 def ik_2r(x, y, L1=L1, L2=L2):
     """Return list of (theta1, theta2) in radians for target (x,y)."""
     r2 = x*x + y*y
@@ -26,6 +30,7 @@ def ik_2r(x, y, L1=L1, L2=L2):
         return np.arctan2(y, x) - np.arctan2(k2, k1)
     return [(t1_for(t2a), t2a), (t1_for(t2b), t2b)]
 
+@instrument
 def fk_2r(t1, t2, L1=L1, L2=L2):
     x1 = L1*np.cos(t1); y1 = L1*np.sin(t1)
     x2 = x1 + L2*np.cos(t1 + t2)
@@ -53,6 +58,7 @@ txt = ax.text(0.02, 0.98, "", transform=ax.transAxes, va="top",
               bbox=dict(boxstyle="round", fc="w", ec="0.7"))
 ax.legend(loc="lower right")
 
+@instrument
 def on_click(event):
     if not event.inaxes: 
         return
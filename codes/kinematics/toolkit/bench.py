@@ -0,0 +1,336 @@
+# bench.py
+# Reproducible benchmarks for the kinematics hot paths, with a stored baseline.
+# Requirements: python -m pip install numpy matplotlib sympy
+#
+# Cases cover the scalar functions in the demo scripts (fk, ik_2r, fk_3d,
+# Rx/Ry/Rz), their batched toolkit counterparts, the SymPy pipeline behind
+# transformation.py and the slider `update` path of 2-links_2d.py rendered
+# headlessly. Script functions are pulled out of the script files with `ast`
+# (imports, constants and defs only), so the benchmark measures the real code
+# without opening a window.
+#
+# Every case is timed call by call after a warm-up, for at least --min-time
+# seconds and --min-calls calls; the JSON report holds throughput (items/s) and
+# per-call latency percentiles. With --baseline the run is compared against an
+# earlier report and exits with status 1 if any case lost more than --tolerance
+# of its throughput or its median (p50) latency, or more than --tail-tolerance
+# of its p99 latency.
+#
+#   python bench.py --out bench.json                      # record
+#   python bench.py --baseline bench.json                 # compare
+#   python bench.py -k ik --repeat 200                    # subset
+
+import argparse
+import ast
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+KIN = os.path.dirname(HERE)
+FK_PY = os.path.join(KIN, "forward-kinematics", "py")
+IK_PY = os.path.join(KIN, "inverse-kinematics", "py")
+
+SEED = 0
+BATCH = 100_000
+
+
+def script_namespace(path):
+    """Module namespace of a demo script without running its GUI code.
+
+    Keeps imports, function definitions and plain constant / alias assignments
+    (e.g. L1 = 1.5, Rz, Ry = rot_z, rot_y) and sys.path tweaks; drops everything
+    else (figures, sliders, plt.show()).
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    def plain(node):
+        return all(isinstance(n, (ast.Constant, ast.Name, ast.Tuple, ast.Load, ast.Store,
+                                  ast.BinOp, ast.UnaryOp, ast.operator, ast.unaryop))
+                   for n in ast.walk(node))
+
+    keep = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef)):
+            keep.append(node)
+        elif isinstance(node, ast.Assign) and plain(node.value):
+            keep.append(node)
+        elif isinstance(node, ast.Expr) and "sys.path" in ast.unparse(node):
+            keep.append(node)
+    tree.body = keep
+    ns = {"__file__": path, "__name__": "_bench_" + os.path.basename(path)}
+    exec(compile(tree, path, "exec"), ns)
+    return ns
+
+
+# ---------- cases: setup() -> (fn, items per call) ----------
+def _q(n, dof):
+    return np.random.default_rng(SEED).uniform(-np.pi, np.pi, size=(n, dof))
+
+
+def case_fk_scalar():
+    fk = script_namespace(os.path.join(FK_PY, "2-links_2d.py"))["fk"]
+    q = _q(1000, 2)
+    it = iter(range(10**12))
+    return lambda: fk(*q[next(it) % 1000]), 1
+
+
+def case_fk_planar():
+    from planar_fk import fk_planar
+    q, L = _q(BATCH, 2), np.array([1.5, 1.0])
+    out = np.empty((BATCH, 3, 2))
+    return lambda: fk_planar(q, L, out=out), BATCH
+
+
+def case_fk_planar_4r():
+    from planar_fk import fk_planar
+    q, L = _q(BATCH, 4), np.array([1.5, 1.0, 1.5, 1.0])
+    return lambda: fk_planar(q, L), BATCH
+
+
+def case_ik_2r_scalar():
+    ik = script_namespace(os.path.join(IK_PY, "2_links_2d.py"))["ik_2r"]
+    targets = np.random.default_rng(SEED).uniform(-2.2, 2.2, size=(1000, 2))
+    it = iter(range(10**12))
+    return lambda: ik(*targets[next(it) % 1000]), 1
+
+
+def case_ik_2r_batch():
+    from planar_ik import ik_2r_batch
+    targets = np.random.default_rng(SEED).uniform(-2.2, 2.2, size=(BATCH, 2))
+    return lambda: ik_2r_batch(targets), BATCH
+
+
+def case_fk_3d_scalar():
+    fk_3d = script_namespace(os.path.join(FK_PY, "2_links_3d.py"))["fk_3d"]
+    q = _q(1000, 3)
+    it = iter(range(10**12))
+    return lambda: fk_3d(*q[next(it) % 1000]), 1
+
+
+def case_fk_3d_dh():
+    from dh_chain import yaw_shoulder_elbow_chain
+    arm, q = yaw_shoulder_elbow_chain(), _q(BATCH, 3)
+    out = np.empty((BATCH, 4, 4, 4))
+    return lambda: arm.fk(q, out=out), BATCH
+
+
+def case_rxyz_scalar():
+    ns = script_namespace(os.path.join(FK_PY, "rotation.py"))
+    Rx, Ry, Rz = ns["Rx"], ns["Ry"], ns["Rz"]
+    t = _q(1000, 1)[:, 0]
+    it = iter(range(10**12))
+
+    def call():
+        a = t[next(it) % 1000]
+        return Rx(a), Ry(a), Rz(a)
+    return call, 3
+
+
+def case_rxyz_batch():
+    from rotations import rot_x, rot_y, rot_z
+    t = _q(BATCH, 1)[:, 0]
+    out = np.empty((BATCH, 3, 3))
+    return lambda: (rot_x(t, out=out), rot_y(t, out=out), rot_z(t, out=out)), 3*BATCH
+
+
+def case_collision_check():
+    from collision import Obstacles
+    from planar_fk import fk_planar
+    obstacles = (Obstacles().add_circle((1.2, 1.2), 0.3).add_box((-2.0, -0.4), (-1.2, 0.4))
+                 .add_polygon([(1.8, 0.0), (2.6, 0.3), (2.4, 1.0), (2.0, 0.6)]))
+    pts = fk_planar(_q(BATCH, 3), [1.2, 1.0, 0.6])
+    return lambda: obstacles.check(pts, radius=0.05), BATCH
+
+
+def _sympy_TO_E():
+    from sympy import Matrix, cos, sin, symbols
+    th1, th2, L_1, L_2 = symbols("theta1,theta2,L_1,L_2")
+    TO_A = Matrix([[cos(th1), -sin(th1), L_1*cos(th1)],
+                   [sin(th1), cos(th1), L_1*sin(th1)],
+                   [0, 0, 1]])
+    TA_E = Matrix([[cos(th2), -sin(th2), L_2*cos(th2)],
+                   [sin(th2), cos(th2), L_2*sin(th2)],
+                   [0, 0, 1]])
+    return TO_A * TA_E, [th1, th2, L_1, L_2]
+
+
+def case_sympy_simplify():
+    import sympy
+    expr, _ = _sympy_TO_E()
+    return lambda: sympy.simplify(expr), 1
+
+
+def case_sympy_kernel_load():
+    import tempfile
+    import symbolic_kernels
+    expr, args = _sympy_TO_E()
+    cache = tempfile.mkdtemp(prefix="bench_kernels_")
+    symbolic_kernels.compile_kernel(expr, args, name="TO_E", cache_dir=cache)
+
+    def call():                    # a fresh process: in-memory cache empty, disk cache warm
+        symbolic_kernels._loaded.clear()
+        return symbolic_kernels.compile_kernel(expr, args, name="TO_E", cache_dir=cache)
+    return call, 1
+
+
+def case_sympy_kernel_eval():
+    import tempfile
+    from symbolic_kernels import compile_kernel
+    expr, args = _sympy_TO_E()
+    TO_E = compile_kernel(expr, args, name="TO_E", cache_dir=tempfile.mkdtemp(prefix="bench_kernels_"))
+    q = _q(BATCH, 2)
+    return lambda: TO_E(q[:, 0], q[:, 1], 1.5, 1.0), BATCH
+
+
+def case_gui_update_2d():
+    """Slider update -> fk -> text -> blit of 2-links_2d.py on the Agg canvas."""
+    import runpy
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    ns = runpy.run_path(os.path.join(FK_PY, "2-links_2d.py"), run_name="_bench_gui")
+    fig, slider = plt.gcf(), ns["s_theta1"]
+    fig.canvas.draw()                     # full draw once: caches the blit background
+    values = np.linspace(-180, 180, 997)
+    it = iter(range(10**12))
+    return lambda: slider.set_val(values[next(it) % len(values)]), 1
+
+
+CASES = {
+    "fk_scalar": case_fk_scalar,
+    "fk_planar_2r": case_fk_planar,
+    "fk_planar_4r": case_fk_planar_4r,
+    "ik_2r_scalar": case_ik_2r_scalar,
+    "ik_2r_batch": case_ik_2r_batch,
+    "fk_3d_scalar": case_fk_3d_scalar,
+    "fk_3d_dh": case_fk_3d_dh,
+    "rxyz_scalar": case_rxyz_scalar,
+    "rxyz_batch": case_rxyz_batch,
+    "collision_check": case_collision_check,
+    "sympy_simplify": case_sympy_simplify,
+    "sympy_kernel_load": case_sympy_kernel_load,
+    "sympy_kernel_eval": case_sympy_kernel_eval,
+    "gui_update_2d": case_gui_update_2d,
+}
+
+
+# ---------- runner ----------
+def run_case(setup, repeat=None, min_time=0.5, warmup=3, min_calls=10):
+    """Time fn() call by call. Calls repeat until min_time has passed and at
+    least min_calls were timed, so slow cases still get a usable p50."""
+    fn, items = setup()
+    for _ in range(warmup):
+        fn()
+    times = []
+    clock = time.perf_counter
+    start = clock()
+    while ((repeat is None and (clock() - start < min_time or len(times) < min_calls))
+           or (repeat is not None and len(times) < repeat)):
+        t0 = clock()
+        fn()
+        times.append(clock() - t0)
+        if repeat is None and len(times) >= 1_000_000:
+            break
+    times = np.array(times)
+    p50, p90, p99 = np.percentile(times, [50, 90, 99]) * 1e6
+    return {"calls": int(times.size), "items_per_call": items,
+            "items_per_s": float(items * times.size / times.sum()),
+            "mean_us": float(times.mean() * 1e6),
+            "p50_us": float(p50), "p90_us": float(p90), "p99_us": float(p99),
+            "max_us": float(times.max() * 1e6)}
+
+
+def environment():
+    import numpy
+    info = {"python": platform.python_version(), "numpy": numpy.__version__,
+            "machine": platform.machine(), "system": platform.system(),
+            "processor": platform.processor(), "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    for mod in ("matplotlib", "sympy"):
+        try:
+            info[mod] = __import__(mod).__version__
+        except ImportError:
+            pass
+    return info
+
+
+def run(names=None, repeat=None, min_time=0.5, min_calls=10, log=print):
+    results, skipped = {}, {}
+    for name, setup in CASES.items():
+        if names and not any(k in name for k in names):
+            continue
+        try:
+            r = run_case(setup, repeat=repeat, min_time=min_time, min_calls=min_calls)
+        except ImportError as e:
+            skipped[name] = f"missing dependency: {e.name}"
+            log(f"{name:20s} skipped ({skipped[name]})")
+            continue
+        results[name] = r
+        log(f"{name:20s} {r['items_per_s']:14,.0f} items/s   p50 {r['p50_us']:10.1f} µs   "
+            f"p99 {r['p99_us']:10.1f} µs   ({r['calls']} calls)")
+    return {"env": environment(), "seed": SEED, "batch": BATCH,
+            "results": results, "skipped": skipped}
+
+
+def compare(report, baseline, tolerance=0.2, tail_tolerance=0.5, log=print):
+    """Names of cases that got slower than the baseline.
+
+    Speed ratios (> 1 = faster) are taken for throughput, p50 and p99 latency;
+    a case regresses when throughput or p50 lost more than `tolerance`, or p99
+    more than `tail_tolerance` (tails of a few dozen calls are noisy).
+    """
+    regressions = []
+    for name, r in report["results"].items():
+        ref = baseline.get("results", {}).get(name)
+        if ref is None:
+            log(f"{name:20s} (no baseline)")
+            continue
+        ratios = {"throughput": r["items_per_s"] / ref["items_per_s"],
+                  "p50": ref["p50_us"] / r["p50_us"],
+                  "p99": ref["p99_us"] / r["p99_us"]}
+        slower = [k for k, v in ratios.items()
+                  if v < 1.0 - (tail_tolerance if k == "p99" else tolerance)]
+        flag = ""
+        if slower:
+            regressions.append(name)
+            flag = f"  <-- REGRESSION ({', '.join(slower)})"
+        log(f"{name:20s} vs baseline: throughput {ratios['throughput']:5.2f}x   "
+            f"p50 {ratios['p50']:5.2f}x   p99 {ratios['p99']:5.2f}x   "
+            f"({r['calls']} calls, baseline {ref['calls']}){flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the kinematics hot paths.")
+    parser.add_argument("-k", dest="names", action="append",
+                        help="only cases whose name contains this (repeatable)")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed throughput / p50 loss vs the baseline (default 0.2 = 20%%)")
+    parser.add_argument("--tail-tolerance", type=float, default=0.5,
+                        help="allowed p99 loss vs the baseline (default 0.5 = 50%%)")
+    parser.add_argument("--repeat", type=int, help="fixed number of timed calls per case")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="seconds per case when --repeat is not given")
+    parser.add_argument("--min-calls", type=int, default=10,
+                        help="timed calls per case at least, when --repeat is not given")
+    args = parser.parse_args()
+
+    report = run(args.names, repeat=args.repeat, min_time=args.min_time, min_calls=args.min_calls)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"report written to {args.out}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\ncompared to {args.baseline} ({baseline['env'].get('time', '?')}):")
+        if compare(report, baseline, args.tolerance, args.tail_tolerance):
+            sys.exit(1)
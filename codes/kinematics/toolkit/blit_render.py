@@ -0,0 +1,155 @@
+# blit_render.py
+# Blitted, rate-limited rendering for the slider-driven arm GUIs.
+# Requirements: python -m pip install numpy matplotlib
+#
+# The slider demos call plt.draw() on every on_changed event, which re-renders
+# the whole figure (grid, ticks, slider axes) once per event. SliderRenderer
+# instead
+#   * caches the static background after each full draw,
+#   * marks the arm line / EE text as animated and only redraws those (plus the
+#     slider tracks) on top of the cached background,
+#   * coalesces bursts of slider events into at most one render per display
+#     frame, and
+#   * measures the achieved FPS, shown in the figure corner while the sliders
+#     move and cleared once rendering has been idle for a second.
+#
+#   renderer = SliderRenderer(fig, [link_line, ee_text], update, sliders=[s1, s2])
+#   # update(_) only sets artist data; it no longer calls plt.draw()
+#
+# Set ARM_RENDER=draw to fall back to the old full-figure draw per event.
+
+import os
+import time
+
+from matplotlib.backend_bases import TimerBase
+
+from latency import instrument
+
+
+class SliderRenderer:
+    def __init__(self, fig, artists, update, sliders=(), fps=60.0,
+                 mode=None, show_fps=True, idle=1.0):
+        """
+        fig      : the figure holding the arm
+        artists  : artists changed by `update` (arm line, EE text, ...)
+        update   : callback(value) that recomputes the artists' data
+        sliders  : Slider widgets to hook up; their tracks are blitted as well
+        fps      : upper bound on renders per second
+        mode     : "blit" (default) or "draw"; defaults to $ARM_RENDER
+        idle     : seconds without a render after which the FPS readout is cleared
+        """
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.artists = list(artists)
+        self.update = update
+        self.sliders = list(sliders)
+        self.frame_dt = 1.0 / fps
+        self.idle = idle
+        self.mode = mode or os.environ.get("ARM_RENDER", "blit")
+        if self.mode == "blit" and not self.canvas.supports_blit:
+            self.mode = "draw"
+
+        self.fps = 0.0
+        self._frames = 0
+        self._fps_t0 = time.perf_counter()
+        self._last_render = 0.0
+        self._pending = False
+        self._value = None
+        self._background = None
+
+        self._timer = self.canvas.new_timer(interval=int(self.frame_dt * 1000))
+        self._timer.single_shot = True
+        self._timer.add_callback(self._on_timer)
+        # non-interactive backends hand out a TimerBase that never fires
+        self._has_timer = type(self._timer) is not TimerBase
+        self._idle_timer = self.canvas.new_timer(interval=int(idle * 1000))
+        self._idle_timer.single_shot = True
+        self._idle_timer.add_callback(self._on_idle)
+
+        self.fps_text = None
+        if show_fps:
+            self.fps_text = fig.text(0.99, 0.99, "", ha="right", va="top",
+                                     fontsize=8, color="0.4")
+            self.artists.append(self.fps_text)
+
+        # moving parts of each slider (fill, handle, value text)
+        self._slider_parts = [a for s in self.sliders
+                              for a in (s.poly, getattr(s, "_handle", None), s.valtext)
+                              if a is not None]
+
+        if self.mode == "blit":
+            for a in self.artists + self._slider_parts:
+                a.set_animated(True)
+            for s in self.sliders:
+                s.drawon = False          # we blit the slider tracks ourselves
+            self.canvas.mpl_connect("draw_event", self._on_draw)
+
+        for s in self.sliders:
+            s.on_changed(self.request)
+
+    # ---- event side ----
+    def request(self, value=None):
+        """Slider callback: remember the value, render at the next frame slot."""
+        self._value = value
+        if not self._has_timer:
+            self.render()
+            return
+        if self._pending:
+            return                          # a render is already scheduled
+        self._pending = True
+        wait = self._last_render + self.frame_dt - time.perf_counter()
+        self._timer.interval = max(1, int(wait * 1000))
+        self._timer.start()
+
+    def _on_timer(self):
+        self._pending = False
+        self.render()
+
+    # ---- drawing side ----
+    def _on_draw(self, event):
+        """After every full draw: grab the background, then paint the animated artists."""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    @instrument
+    def _draw_animated(self):
+        for a in self._slider_parts + self.artists:
+            self.fig.draw_artist(a)
+
+    @instrument
+    def render(self):
+        """Run the update callback and put the result on screen."""
+        self.update(self._value)
+        self._tick_fps()
+        self._show()
+        self._last_render = time.perf_counter()
+        if self._has_timer and self.fps_text is not None:
+            self._idle_timer.start()        # restarts the countdown
+
+    def _show(self):
+        if self.mode == "blit" and self._background is not None:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.fig.bbox)
+            self.canvas.flush_events()
+        else:
+            self.canvas.draw_idle()
+
+    def _on_idle(self):
+        """Nothing rendered for `idle` seconds: the last FPS figure is stale."""
+        self.fps = 0.0
+        if self.fps_text.get_text():
+            self.fps_text.set_text("")
+            self._show()
+
+    def _tick_fps(self, every=0.5):
+        now = time.perf_counter()
+        if now - self._last_render > self.idle:     # resuming: don't average over the pause
+            self._frames, self._fps_t0 = 0, now
+        self._frames += 1
+        if now - self._fps_t0 >= every:
+            self.fps = self._frames / (now - self._fps_t0)
+            self._frames = 0
+            self._fps_t0 = now
+            if self.fps_text is not None:
+                self.fps_text.set_text(f"{self.fps:.0f} FPS")
@@ -0,0 +1,385 @@
+# collision.py
+# Vectorized link-versus-obstacle checks for batches of planar arm poses.
+# Requirements: python -m pip install numpy
+#
+# The arm is the polyline returned by fk_planar, an (M, n+1, 2) batch of joint
+# positions, i.e. n segments per pose. Obstacles are circles, boxes (optionally
+# rotated) and simple polygons. Everything is packed into flat arrays once, so
+# a check is a handful of broadcast operations over (poses, links, obstacles):
+#
+#   circle  : distance(center, segment) - radius
+#   polygon : min over edges of distance(segment, edge); 0 when a link crosses
+#             an edge or a joint lies inside (even-odd rule)
+#
+# Links can be given a thickness (`radius`), which turns them into capsules.
+# Poses are processed in cache-sized chunks, so memory stays flat whatever M is.
+#
+#   obstacles = Obstacles().add_circle((1.0, 1.0), 0.3).add_box((-2, -0.5), (-1, 0.5))
+#   hit, clearance = obstacles.check(fk_planar(q, lengths))
+
+import hashlib
+
+import numpy as np
+
+_CHUNK_ELEMENTS = 1 << 16      # (poses x links x edges) per chunk: temporaries stay in cache
+
+
+def _unit_clip(t):
+    """np.clip(t, 0, 1) in place; plain ufuncs are cheaper than np.clip on small batches."""
+    np.maximum(t, 0.0, out=t)
+    return np.minimum(t, 1.0, out=t)
+
+
+def _cross(u, v):
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def _dot(u, v):
+    return u[..., 0] * v[..., 0] + u[..., 1] * v[..., 1]
+
+
+def point_segment_dist2(x, a, b):
+    """Squared distance from points x to segments a-b (all broadcast, last axis = 2)."""
+    ab = b - a
+    ax = x - a
+    den = np.maximum(_dot(ab, ab), 1e-300)          # zero-length segments -> point a
+    t = np.clip(_dot(ax, ab) / den, 0.0, 1.0)
+    d = ax - t[..., None] * ab
+    return _dot(d, d)
+
+
+def segment_segment_dist2(a, b, p, q):
+    """Squared distance between segments a-b and p-q (broadcast, last axis = 2)."""
+    d2 = np.minimum(np.minimum(point_segment_dist2(a, p, q), point_segment_dist2(b, p, q)),
+                    np.minimum(point_segment_dist2(p, a, b), point_segment_dist2(q, a, b)))
+    ab, pq = b - a, q - p
+    o1, o2 = _cross(ab, p - a), _cross(ab, q - a)
+    o3, o4 = _cross(pq, a - p), _cross(pq, b - p)
+    # proper crossing; collinear overlaps already give d2 == 0 above
+    crossing = (o1 * o2 <= 0) & (o3 * o4 <= 0) & ~((o1 == 0) & (o2 == 0))
+    return np.where(crossing, 0.0, d2)
+
+
+# The batched kernels below work on separate x / y arrays of joint positions,
+# (m, n+1) each, so every temporary is a contiguous (m, links, edges) block.
+# A link-edge distance is the minimum of its four endpoint-to-segment
+# distances unless the two cross; joints are shared between neighbouring links
+# and vertices between neighbouring edges, so those endpoint terms are computed
+# once per joint / vertex instead of once per (link, edge) pair.
+def _point_link_dist2(px, py, x, y):
+    """Squared distance of points (K,) to every link, (m, n, K)."""
+    ax, ay = x[:, :-1, None], y[:, :-1, None]
+    lx, ly = x[:, 1:, None] - ax, y[:, 1:, None] - ay
+    ux, uy = px - ax, py - ay
+    t = _unit_clip((ux * lx + uy * ly) / np.maximum(lx * lx + ly * ly, 1e-300))
+    ux -= t * lx
+    uy -= t * ly
+    return ux * ux + uy * uy
+
+
+def _polygon_dist2(x, y, P, Q, nxt, starts, member):
+    """Squared distance from each pose's links to each polygon, (m, n_poly); 0 on overlap."""
+    ex, ey = Q[:, 0] - P[:, 0], Q[:, 1] - P[:, 1]                   # edges (E,)
+    # joints vs edges, (m, n+1, E)
+    rx, ry = x[..., None] - P[:, 0], y[..., None] - P[:, 1]
+    side = ex * ry - ey * rx                   # which side of each edge the joint is on
+    t = _unit_clip((rx * ex + ry * ey) / np.maximum(ex * ex + ey * ey, 1e-300))
+    dx, dy = rx - t * ex, ry - t * ey
+    d2 = (dx * dx + dy * dy).min(axis=1)                            # (m, E)
+    # even-odd ray cast along +x: a joint is inside if it crosses an odd number of edges
+    straddle = (P[:, 1] > y[..., None]) != (Q[:, 1] > y[..., None])
+    ray = (straddle & (side * ey > 0)).astype(np.float32)
+    # vertices vs links, (m, n, E)
+    ax, ay = x[:, :-1, None], y[:, :-1, None]
+    lx, ly = x[:, 1:, None] - ax, y[:, 1:, None] - ay
+    ux, uy = P[:, 0] - ax, P[:, 1] - ay
+    turn = lx * uy - ly * ux                   # which side of each link the vertex is on
+    t = _unit_clip((ux * lx + uy * ly) / np.maximum(lx * lx + ly * ly, 1e-300))
+    ux -= t * lx
+    uy -= t * ly
+    np.minimum(d2, (ux * ux + uy * uy).min(axis=1), out=d2)
+    # proper link-edge crossings (collinear overlaps are already at distance 0)
+    t1, t2 = turn, turn[..., nxt]
+    s1, s2 = side[:, :-1], side[:, 1:]
+    crossing = ((t1 * t2 <= 0) & (s1 * s2 <= 0) & ((t1 != 0) | (t2 != 0))).any(axis=1)
+    d2[crossing] = 0.0
+    d2 = np.minimum.reduceat(d2, starts, axis=1)
+    inside = ((ray @ member) % 2 == 1).any(axis=1)               # per joint, per polygon
+    d2[inside] = 0.0
+    return d2
+
+
+def _segment_pair_dist2(ax, ay, bx, by, cx, cy, dx, dy):
+    """Squared distance between segments a-b and c-d given as x / y component arrays."""
+    ux, uy = bx - ax, by - ay
+    vx, vy = dx - cx, dy - cy
+    uu = np.maximum(ux * ux + uy * uy, 1e-300)
+    vv = np.maximum(vx * vx + vy * vy, 1e-300)
+
+    def end_to_seg(px, py, ox, oy, sx, sy, ss):          # point p to segment o + t s
+        wx, wy = px - ox, py - oy
+        t = _unit_clip((wx * sx + wy * sy) / ss)
+        wx -= t * sx
+        wy -= t * sy
+        return wx * wx + wy * wy
+
+    d2 = np.minimum(np.minimum(end_to_seg(ax, ay, cx, cy, vx, vy, vv),
+                               end_to_seg(bx, by, cx, cy, vx, vy, vv)),
+                    np.minimum(end_to_seg(cx, cy, ax, ay, ux, uy, uu),
+                               end_to_seg(dx, dy, ax, ay, ux, uy, uu)))
+    o1 = ux * (cy - ay) - uy * (cx - ax)
+    o2 = ux * (dy - ay) - uy * (dx - ax)
+    o3 = vx * (ay - cy) - vy * (ax - cx)
+    o4 = vx * (by - cy) - vy * (bx - cx)
+    d2[(o1 * o2 <= 0) & (o3 * o4 <= 0) & ((o1 != 0) | (o2 != 0))] = 0.0
+    return d2
+
+
+class Obstacles:
+    """A set of circles, boxes and polygons in the arm's base frame."""
+
+    def __init__(self):
+        self.kinds = []                 # "circle" / "box" / "polygon", insertion order
+        self._centers, self._radii = [], []
+        self._polygons = []
+        self._packed = None
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # ---- building ----
+    def add_circle(self, center, radius):
+        self._centers.append(np.asarray(center, dtype=float).reshape(2))
+        self._radii.append(float(radius))
+        self.kinds.append("circle")
+        self._packed = None
+        return self
+
+    def add_box(self, lo, hi, angle=0.0):
+        """Box with corners lo, hi (before rotation), rotated by `angle` about its center."""
+        lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+        c, h = (lo + hi) / 2, np.abs(hi - lo) / 2
+        corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]]) * h
+        ca, sa = np.cos(angle), np.sin(angle)
+        corners = corners @ np.array([[ca, sa], [-sa, ca]]) + c
+        return self._add_polygon(corners, "box")
+
+    def add_polygon(self, vertices):
+        """Simple polygon, vertices in order (either winding), not closed."""
+        return self._add_polygon(vertices, "polygon")
+
+    def _add_polygon(self, vertices, kind):
+        v = np.asarray(vertices, dtype=float)
+        if v.ndim != 2 or v.shape[1] != 2 or len(v) < 3:
+            raise ValueError(f"polygon needs (k >= 3, 2) vertices, got shape {v.shape}")
+        self._polygons.append(v)
+        self.kinds.append(kind)
+        self._packed = None
+        return self
+
+    def _pack(self):
+        if self._packed is None:
+            kinds = np.array(self.kinds)
+            circ = np.flatnonzero(kinds == "circle")
+            poly = np.flatnonzero(kinds != "circle")
+            centers = np.array(self._centers).reshape(-1, 2)
+            radii = np.array(self._radii)
+            sizes = np.array([len(v) for v in self._polygons], dtype=np.int64)
+            P = np.concatenate(self._polygons) if self._polygons else np.empty((0, 2))
+            Q = np.concatenate([np.roll(v, -1, axis=0) for v in self._polygons]) \
+                if self._polygons else np.empty((0, 2))
+            starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+            nxt = np.arange(len(P)) + 1
+            nxt[starts + sizes - 1] = starts     # next vertex, wrapping per polygon
+            # (E, n_poly) edge -> polygon membership, sums ray crossings per polygon
+            member = np.eye(len(sizes), dtype=np.float32)[np.repeat(np.arange(len(sizes)), sizes)]
+            self._packed = (circ, poly, centers, radii, P, Q, starts, nxt, member)
+        return self._packed
+
+    def draw(self, ax, color="0.6", **kwargs):
+        """Add the obstacles to a matplotlib axes as patches."""
+        from matplotlib.patches import Circle, Polygon
+        for c, r in zip(self._centers, self._radii):
+            ax.add_patch(Circle(c, r, color=color, **kwargs))
+        for v in self._polygons:
+            ax.add_patch(Polygon(v, color=color, **kwargs))
+
+    def digest(self):
+        """Stable hash of the scene (kinds, sizes and coordinates), e.g. for cache keys."""
+        h = hashlib.sha256("|".join(self.kinds).encode())
+        for a in (np.array(self._centers).reshape(-1, 2), np.array(self._radii), *self._polygons):
+            h.update(np.ascontiguousarray(a, dtype=np.float64).tobytes())
+            h.update(b"|")
+        return h.hexdigest()
+
+    # ---- queries ----
+    def distances(self, points, radius=0.0, chunk=None):
+        """Clearance of every pose to every obstacle, (M, len(self)).
+
+        points : (M, n+1, 2) joint positions (fk_planar output) or one (n+1, 2) pose
+        radius : link half-thickness; clearance = distance - radius
+        Negative values are penetration depths for circles; polygons report
+        -radius for any overlap.
+        """
+        pts = np.asarray(points, dtype=float)
+        single = pts.ndim == 2
+        if single:
+            pts = pts[None]
+        if pts.ndim != 3 or pts.shape[-1] != 2 or pts.shape[1] < 2:
+            raise ValueError(f"expected joint positions of shape (M, n+1, 2), got {np.shape(points)}")
+        M, n = pts.shape[0], pts.shape[1] - 1
+        circ, poly, centers, radii, P, Q, starts, nxt, member = self._pack()
+        out = np.empty((M, len(self)))
+        width = max(len(circ), len(P), 1)
+        step = chunk or max(1, _CHUNK_ELEMENTS // (n * width))
+
+        X, Y = np.ascontiguousarray(pts[..., 0]), np.ascontiguousarray(pts[..., 1])
+        for s in range(0, M, step):
+            x, y = X[s:s + step], Y[s:s + step]
+            if len(circ):
+                d2 = _point_link_dist2(centers[:, 0], centers[:, 1], x, y)   # (m, n, C)
+                out[s:s + step, circ] = np.sqrt(d2.min(axis=1)) - radii
+            if len(poly):
+                d2 = _polygon_dist2(x, y, P, Q, nxt, starts, member)
+                out[s:s + step, poly] = np.sqrt(d2)
+        if radius:
+            out -= radius
+        return out[0] if single else out
+
+    def check(self, points, radius=0.0, chunk=None):
+        """(hit (M,) bool, clearance (M,)): minimum clearance over links and obstacles."""
+        d = self.distances(points, radius, chunk)
+        if not len(self):
+            clearance = np.full(d.shape[:-1], np.inf)
+        else:
+            clearance = d.min(axis=-1)
+        return clearance <= 0.0, clearance
+
+    def collides(self, points, radius=0.0, chunk=None):
+        """(M,) collision flags."""
+        return self.check(points, radius, chunk)[0]
+
+
+def link_pairs(n_links, skip=1):
+    """(K, 2) pairs (i, j) of links of a serial chain that can touch, j > i + skip.
+
+    Neighbouring links always meet at their shared joint, so they are skipped.
+    """
+    i, j = np.triu_indices(n_links, k=skip + 1)
+    return np.stack((i, j), axis=1).astype(np.int64)
+
+
+class SelfCollision:
+    """Self-collision test for N-link planar chains, over batches of poses.
+
+    Links are capsules of half-width `thickness` (scalar or one per link); the
+    pairs to test are fixed up front (link_pairs(n) by default), so a check is
+    one gather plus one batched segment-distance pass over (poses, pairs).
+    """
+
+    def __init__(self, n_links, thickness=0.0, pairs=None):
+        self.n_links = n_links
+        self.pairs = link_pairs(n_links) if pairs is None else np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        r = np.broadcast_to(np.asarray(thickness, dtype=float), (n_links,))
+        self._i, self._j = self.pairs[:, 0], self.pairs[:, 1]
+        self._margin = r[self._i] + r[self._j]
+
+    def distances(self, points, chunk=None):
+        """Clearance of every tested pair, (M, K): distance - both half-widths."""
+        pts = np.asarray(points, dtype=float)
+        single = pts.ndim == 2
+        if single:
+            pts = pts[None]
+        if pts.ndim != 3 or pts.shape[1:] != (self.n_links + 1, 2):
+            raise ValueError(f"expected joint positions of shape (M, {self.n_links + 1}, 2), "
+                             f"got {np.shape(points)}")
+        M, K = pts.shape[0], len(self.pairs)
+        out = np.empty((M, K))
+        step = chunk or max(1, _CHUNK_ELEMENTS // max(K, 1))
+        i, j = self._i, self._j
+        X, Y = np.ascontiguousarray(pts[..., 0]), np.ascontiguousarray(pts[..., 1])
+        for s in range(0, M, step):
+            x, y = X[s:s + step], Y[s:s + step]
+            d2 = _segment_pair_dist2(x[:, i], y[:, i], x[:, i + 1], y[:, i + 1],
+                                     x[:, j], y[:, j], x[:, j + 1], y[:, j + 1])
+            out[s:s + step] = np.sqrt(d2)
+        out -= self._margin
+        return out[0] if single else out
+
+    def check(self, points, chunk=None):
+        """(hit (M,) bool, clearance (M,)): closest approach of any tested link pair."""
+        d = self.distances(points, chunk)
+        clearance = d.min(axis=-1) if len(self.pairs) else np.full(d.shape[:-1], np.inf)
+        return clearance <= 0.0, clearance
+
+    def collides(self, points, chunk=None):
+        """(M,) self-collision flags."""
+        return self.check(points, chunk)[0]
+
+
+# ---------- check against a per-pose loop, then time a large batch ----------
+def _scalar_clearance(pose, obstacles, radius=0.0):
+    from matplotlib.path import Path
+    best = np.inf
+    k_poly = 0
+    for kind, i in zip(obstacles.kinds, range(len(obstacles))):
+        if kind == "circle":
+            c = obstacles._centers[i - k_poly]
+            r = obstacles._radii[i - k_poly]
+            d = min(np.sqrt(point_segment_dist2(c, pose[j], pose[j + 1]))
+                    for j in range(len(pose) - 1)) - r
+        else:
+            v = obstacles._polygons[k_poly]
+            k_poly += 1
+            d = min(np.sqrt(segment_segment_dist2(pose[j], pose[j + 1], v[e], v[(e + 1) % len(v)]))
+                    for j in range(len(pose) - 1) for e in range(len(v)))
+            if Path(v).contains_points(pose).any():
+                d = 0.0
+        best = min(best, d - radius)
+    return best
+
+
+if __name__ == "__main__":
+    import time
+    from planar_fk import fk_planar
+
+    obstacles = (Obstacles()
+                 .add_circle((1.2, 1.2), 0.3)
+                 .add_box((-2.0, -0.4), (-1.2, 0.4))
+                 .add_box((0.5, -1.8), (1.5, -1.2), angle=0.4)
+                 .add_polygon([(1.8, 0.0), (2.6, 0.3), (2.4, 1.0), (2.0, 0.6)])
+                 .add_circle((-0.8, 1.6), 0.4))
+    lengths = np.array([1.2, 1.0, 0.6])
+    rng = np.random.default_rng(0)
+
+    q = rng.uniform(-np.pi, np.pi, size=(300, 3))
+    pts = fk_planar(q, lengths)
+    hit, clearance = obstacles.check(pts, radius=0.05)
+    ref = np.array([_scalar_clearance(p, obstacles, 0.05) for p in pts])
+    print(f"max |clearance - loop| over {len(q)} poses: {np.abs(clearance - ref).max():.1e}, "
+          f"{hit.mean():.0%} in collision")
+
+    M = 1_000_000
+    q = rng.uniform(-np.pi, np.pi, size=(M, 3))
+    t0 = time.perf_counter()
+    pts = fk_planar(q, lengths)
+    t_fk = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    hit, clearance = obstacles.check(pts, radius=0.05)
+    t_check = time.perf_counter() - t0
+    print(f"{M:,} poses x 3 links x {len(obstacles)} obstacles: fk {t_fk:.2f} s, "
+          f"check {t_check:.2f} s ({M / t_check:,.0f} poses/s), {hit.mean():.1%} colliding")
+
+    # self-collision of the 4-link arm with 0.05 thick links, all joints ±180°
+    lengths = np.array([1.5, 1.0, 1.5, 1.0])
+    selfc = SelfCollision(4, thickness=0.05)
+    pts = fk_planar(rng.uniform(-np.pi, np.pi, size=(300, 4)), lengths)
+    ref = np.array([min(np.sqrt(segment_segment_dist2(p[i], p[i + 1], p[j], p[j + 1])) - 0.1
+                        for i, j in selfc.pairs) for p in pts])
+    print(f"self-collision: max |clearance - loop| {np.abs(selfc.check(pts)[1] - ref).max():.1e} "
+          f"over {len(selfc.pairs)} link pairs")
+    pts = fk_planar(rng.uniform(-np.pi, np.pi, size=(M, 4)), lengths)
+    t0 = time.perf_counter()
+    folded = selfc.collides(pts)
+    dt = time.perf_counter() - t0
+    print(f"{M:,} 4-link poses: {dt:.2f} s ({M / dt:,.0f} poses/s), {folded.mean():.1%} folded onto themselves")
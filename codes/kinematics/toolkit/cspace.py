@@ -0,0 +1,233 @@
+# cspace.py
+# Joint-space (C-space) occupancy bitmaps for planar 2R / 3R arms.
+# Requirements: python -m pip install numpy matplotlib
+#
+# Every cell of a regular grid over the joint ranges is a pose; its center is
+# pushed through batched FK and tested against a Cartesian obstacle scene
+# (collision.Obstacles) and, for 3+ links, against self-collision. The result
+# is a boolean (res,)*n array: True = the arm collides in that cell. Planners
+# can then run grid searches on the bitmap instead of geometry checks.
+#
+# Cells are generated chunk by chunk from their flat index, so memory stays
+# flat; chunks can be spread over a process pool like workspace.py. Finished
+# maps are cached as bit-packed .npz files keyed by link lengths, scene hash,
+# resolution and check options (~/.cache/aurora_cspace, or $AURORA_CSPACE_CACHE).
+#
+#   obstacles = Obstacles().add_circle((1.2, 1.2), 0.3)
+#   cmap = cspace_map([1.5, 1.0], obstacles, resolution=512)
+#   cmap.occupied(q)            # (M,) lookups for (M, 2) joint vectors
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from collision import SelfCollision
+from planar_fk import fk_planar
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AURORA_CSPACE_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "aurora_cspace"))
+
+_loaded = {}        # key -> CSpaceMap, so repeated calls in one process are free
+
+
+class CSpaceMap:
+    """Occupancy bitmap over a box of joint space.
+
+    grid   : (res,)*n bool, True where the arm collides
+    limits : (n, 2) [min, max] joint angles (radians) spanned by the grid
+    """
+
+    def __init__(self, grid, limits):
+        self.grid = np.asarray(grid, dtype=bool)
+        self.limits = np.asarray(limits, dtype=float).reshape(self.grid.ndim, 2)
+        self.shape = self.grid.shape
+        self.step = (self.limits[:, 1] - self.limits[:, 0]) / self.shape
+        # full turns wrap around instead of clamping at the border
+        self.periodic = np.isclose(self.limits[:, 1] - self.limits[:, 0], 2 * np.pi)
+
+    @property
+    def free_fraction(self):
+        return 1.0 - self.grid.mean()
+
+    def cell(self, q):
+        """Grid index of joint vectors q, (M, n) int (or (n,) for one pose)."""
+        q = np.asarray(q, dtype=float)
+        idx = np.floor((q - self.limits[:, 0]) / self.step).astype(np.int64)
+        res = np.array(self.shape)
+        return np.where(self.periodic, idx % res, np.clip(idx, 0, res - 1))
+
+    def center(self, idx):
+        """Joint vector at the center of grid cells idx (M, n)."""
+        return self.limits[:, 0] + (np.asarray(idx) + 0.5) * self.step
+
+    def occupied(self, q):
+        """Collision flags for joint vectors q, (M,) bool, by table lookup."""
+        return self.grid[tuple(np.moveaxis(self.cell(q), -1, 0))]
+
+    def save(self, path):
+        np.savez_compressed(path, bits=np.packbits(self.grid, axis=None),
+                            shape=np.array(self.shape), limits=self.limits)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            shape = tuple(f["shape"])
+            grid = np.unpackbits(f["bits"], count=int(np.prod(shape))).reshape(shape)
+            return cls(grid.astype(bool), f["limits"])
+
+
+def _rasterize_chunk(task):
+    """Worker: collision flags for flat cells [start, stop) of the grid."""
+    start, stop, shape, limits, lengths, obstacles, radius, self_collision = task
+    idx = np.stack(np.unravel_index(np.arange(start, stop), shape), axis=1)
+    q = limits[:, 0] + (idx + 0.5) * (limits[:, 1] - limits[:, 0]) / shape
+    pts = fk_planar(q, lengths)
+    hit = np.zeros(stop - start, dtype=bool)
+    if obstacles is not None and len(obstacles):
+        hit |= obstacles.collides(pts, radius=radius)
+    if self_collision is not None:
+        hit |= self_collision.collides(pts)
+    return hit
+
+
+def cache_key(lengths, obstacles, resolution, limits, radius, self_collision):
+    """Hash of everything that changes the bitmap."""
+    text = json.dumps({
+        "version": CACHE_VERSION,
+        "lengths": [float(x) for x in lengths],
+        "scene": obstacles.digest() if obstacles is not None else None,
+        "resolution": [int(r) for r in resolution],
+        "limits": np.asarray(limits, dtype=float).round(12).tolist(),
+        "radius": float(radius),
+        "self_collision": self_collision,
+    }, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def cspace_map(lengths, obstacles, resolution=256, joint_limits=None, radius=0.0,
+               self_collision=True, chunk=1 << 16, workers=1, cache_dir=None):
+    """Rasterize an obstacle scene into a joint-space bitmap (cached on disk).
+
+    lengths        : (n,) link lengths, n = 2 or 3 (any n works, at res**n cells)
+    obstacles      : collision.Obstacles in the arm's base frame (or None)
+    resolution     : cells per joint, int or one per joint
+    joint_limits   : (n, 2) [min, max] radians per joint (default ±π)
+    radius         : link half-thickness used for obstacle and self-collision checks
+    self_collision : also mark poses where non-adjacent links touch
+    workers        : process count (1 runs in-process, None = all cores)
+    cache_dir      : where maps live (default ~/.cache/aurora_cspace, or
+                     $AURORA_CSPACE_CACHE); pass False to skip the disk cache
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    n = lengths.size
+    res = tuple(np.broadcast_to(np.asarray(resolution, dtype=np.int64), (n,)).tolist())
+    if joint_limits is None:
+        joint_limits = np.array([[-np.pi, np.pi]] * n)
+    limits = np.asarray(joint_limits, dtype=float).reshape(n, 2)
+    self_collision = bool(self_collision) and n > 2
+
+    key = cache_key(lengths, obstacles, res, limits, radius, self_collision)
+    if key in _loaded:
+        return _loaded[key]
+    cache_path = None
+    if cache_dir is not False:
+        cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        cache_path = os.path.join(cache_dir, f"{key[:24]}.npz")
+    if cache_path and os.path.exists(cache_path):
+        cmap = CSpaceMap.load(cache_path)
+    else:
+        selfc = SelfCollision(n, thickness=radius) if self_collision else None
+        total = int(np.prod(res))
+        tasks = [(s, min(s + chunk, total), res, limits, lengths, obstacles, radius, selfc)
+                 for s in range(0, total, chunk)]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(tasks) == 1:
+            flags = [_rasterize_chunk(t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                flags = list(pool.map(_rasterize_chunk, tasks))
+        cmap = CSpaceMap(np.concatenate(flags).reshape(res), limits)
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = cache_path[:-4] + f".{os.getpid()}.tmp.npz"
+            cmap.save(tmp)
+            os.replace(tmp, cache_path)         # atomic: readers never see half a file
+    _loaded[key] = cmap
+    return cmap
+
+
+def plot_cspace(cmap, obstacles=None, lengths=None, q=None):
+    """Workspace (scene + arm at q) next to the 2R C-space bitmap (q marked)."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax_w, ax_c) = plt.subplots(1, 2, figsize=(12, 6))
+    if obstacles is not None:
+        obstacles.draw(ax_w)
+    if lengths is not None:
+        reach = np.sum(lengths) + 0.2
+        ax_w.set_xlim(-reach, reach)
+        ax_w.set_ylim(-reach, reach)
+        if q is not None:
+            p = fk_planar(q, lengths)
+            ax_w.plot(p[:, 0], p[:, 1], marker="o", linewidth=3)
+    ax_w.set_aspect("equal", adjustable="box")
+    ax_w.grid(True, linestyle="--", linewidth=0.5)
+    ax_w.set_title("Workspace")
+
+    lim = np.rad2deg(cmap.limits)
+    ax_c.imshow(cmap.grid.T if cmap.grid.ndim == 2 else cmap.grid.any(axis=2).T,
+                origin="lower", cmap="Greys", interpolation="nearest",
+                extent=(lim[0, 0], lim[0, 1], lim[1, 0], lim[1, 1]))
+    if q is not None:
+        ax_c.plot(*np.rad2deg(q[:2]), "o", color="tab:red")
+    ax_c.set_xlabel("θ1 (deg)")
+    ax_c.set_ylabel("θ2 (deg)")
+    ax_c.set_title(f"C-space, {cmap.free_fraction:.0%} free")
+    return fig
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from collision import Obstacles
+
+    # the two-link arm of 2-links_2d.py in a small cell
+    lengths = [1.5, 1.0]
+    obstacles = (Obstacles()
+                 .add_circle((1.2, 1.2), 0.3)
+                 .add_box((-2.0, -0.4), (-1.2, 0.4))
+                 .add_polygon([(1.6, -0.6), (2.4, -0.3), (2.2, -1.2)]))
+    cache = tempfile.mkdtemp(prefix="cspace_")
+
+    t0 = time.perf_counter()
+    cmap = cspace_map(lengths, obstacles, resolution=512, radius=0.05, cache_dir=cache)
+    t_cold = time.perf_counter() - t0
+    _loaded.clear()                         # a new process: only the disk cache is warm
+    t0 = time.perf_counter()
+    cspace_map(lengths, obstacles, resolution=512, radius=0.05, cache_dir=cache)
+    t_disk = time.perf_counter() - t0
+    print(f"2R, 512x512 cells: rasterized in {t_cold:.2f} s, loaded from cache in "
+          f"{t_disk * 1e3:.1f} ms; {cmap.free_fraction:.1%} free")
+
+    q = np.random.default_rng(0).uniform(-np.pi, np.pi, size=(100_000, 2))
+    t0 = time.perf_counter()
+    flags = cmap.occupied(q)
+    t_lookup = time.perf_counter() - t0
+    exact = obstacles.collides(fk_planar(q, lengths), radius=0.05)
+    print(f"100,000 lookups in {t_lookup * 1e3:.1f} ms; agree with exact checks on "
+          f"{(flags == exact).mean():.2%} (cell-size discretization)")
+
+    t0 = time.perf_counter()
+    cmap3 = cspace_map([1.5, 1.0, 1.5], obstacles, resolution=96, radius=0.05,
+                       workers=None, cache_dir=cache)
+    print(f"3R, 96^3 cells (self-collision on): {time.perf_counter() - t0:.2f} s, "
+          f"{cmap3.free_fraction:.1%} free")
+
+    import matplotlib.pyplot as plt
+    plot_cspace(cmap, obstacles, lengths, q=np.deg2rad([30.0, 30.0]))
+    plt.show()
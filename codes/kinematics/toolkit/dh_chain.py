@@ -0,0 +1,192 @@
+# dh_chain.py
+# Batched Denavit–Hartenberg forward kinematics for serial 3D arms.
+# Requirements: python -m pip install numpy
+#
+# Standard DH convention, one row per joint:  (theta, d, a, alpha)
+#   A_i = Rz(theta_i) · Tz(d_i) · Tx(a_i) · Rx(alpha_i)
+#       = [[ct, -st·ca,  st·sa, a·ct],
+#          [st,  ct·ca, -ct·sa, a·st],
+#          [ 0,     sa,     ca,    d],
+#          [ 0,      0,      0,    1]]
+# For a revolute joint q_i is added to theta_i, for a prismatic joint to d_i.
+#
+# Instead of building an np.array per joint and multiplying 4x4 matrices, the
+# chain is composed column by column using the structure of A_i:
+#   u  = R0·ct + R1·st          (new x axis)
+#   v  = R1·ct - R0·st
+#   y' = v·ca + R2·sa           (new y axis)
+#   z' = R2·ca - v·sa           (new z axis)
+#   p' = p + a·u + d·R2
+# on structure-of-arrays buffers that are allocated once and reused per chunk.
+
+import numpy as np
+
+
+class DHChain:
+    """Serial chain described by a DH table.
+
+    table       : (n, 4) rows of (theta, d, a, alpha); theta/d are offsets
+    joint_types : string or sequence of 'R' (revolute) / 'P' (prismatic), default all 'R'
+    chunk       : configurations processed per pass (keeps the buffers in cache)
+
+    The work buffers are owned by the instance, so one DHChain should not be
+    shared between threads.
+    """
+
+    def __init__(self, table, joint_types=None, chunk=2048):
+        table = np.asarray(table, dtype=float)
+        if table.ndim != 2 or table.shape[1] != 4:
+            raise ValueError(f"DH table must have shape (n, 4), got {table.shape}")
+        self.table = table
+        self.n = n = table.shape[0]
+        types = "R" * n if joint_types is None else "".join(joint_types).upper()
+        if len(types) != n or set(types) - set("RP"):
+            raise ValueError("joint_types must contain one 'R' or 'P' per joint")
+        self.joint_types = types
+        self.prismatic = np.array([t == "P" for t in types])
+        self.chunk = chunk
+
+        self._ca = np.cos(table[:, 3])
+        self._sa = np.sin(table[:, 3])
+
+        # structure-of-arrays work buffers: (n+1, 4, 4, chunk) transforms
+        S = np.zeros((n + 1, 4, 4, chunk))
+        S[0, 0, 0] = S[0, 1, 1] = S[0, 2, 2] = 1.0
+        S[:, 3, 3] = 1.0
+        self._S = S
+        self._theta = np.empty((n, chunk))
+        self._d = np.empty((n, chunk))
+        self._ct = np.empty((n, chunk))
+        self._st = np.empty((n, chunk))
+        self._u = np.empty((3, chunk))
+        self._v = np.empty((3, chunk))
+        self._t = np.empty((3, chunk))
+
+    def fk(self, q, out=None):
+        """All link transforms for a batch of joint vectors.
+
+        q   : (M, n) joint values (radians / length units), or a single (n,) vector
+        out : optional (M, n+1, 4, 4) array to write into
+        Returns (M, n+1, 4, 4): [:, 0] is the base (identity), [:, -1] the end-effector.
+        """
+        q = np.asarray(q, dtype=float)
+        single = q.ndim == 1
+        q = np.atleast_2d(q)
+        M = q.shape[0]
+        if q.shape[1] != self.n:
+            raise ValueError(f"expected q of shape (M, {self.n}), got {q.shape}")
+        if out is None:
+            out = np.empty((M, self.n + 1, 4, 4))
+        elif out.shape != (M, self.n + 1, 4, 4):
+            raise ValueError(f"out must have shape {(M, self.n + 1, 4, 4)}, got {out.shape}")
+
+        for start in range(0, M, self.chunk):
+            stop = min(start + self.chunk, M)
+            self._fk_chunk(q[start:stop], out[start:stop])
+        return out[0] if single else out
+
+    def ee(self, q):
+        """End-effector transforms only, (M, 4, 4)."""
+        return self.fk(q)[..., -1, :, :]
+
+    def _fk_chunk(self, q, out):
+        m = q.shape[0]
+        S = self._S[..., :m]
+        theta, d = self._theta[:, :m], self._d[:, :m]
+        ct, st = self._ct[:, :m], self._st[:, :m]
+        u, v, t = self._u[:, :m], self._v[:, :m], self._t[:, :m]
+        a, ca, sa = self.table[:, 2], self._ca, self._sa
+
+        qT = q.T
+        theta[:] = self.table[:, :1]
+        d[:] = self.table[:, 1:2]
+        theta[~self.prismatic] += qT[~self.prismatic]
+        d[self.prismatic] += qT[self.prismatic]
+        np.cos(theta, out=ct)
+        np.sin(theta, out=st)
+
+        for i in range(self.n):
+            P, N = S[i], S[i + 1]
+            R0, R1, R2, p = P[:3, 0], P[:3, 1], P[:3, 2], P[:3, 3]
+            np.multiply(R0, ct[i], out=u)
+            np.multiply(R1, st[i], out=t)
+            np.add(u, t, out=u)
+            np.multiply(R1, ct[i], out=v)
+            np.multiply(R0, st[i], out=t)
+            np.subtract(v, t, out=v)
+
+            N[:3, 0] = u
+            np.multiply(v, ca[i], out=N[:3, 1])
+            np.multiply(R2, sa[i], out=t)
+            np.add(N[:3, 1], t, out=N[:3, 1])
+            np.multiply(R2, ca[i], out=N[:3, 2])
+            np.multiply(v, sa[i], out=t)
+            np.subtract(N[:3, 2], t, out=N[:3, 2])
+            np.multiply(u, a[i], out=N[:3, 3])
+            np.add(N[:3, 3], p, out=N[:3, 3])
+            np.multiply(R2, d[i], out=t)
+            np.add(N[:3, 3], t, out=N[:3, 3])
+
+        out[...] = S.transpose(3, 0, 1, 2)
+
+
+def dh_transform(theta, d, a, alpha):
+    """Single 4x4 DH link transform (reference implementation)."""
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+    return np.array([[ct, -st*ca,  st*sa, a*ct],
+                     [st,  ct*ca, -ct*sa, a*st],
+                     [0.0,    sa,     ca,    d],
+                     [0.0,   0.0,    0.0,  1.0]])
+
+
+def yaw_shoulder_elbow_chain(L1=1.5, L2=1.0):
+    """DH model of the arm in 2_links_3d.py: base yaw about z, then shoulder
+    and elbow pitch about y (joint order: yaw, shoulder, elbow).
+
+    Frames 0, 2, 3 sit at the points of workspace.points_yaw_shoulder_elbow,
+    the closed form to use when only positions are needed."""
+    return DHChain([[0.0, 0.0, 0.0, -np.pi/2],
+                    [0.0, 0.0, L1,   0.0],
+                    [0.0, 0.0, L2,   0.0]])
+
+
+if __name__ == "__main__":
+    import time
+
+    # a generic 6-DOF arm (UR5-like DH table)
+    table = [[0.0, 0.0892,  0.0,     np.pi/2],
+             [0.0, 0.0,    -0.425,   0.0],
+             [0.0, 0.0,    -0.392,   0.0],
+             [0.0, 0.1093,  0.0,     np.pi/2],
+             [0.0, 0.0948,  0.0,    -np.pi/2],
+             [0.0, 0.0825,  0.0,     0.0]]
+    arm = DHChain(table)
+    rng = np.random.default_rng(0)
+
+    # per-joint np.array construction, one configuration at a time
+    q_small = rng.uniform(-np.pi, np.pi, size=(5_000, 6))
+    t0 = time.perf_counter()
+    ref = []
+    for qi in q_small:
+        T = np.eye(4)
+        for (th, d, a, al), x in zip(table, qi):
+            T = T @ dh_transform(th + x, d, a, al)
+        ref.append(T)
+    t_loop = time.perf_counter() - t0
+    err = np.abs(arm.fk(q_small)[:, -1] - np.array(ref)).max()
+
+    M = 1_000_000
+    q = rng.uniform(-np.pi, np.pi, size=(M, 6))
+    out = np.empty((M, 7, 4, 4))
+    t0 = time.perf_counter()
+    arm.fk(q, out=out)
+    t_batch = time.perf_counter() - t0
+    print(f"per-joint loop : {len(q_small)/t_loop:12,.0f} configs/s")
+    print(f"DHChain.fk     : {M/t_batch:12,.0f} configs/s  (max err {err:.1e})")
+
+    from workspace import points_yaw_shoulder_elbow
+    q3 = rng.uniform(-np.pi, np.pi, size=(10_000, 3))
+    origins = yaw_shoulder_elbow_chain().fk(q3)[:, :, :3, 3][:, [0, 2, 3]]
+    err3 = np.abs(origins - points_yaw_shoulder_elbow(q3, (1.5, 1.0))).max()
+    print(f"yaw/shoulder/elbow chain vs closed form: max err {err3:.1e}")
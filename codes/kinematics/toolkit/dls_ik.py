@@ -0,0 +1,99 @@
+# dls_ik.py
+# Batched damped-least-squares IK for redundant N-link planar arms.
+# Requirements: python -m pip install numpy
+#
+# The closed-form ik_2r only exists for two links. For the 3-link / 4-link arms
+# in tasks/Task-2/Osayande/Overdo/2d/python/ we iterate
+#     dq = J^T (J J^T + λ² I)^-1 e          (e = target - fk(q))
+# on a whole batch of targets at once. J J^T is only 2x2 for a planar position
+# task, so it is inverted in closed form. Targets that have converged are
+# dropped from the active set, so they stop costing compute.
+
+import numpy as np
+
+from jacobian import planar_fk_jacobian
+
+
+def dls_ik(targets, lengths, q0=None, damping=0.05, tol=1e-6, max_iter=100,
+           max_step=0.5):
+    """Solve IK for every target with damped least squares.
+
+    targets  : (M, 2) Cartesian goals
+    lengths  : (n,) link lengths
+    q0       : (M, n) or (n,) initial guess, e.g. the previous trajectory point
+               (warm start); default is a slightly bent arm
+    damping  : λ, trades accuracy near singularities for stability
+    max_step : per-iteration cap on |dq| (radians)
+    returns (q, converged, iterations)
+        q          – (M, n) joint angles
+        converged  – (M,) bool, |e| < tol
+        iterations – (M,) iterations each target needed
+    """
+    targets = np.atleast_2d(np.asarray(targets, dtype=float))
+    L = np.asarray(lengths, dtype=float)
+    M, n = targets.shape[0], L.size
+    if q0 is None:
+        q = np.full((M, n), 0.3)
+    else:
+        q = np.array(np.broadcast_to(np.asarray(q0, dtype=float), (M, n)))
+
+    converged = np.zeros(M, dtype=bool)
+    iterations = np.zeros(M, dtype=int)
+    active = np.arange(M)
+    lam2 = damping*damping
+
+    for _ in range(max_iter + 1):
+        qa = q[active]
+        pts, J = planar_fk_jacobian(qa, L)
+        e = targets[active] - pts[:, -1]
+        done = np.einsum("ij,ij->i", e, e) < tol*tol
+        converged[active[done]] = True
+        keep = ~done
+        active, qa, J, e = active[keep], qa[keep], J[keep], e[keep]
+        if active.size == 0 or _ == max_iter:
+            break
+        iterations[active] += 1
+
+        # closed-form inverse of the 2x2 matrix A = J J^T + λ² I
+        a = np.einsum("ij,ij->i", J[:, 0], J[:, 0]) + lam2
+        b = np.einsum("ij,ij->i", J[:, 0], J[:, 1])
+        d = np.einsum("ij,ij->i", J[:, 1], J[:, 1]) + lam2
+        det = a*d - b*b
+        wx = (d*e[:, 0] - b*e[:, 1]) / det
+        wy = (a*e[:, 1] - b*e[:, 0]) / det
+        dq = J[:, 0]*wx[:, None] + J[:, 1]*wy[:, None]
+
+        norm = np.abs(dq).max(axis=1, keepdims=True)
+        dq *= np.minimum(1.0, max_step / np.maximum(norm, 1e-12))
+        q[active] = qa + dq
+
+    return q, converged, iterations
+
+
+if __name__ == "__main__":
+    import time
+    from planar_fk import fk_planar_ee
+
+    rng = np.random.default_rng(0)
+    for lengths in ([1.5, 1.0, 1.5], [1.5, 1.0, 1.5, 1.0]):
+        L = np.array(lengths)
+        M = 20_000
+        # reachable targets: FK of random poses
+        targets = fk_planar_ee(rng.uniform(-np.pi, np.pi, size=(M, L.size)), L)
+
+        t0 = time.perf_counter()
+        q, ok, its = dls_ik(targets, L)
+        dt = time.perf_counter() - t0
+        err = np.linalg.norm(fk_planar_ee(q, L) - targets, axis=1)
+        print(f"{L.size}-link cold : {ok.mean():6.1%} converged, median {np.median(its):.0f} it, "
+              f"{M/dt:,.0f} targets/s, max err {err[ok].max():.1e}")
+
+        # warm start along a trajectory: previous point's solution as the seed
+        path = targets[0] + np.linspace(0, 0.5, 200)[:, None] * np.array([[-1.0, 0.3]])
+        q_prev, total = q[:1], 0
+        t0 = time.perf_counter()
+        for p in path:
+            q_prev, ok1, it1 = dls_ik(p, L, q0=q_prev)
+            total += it1[0]
+        print(f"{L.size}-link warm : {total/len(path):.1f} it/point along a 200-point path "
+              f"({len(path)/(time.perf_counter()-t0):,.0f} points/s)")
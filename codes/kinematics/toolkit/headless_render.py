@@ -0,0 +1,296 @@
+# headless_render.py
+# Render arm visualizations to PNG sequences / GIF / MP4 without a display.
+# Requirements: python -m pip install numpy matplotlib pillow   (MP4 also needs ffmpeg)
+#
+# Every scene is drawn on a bare matplotlib Figure with the Agg canvas (no
+# pyplot, no GUI event loop), so it runs on display-less servers. The trajectory
+# is split into contiguous frame ranges, each range is rendered by one worker
+# process (which builds its figure once and only updates artist data per
+# frame), and the PNGs are stitched into a GIF / MP4 at the end.
+#
+# Scenes (the look of the interactive scripts):
+#   planar  – 2-links_2d.py and the 3-link / 4-link arms;  rows = joint angles (n,)
+#   arm3d   – 2_links_3d.py;                               rows = (yaw, shoulder, elbow)
+#   ik2r    – inverse-kinematics/py/2_links_2d.py;         rows = click targets (x, y)
+#   frames2d / frames3d – 2d_frames_gui.py / 3d_frames_gui.py; rows = world frames
+#             as flattened (d+1)x(d+1) matrices, frame k shows frames 0..k
+# Angles are radians.
+#
+#   python headless_render.py planar q.npy run.mp4 --lengths 1.5 1.0 --workers 8
+#   python headless_render.py arm3d session.bin run.gif --degrees   # ARM_RECORD file
+
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+from planar_fk import fk_planar
+from planar_ik import ik_2r_batch
+from workspace import points_yaw_shoulder_elbow
+
+
+def _figure(size=7.0, projection=None):
+    fig = Figure(figsize=(size, size))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, projection=projection)
+    return fig, ax
+
+
+# ---------- scenes: scene(traj, **kw) -> (fig, apply(i)) ----------
+def planar_scene(traj, lengths=(1.5, 1.0)):
+    L = np.asarray(lengths, dtype=float)
+    pts = fk_planar(traj, L)                        # one batched FK for the whole range
+    fig, ax = _figure()
+    lim = L.sum() + 0.2
+    ax.set_aspect("equal", adjustable="box")
+    ax.set_xlim(-lim, lim)
+    ax.set_ylim(-lim, lim)
+    ax.grid(True, linestyle="--", linewidth=0.5)
+    ax.set_title(f"{L.size}-Link Planar Arm")
+    (line,) = ax.plot([], [], marker="o", linewidth=3)
+    text = ax.text(0.02, 0.98, "", transform=ax.transAxes, va="top", ha="left",
+                   fontsize=10, bbox=dict(boxstyle="round", fc="w", ec="0.7"))
+
+    def apply(i):
+        line.set_data(pts[i, :, 0], pts[i, :, 1])
+        angles = ", ".join(f"θ{k+1}={a:.1f}°" for k, a in enumerate(np.rad2deg(traj[i])))
+        text.set_text(f"EE: x={pts[i, -1, 0]:.3f}, y={pts[i, -1, 1]:.3f}\n{angles}")
+    return fig, apply
+
+
+def arm3d_scene(traj, L1=1.5, L2=1.0):
+    pts = points_yaw_shoulder_elbow(traj, (L1, L2))   # (len, 3, 3) base/elbow/tip
+    fig, ax = _figure(projection="3d")
+    ax.set_title("3D 2-Link Arm (yaw, shoulder, elbow)")
+    ax.set_box_aspect((1, 1, 1))
+    lim = L1 + L2 + 0.3
+    ax.set_xlim(-lim, lim); ax.set_ylim(-lim, lim); ax.set_zlim(-lim, lim)
+    ax.set_xlabel("X"); ax.set_ylabel("Y"); ax.set_zlabel("Z")
+    (line,) = ax.plot([], [], [], marker="o", linewidth=3)
+    text = ax.text2D(0.02, 0.98, "", transform=ax.transAxes, va="top")
+
+    def apply(i):
+        p = pts[i]
+        line.set_data_3d(p[:, 0], p[:, 1], p[:, 2])
+        d = np.rad2deg(traj[i])
+        text.set_text(f"EE: x={p[2, 0]:.3f}, y={p[2, 1]:.3f}, z={p[2, 2]:.3f}\n"
+                      f"yaw={d[0]:.1f}°, sh={d[1]:.1f}°, el={d[2]:.1f}°")
+    return fig, apply
+
+
+def ik2r_scene(traj, L1=1.5, L2=1.0):
+    sols, ok = ik_2r_batch(traj, L1, L2)
+    arms = fk_planar(sols.reshape(-1, 2), [L1, L2]).reshape(len(traj), 2, 3, 2)
+    fig, ax = _figure()
+    R = L1 + L2
+    ax.set_aspect("equal", adjustable="box")
+    ax.set_xlim(-R - 0.2, R + 0.2); ax.set_ylim(-R - 0.2, R + 0.2)
+    ax.grid(True, linestyle="--", linewidth=0.5)
+    ax.set_title("2-Link IK")
+    for radius in (R, abs(L1 - L2)):
+        ax.add_patch(Circle((0, 0), radius, color="0.85", fill=False, linestyle=":"))
+    (line_a,) = ax.plot([], [], marker="o", linewidth=4, label="elbow-down")
+    (line_b,) = ax.plot([], [], marker="o", linewidth=4, label="elbow-up")
+    (dot,) = ax.plot([], [], "rx", markersize=10, mew=2)
+    text = ax.text(0.02, 0.98, "", transform=ax.transAxes, va="top",
+                   bbox=dict(boxstyle="round", fc="w", ec="0.7"))
+    ax.legend(loc="lower right")
+
+    def apply(i):
+        x, y = traj[i]
+        dot.set_data([x], [y])
+        if not ok[i]:
+            line_a.set_data([], []); line_b.set_data([], [])
+            text.set_text(f"Target: ({x:.3f}, {y:.3f})\nUnreachable.")
+            return
+        line_a.set_data(arms[i, 0, :, 0], arms[i, 0, :, 1])
+        line_b.set_data(arms[i, 1, :, 0], arms[i, 1, :, 1])
+        (t1a, t2a), (t1b, t2b) = np.degrees(sols[i])
+        text.set_text(f"Target: ({x:.3f}, {y:.3f})\n"
+                      f"Elbow-down: θ1={t1a:.1f}°, θ2={t2a:.1f}°\n"
+                      f"Elbow-up  : θ1={t1b:.1f}°, θ2={t2b:.1f}°")
+    return fig, apply
+
+
+def frames_scene(traj, dim=3):
+    T = traj.reshape(len(traj), dim + 1, dim + 1)
+    origins, rots = T[:, :dim, dim], T[:, :dim, :dim]
+    lo = origins.min(axis=0) - 0.5
+    hi = origins.max(axis=0) + 0.5
+    span = np.linalg.norm(hi - lo)
+    axis_len = max(0.2, (0.18 if dim == 2 else 0.12)*span)
+    center, half = (lo + hi) / 2, max(hi - lo) / 2
+
+    if dim == 2:
+        Segments = LineCollection
+        fig, ax = _figure(6.2)
+        ax.set_aspect("equal", adjustable="box")
+        ax.grid(True, linestyle=":", linewidth=0.6)
+        ax.set_title("2D Kinematics: Incremental Frames")
+    else:
+        Segments = Line3DCollection
+        fig, ax = _figure(6.5, projection="3d")
+        ax.set_box_aspect([1, 1, 1])
+        ax.view_init(elev=22, azim=-60)
+        ax.set_zlim(center[2] - half, center[2] + half)
+        ax.set_title("3D Kinematics: Incremental Frames")
+    ax.set_xlim(center[0] - half, center[0] + half)
+    ax.set_ylim(center[1] - half, center[1] + half)
+    links = Segments([], lw=2, colors="k")
+    triads = [Segments([], lw=2, colors=c) for c in "rgb"[:dim]]
+    for coll in triads + [links]:
+        ax.add_collection(coll)
+
+    def apply(i):
+        o = origins[:i + 1]
+        for k, coll in enumerate(triads):
+            coll.set_segments(np.stack([o, o + axis_len*rots[:i + 1, :, k]], axis=1))
+        links.set_segments(np.stack([o[:-1], o[1:]], axis=1))
+    return fig, apply
+
+
+SCENES = {
+    "planar": planar_scene,
+    "arm3d": arm3d_scene,
+    "ik2r": ik2r_scene,
+    "frames2d": lambda traj, **kw: frames_scene(traj, dim=2, **kw),
+    "frames3d": lambda traj, **kw: frames_scene(traj, dim=3, **kw),
+}
+
+
+# ---------- rendering ----------
+def _render_range(task):
+    """Worker: build the scene once, then draw and save frames [start, stop)."""
+    scene, kw, traj, start, stop, frame_dir, dpi = task
+    build = SCENES[scene] if isinstance(scene, str) else scene
+    if scene in ("frames2d", "frames3d"):
+        # frame k shows frames 0..k; the view is fitted to the whole chain
+        fig, apply = build(traj, **kw)
+        indices = range(start, stop)
+    else:
+        traj = traj[start:stop]
+        fig, apply = build(traj, **kw)
+        indices = range(stop - start)
+    for n, i in enumerate(indices):
+        apply(i)
+        fig.savefig(os.path.join(frame_dir, f"frame_{start + n:06d}.png"), dpi=dpi)
+    return stop - start
+
+
+def _stitch(frame_dir, n_frames, out, fps):
+    ext = os.path.splitext(out)[1].lower()
+    if ext == ".gif":
+        from PIL import Image
+        frames = [Image.open(os.path.join(frame_dir, f"frame_{i:06d}.png")) for i in range(n_frames)]
+        frames[0].save(out, save_all=True, append_images=frames[1:],
+                       duration=int(round(1000 / fps)), loop=0)
+        for f in frames:
+            f.close()
+    elif ext == ".mp4":
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("MP4 output needs ffmpeg on PATH (or write .gif / a PNG directory)")
+        subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-framerate", str(fps),
+                        "-i", os.path.join(frame_dir, "frame_%06d.png"),
+                        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", out],
+                       check=True)
+    else:
+        raise ValueError(f"unsupported output {out!r}: use a directory, .gif or .mp4")
+
+
+def render(scene, trajectory, out, workers=None, fps=30, dpi=80, chunk=None, **scene_kw):
+    """Render one frame per trajectory row.
+
+    scene      : name from SCENES, or a module-level function scene(traj, **kw)
+                 returning (fig, apply(i)) (it has to be picklable)
+    trajectory : (N, k) array, one row per frame
+    out        : directory -> PNG sequence frame_000000.png, ...;
+                 *.gif / *.mp4 -> stitched video
+    workers    : processes (default: CPU count); frames are split into
+                 contiguous ranges of `chunk` frames
+    Returns the output path.
+    """
+    traj = np.asarray(trajectory, dtype=float)
+    if traj.ndim != 2 or len(traj) == 0:
+        raise ValueError(f"expected a non-empty (N, k) trajectory, got shape {traj.shape}")
+    N = len(traj)
+    workers = workers or os.cpu_count() or 1
+    chunk = chunk or max(1, -(-N // (4 * workers)))
+
+    video = os.path.splitext(out)[1].lower() in (".gif", ".mp4")
+    frame_dir = tempfile.mkdtemp(prefix="arm_frames_") if video else out
+    os.makedirs(frame_dir, exist_ok=True)
+    tasks = [(scene, scene_kw, traj, s, min(s + chunk, N), frame_dir, dpi)
+             for s in range(0, N, chunk)]
+    try:
+        if workers == 1:
+            for task in tasks:
+                _render_range(task)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for _ in pool.map(_render_range, tasks):
+                    pass
+        if video:
+            _stitch(frame_dir, N, out, fps)
+    finally:
+        if video:
+            shutil.rmtree(frame_dir, ignore_errors=True)
+    return out
+
+
+def load_trajectory(path):
+    """(N, k) rows from a .npy / .csv file or a TrajectoryRecorder .bin (time column dropped)."""
+    if path.endswith(".npy"):
+        return np.load(path)
+    if path.endswith(".csv"):
+        return np.loadtxt(path, delimiter=",", ndmin=2)
+    from trajectory_recorder import TrajectoryPlayer
+    return np.array(TrajectoryPlayer(path).joints)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Render arm visualizations without a display.")
+    parser.add_argument("scene", choices=sorted(SCENES))
+    parser.add_argument("trajectory", nargs="?", help=".npy / .csv / recorder .bin (default: demo)")
+    parser.add_argument("out", nargs="?", default="arm.gif", help="PNG directory, .gif or .mp4")
+    parser.add_argument("--lengths", type=float, nargs="+", help="link lengths (planar scene)")
+    parser.add_argument("--degrees", action="store_true", help="trajectory angles are in degrees")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--dpi", type=int, default=80)
+    args = parser.parse_args()
+
+    if args.trajectory:
+        traj = load_trajectory(args.trajectory)
+    else:                                   # demo: a smooth sweep for the chosen scene
+        s = np.linspace(0, 2*np.pi, 120)[:, None]
+        traj = {"planar": np.hstack([s, np.sin(s)]),
+                "arm3d": np.hstack([s, 0.5*np.sin(s), np.cos(s)]),
+                "ik2r": 1.8*np.hstack([np.cos(s), 0.8*np.sin(2*s)])}.get(args.scene)
+        if traj is None:
+            from rigid import RigidTransform
+            from rotations import rot_z
+            steps = RigidTransform(rot_z(np.full(40, 0.3)), np.tile([0.4, 0.0, 0.05], (40, 1)))
+            T = RigidTransform.chain(steps).as_matrix()
+            if args.scene == "frames2d":
+                T = np.delete(np.delete(T, 2, axis=1), 2, axis=2)
+            traj = T.reshape(len(T), -1)
+    if args.degrees and args.scene in ("planar", "arm3d"):
+        traj = np.deg2rad(traj)
+    kw = {"lengths": args.lengths} if args.lengths and args.scene == "planar" else {}
+
+    t0 = time.perf_counter()
+    render(args.scene, traj, args.out, workers=args.workers, fps=args.fps, dpi=args.dpi, **kw)
+    dt = time.perf_counter() - t0
+    print(f"{len(traj)} frames -> {args.out} in {dt:.1f} s ({len(traj)/dt:.1f} frames/s)")
@@ -0,0 +1,227 @@
+# ik_seed.py
+# Precomputed voxel index from end-effector position to joint configuration,
+# used to seed numerical IK.
+# Requirements: python -m pip install numpy
+#
+# Offline: sample joint space uniformly, run batched FK and drop every sample into
+# a voxel of edge `voxel`. Each occupied voxel keeps up to `cap` samples (they
+# are usually different IK branches of nearby points). The index is written as
+#   keys.npy   (C,)           sorted flat voxel ids
+#   q.npy      (C, cap, n)    joint samples, NaN where a voxel has fewer than cap
+#   ee.npy     (C, cap, d)    their end-effector positions
+#   index.json                grid origin / shape / voxel size and the arm model
+# and opened again with mmap_mode="r", so only the pages a query touches are read.
+#
+# Online: for a batch of targets look up the 3^d voxels around each one with
+# np.searchsorted and return the stored sample closest to the target. That puts
+# the seed within ~voxel of the goal, so dls_ik needs a handful of iterations
+# instead of dozens, and the lookup cost does not depend on the target.
+#
+# Near full stretch the seed is close but the Jacobian is nearly singular, and
+# the default damping shrinks every step: dls_ik crawls for 100+ iterations.
+# seeded_ik bounds that: targets that have not converged after max_iter are
+# restarted from where they stalled with light damping (safe this close to the
+# goal), so no target ever costs more than 2 * max_iter iterations.
+
+import json
+import os
+
+import numpy as np
+
+from dls_ik import dls_ik
+from planar_fk import fk_planar_ee
+
+
+def _ee_fn(lengths, chain):
+    if (lengths is None) == (chain is None):
+        raise ValueError("pass exactly one of lengths (planar arm) or chain (DHChain)")
+    if chain is not None:
+        return chain.n, 3, lambda q: chain.fk(q)[:, -1, :3, 3]
+    L = np.asarray(lengths, dtype=float)
+    return L.size, 2, lambda q: fk_planar_ee(q, L)
+
+
+def _keep_per_voxel(keys, q, ee, cap):
+    """Sort by voxel and keep the first `cap` rows of every voxel."""
+    order = np.argsort(keys, kind="stable")
+    keys, q, ee = keys[order], q[order], ee[order]
+    first = np.r_[True, keys[1:] != keys[:-1]]
+    start = np.maximum.accumulate(np.where(first, np.arange(keys.size), 0))
+    keep = np.arange(keys.size) - start < cap
+    return keys[keep], q[keep], ee[keep]
+
+
+def build_seed_index(out_dir, lengths=None, chain=None, samples=2_000_000,
+                     voxel=0.05, cap=4, joint_limits=None, chunk=500_000, seed=0):
+    """Sample joint space, run batched FK and write a voxel index to out_dir.
+
+    lengths / chain : a planar arm (link lengths) or a DHChain (3D), not both
+    samples         : joint configurations to draw
+    voxel           : voxel edge length; seeds land within ~voxel of the target
+    cap             : samples kept per voxel
+    joint_limits    : (n, 2) ranges, default [-π, π] for every joint
+    Returns the index opened as a SeedIndex.
+    """
+    n, dim, ee_of = _ee_fn(lengths, chain)
+    if joint_limits is None:
+        joint_limits = [[-np.pi, np.pi]] * n
+    lim = np.asarray(joint_limits, dtype=float)
+    if lim.shape != (n, 2):
+        raise ValueError(f"joint_limits must have shape ({n}, 2), got {lim.shape}")
+
+    # the grid must cover the whole workspace before samples can be binned
+    if chain is not None:
+        reach = np.abs(chain.table[:, 1]).sum() + np.abs(chain.table[:, 2]).sum()
+    else:
+        reach = np.abs(np.asarray(lengths, dtype=float)).sum()
+    lo = np.full(dim, -reach - voxel)
+    shape = np.full(dim, int(np.ceil(2 * (reach + voxel) / voxel)) + 1)
+    if np.prod(shape.astype(float)) >= 2**62:
+        raise ValueError("voxel too small for this workspace")
+
+    rng = np.random.default_rng(seed)
+    keys, qs, ees = np.empty(0, np.int64), np.empty((0, n)), np.empty((0, dim))
+    for start in range(0, samples, chunk):
+        m = min(chunk, samples - start)
+        q = rng.uniform(lim[:, 0], lim[:, 1], size=(m, n))
+        ee = ee_of(q)
+        cell = np.floor((ee - lo) / voxel).astype(np.int64)
+        k = np.ravel_multi_index(tuple(cell.T), tuple(shape))
+        # reduce per chunk so memory is bounded by the number of occupied voxels
+        keys, qs, ees = _keep_per_voxel(np.r_[keys, k], np.r_[qs, q], np.r_[ees, ee], cap)
+
+    ukeys, first = np.unique(keys, return_index=True)
+    slot = np.arange(keys.size) - np.repeat(first, np.diff(np.r_[first, keys.size]))
+    row = np.searchsorted(ukeys, keys)
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "keys.npy"), ukeys)
+    for name, values, width in (("q", qs, n), ("ee", ees, dim)):
+        arr = np.full((ukeys.size, cap, width), np.nan, dtype=np.float32)
+        arr[row, slot] = values
+        np.save(os.path.join(out_dir, name + ".npy"), arr)
+    model = ({"chain": chain.table.tolist(), "joint_types": chain.joint_types}
+             if chain is not None else {"lengths": np.asarray(lengths, float).tolist()})
+    with open(os.path.join(out_dir, "index.json"), "w") as f:
+        json.dump({**model, "origin": lo.tolist(), "shape": shape.tolist(),
+                   "voxel": voxel, "cap": cap, "samples": samples,
+                   "joint_limits": lim.tolist()}, f)
+    return SeedIndex(out_dir)
+
+
+class SeedIndex:
+    def __init__(self, path):
+        """Open an index written by build_seed_index; arrays are memory-mapped."""
+        with open(os.path.join(path, "index.json")) as f:
+            self.meta = meta = json.load(f)
+        self.origin = np.asarray(meta["origin"])
+        self.shape = np.asarray(meta["shape"], dtype=np.int64)
+        self.voxel = meta["voxel"]
+        self.keys = np.load(os.path.join(path, "keys.npy"), mmap_mode="r")
+        self.q = np.load(os.path.join(path, "q.npy"), mmap_mode="r")
+        self.ee = np.load(os.path.join(path, "ee.npy"), mmap_mode="r")
+        self.dim = self.origin.size
+        # offsets of the 3^d voxels around (and including) the target voxel
+        self._offsets = np.stack(np.meshgrid(*[[-1, 0, 1]] * self.dim, indexing="ij"),
+                                 axis=-1).reshape(-1, self.dim)
+
+    def __len__(self):
+        return self.keys.size
+
+    def query(self, targets):
+        """Nearest stored configuration for every target.
+
+        targets : (M, d) end-effector positions (d = 2 planar, 3 for a DH chain)
+        returns (q, dist)
+            q    – (M, n) seeds, NaN where no sample lies in the neighbouring voxels
+                   (target outside the sampled workspace)
+            dist – (M,) Cartesian distance from the seed's end-effector to the target
+        """
+        targets = np.atleast_2d(np.asarray(targets, dtype=float))
+        if targets.shape[1] != self.dim:
+            raise ValueError(f"expected targets of shape (M, {self.dim}), got {targets.shape}")
+        M = targets.shape[0]
+        cell = np.floor((targets - self.origin) / self.voxel).astype(np.int64)
+        nb = cell[:, None, :] + self._offsets                       # (M, 3^d, d)
+        inside = np.all((nb >= 0) & (nb < self.shape), axis=-1)
+        k = np.ravel_multi_index(tuple(np.moveaxis(np.clip(nb, 0, self.shape - 1), -1, 0)),
+                                 tuple(self.shape))
+        row = np.minimum(np.searchsorted(self.keys, k), max(len(self) - 1, 0))
+        hit = inside & (self.keys[row] == k) if len(self) else np.zeros_like(inside)
+
+        ee = self.ee[row]                                           # (M, 3^d, cap, d)
+        d2 = np.sum((ee - targets[:, None, None, :])**2, axis=-1)
+        d2[~hit] = np.inf
+        d2 = np.where(np.isnan(d2), np.inf, d2).reshape(M, -1)
+        best = np.argmin(d2, axis=1)
+        found = np.isfinite(d2[np.arange(M), best])
+
+        cap = self.q.shape[1]
+        q = self.q[row[np.arange(M), best // cap], best % cap].astype(float)
+        q[~found] = np.nan
+        dist = np.sqrt(d2[np.arange(M), best])
+        return q, dist
+
+
+def seeded_ik(index, targets, lengths, max_iter=20, tol=1e-6, damping=0.05, stall_damping=0.005):
+    """dls_ik on a planar arm, seeded from a SeedIndex, with a bounded worst case.
+
+    Targets not converged after max_iter iterations get a second run of at most
+    max_iter from where they stopped, with stall_damping.
+    returns (q, converged, iterations) as dls_ik; targets without a seed
+    (outside the sampled workspace) are NaN / False / 0
+    """
+    targets = np.atleast_2d(np.asarray(targets, dtype=float))
+    L = np.asarray(lengths, dtype=float)
+    seeds, _ = index.query(targets)
+    q = np.full((len(targets), L.size), np.nan)
+    converged = np.zeros(len(targets), dtype=bool)
+    iterations = np.zeros(len(targets), dtype=int)
+    ok = np.flatnonzero(~np.isnan(seeds[:, 0]))
+    q[ok], converged[ok], iterations[ok] = dls_ik(targets[ok], L, q0=seeds[ok], tol=tol,
+                                                  damping=damping, max_iter=max_iter)
+    stalled = ok[~converged[ok]]
+    if stalled.size:
+        q[stalled], converged[stalled], extra = dls_ik(targets[stalled], L, q0=q[stalled], tol=tol,
+                                                       damping=stall_damping, max_iter=max_iter)
+        iterations[stalled] += extra
+    return q, converged, iterations
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    out = tempfile.mkdtemp()
+    rng = np.random.default_rng(1)
+    for lengths in ([1.5, 1.0, 1.5], [1.5, 1.0, 1.5, 1.0]):
+        L = np.array(lengths)
+        t0 = time.perf_counter()
+        index = build_seed_index(os.path.join(out, f"{L.size}r"), lengths=L)
+        print(f"{L.size}-link index : {len(index):,} voxels, built in {time.perf_counter()-t0:.1f} s")
+
+        M = 20_000
+        targets = fk_planar_ee(rng.uniform(-np.pi, np.pi, size=(M, L.size)), L)
+        t0 = time.perf_counter()
+        seeds, dist = index.query(targets)
+        t_q = time.perf_counter() - t0
+        ok = ~np.isnan(seeds[:, 0])
+        print(f"  query {M/t_q:,.0f} targets/s, {ok.sum():,}/{M:,} seeded, "
+              f"median seed error {np.median(dist[ok]):.3f}")
+
+        # plus targets within 1% of full stretch, where the Jacobian is nearly singular
+        phi = rng.uniform(-np.pi, np.pi, 2_000)
+        r = L.sum() * rng.uniform(0.99, 1.0, 2_000)
+        targets = np.r_[targets, np.c_[r * np.cos(phi), r * np.sin(phi)]]
+        _, conv_cold, its_cold = dls_ik(targets, L)
+        _, conv, its = seeded_ik(index, targets, L)
+        for label, c, i in (("cold", conv_cold, its_cold), ("seeded", conv, its)):
+            print(f"  dls_ik {label:6s}: {(~c).sum():5d}/{len(c):,} not converged, iterations "
+                  f"median {np.median(i):.0f} / p99.9 {np.percentile(i, 99.9):.0f} / max {i.max()}")
+
+    from dh_chain import yaw_shoulder_elbow_chain
+    arm = yaw_shoulder_elbow_chain()
+    index = build_seed_index(os.path.join(out, "3d"), chain=arm, voxel=0.1)
+    goal = arm.fk(rng.uniform(-np.pi, np.pi, size=(5, 3)))[:, -1, :3, 3]
+    _, dist = index.query(goal)
+    print(f"3D arm index : {len(index):,} voxels, seed errors {np.round(dist, 3)}")
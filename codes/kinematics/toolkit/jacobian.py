@@ -0,0 +1,77 @@
+# jacobian.py
+# Analytic Jacobians computed together with forward kinematics, batched.
+# Requirements: python -m pip install numpy
+#
+# Finite-differencing fk costs n+1 FK calls per pose. Here the Jacobian falls out
+# of the FK pass itself:
+#   planar : J[:, i] = rot90(p_ee - p_i)           (2 x n, reuses the joint positions)
+#   3D     : J[:, i] = [z_i x (p_ee - p_i); z_i]   revolute joint
+#            J[:, i] = [z_i; 0]                    prismatic joint
+# where p_i, z_i are the origin and z axis of the frame joint i+1 rotates about,
+# read straight from the DH link transforms.
+
+import numpy as np
+
+from planar_fk import fk_planar
+
+
+def planar_fk_jacobian(q, lengths):
+    """Joint positions (M, n+1, 2) and end-effector Jacobians (M, 2, n)."""
+    q = np.atleast_2d(np.asarray(q, dtype=float))
+    pts = fk_planar(q, lengths)
+    r = pts[:, -1:, :] - pts[:, :-1, :]        # joint -> end-effector vectors
+    J = np.empty((q.shape[0], 2, q.shape[1]))
+    J[:, 0] = -r[..., 1]
+    J[:, 1] = r[..., 0]
+    return pts, J
+
+
+def dh_fk_jacobian(chain, q):
+    """Link transforms (M, n+1, 4, 4) and geometric Jacobians (M, 6, n).
+
+    Rows 0-2 of J are the linear, rows 3-5 the angular velocity of the
+    end-effector, in the base frame.
+    """
+    q = np.atleast_2d(np.asarray(q, dtype=float))
+    T = chain.fk(q)
+    z = T[:, :-1, :3, 2]                       # joint axes
+    r = T[:, -1:, :3, 3] - T[:, :-1, :3, 3]    # joint origin -> end-effector
+    J = np.zeros((q.shape[0], 6, chain.n))
+    rev = ~chain.prismatic
+    J[:, :3, rev] = np.cross(z[:, rev], r[:, rev]).transpose(0, 2, 1)
+    J[:, 3:, rev] = z[:, rev].transpose(0, 2, 1)
+    J[:, :3, chain.prismatic] = z[:, chain.prismatic].transpose(0, 2, 1)
+    return T, J
+
+
+if __name__ == "__main__":
+    import time
+    from dh_chain import yaw_shoulder_elbow_chain
+    from planar_fk import fk_planar_ee
+
+    rng = np.random.default_rng(0)
+    M, h = 200_000, 1e-6
+
+    L = np.array([1.5, 1.0, 1.5, 1.0])
+    q = rng.uniform(-np.pi, np.pi, size=(M, L.size))
+    t0 = time.perf_counter()
+    _, J = planar_fk_jacobian(q, L)
+    t_an = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    ee = fk_planar_ee(q, L)
+    J_fd = np.stack([(fk_planar_ee(q + h*np.eye(L.size)[i], L) - ee) / h
+                     for i in range(L.size)], axis=2)
+    t_fd = time.perf_counter() - t0
+    print(f"planar 4R : analytic {M/t_an:,.0f} poses/s, finite diff {M/t_fd:,.0f} poses/s, "
+          f"max diff {np.abs(J - J_fd).max():.1e}")
+
+    arm = yaw_shoulder_elbow_chain()
+    q = rng.uniform(-np.pi, np.pi, size=(M, 3))
+    t0 = time.perf_counter()
+    T, J = dh_fk_jacobian(arm, q)
+    t_an = time.perf_counter() - t0
+    p = T[:, -1, :3, 3]
+    J_fd = np.stack([(arm.fk(q + h*np.eye(3)[i])[:, -1, :3, 3] - p) / h
+                     for i in range(3)], axis=2)
+    print(f"3D arm    : analytic {M/t_an:,.0f} poses/s, max diff (linear part) "
+          f"{np.abs(J[:, :3] - J_fd).max():.1e}")
@@ -0,0 +1,172 @@
+# kdtree.py
+# Array-based KD-tree for nearest-neighbour queries in joint space.
+# Requirements: python -m pip install numpy
+#
+# The tree is stored as flat arrays (split axis / value, children, point range)
+# over a permutation of the points, built with np.argpartition median splits.
+# Queries walk it with an explicit stack and scan whole leaves with one
+# vectorized distance evaluation, so a query costs a few dozen NumPy calls
+# regardless of the tree size.
+#
+# GrowingKDTree serves planners whose point set grows one node at a time (RRT):
+# new points go to an unsorted tail that is scanned brute force, and the tree
+# is rebuilt when the tail grows as large as the indexed part, which keeps the
+# amortized insertion cost at O(log N).
+#
+#   tree = KDTree(points)                 # (N, d)
+#   d2, idx = tree.query(x, k=5)          # squared distances, ascending
+
+import numpy as np
+
+
+class KDTree:
+    def __init__(self, points, leaf_size=32):
+        self.points = np.ascontiguousarray(points, dtype=float)
+        self.leaf_size = leaf_size
+        self._build()
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self):
+        pts = self.points
+        n = len(pts)
+        perm = np.arange(n)
+        axis, value, left, right, lo_, hi_ = [], [], [], [], [], []
+
+        def new_node(lo, hi):
+            axis.append(-1)
+            value.append(0.0)
+            left.append(-1)
+            right.append(-1)
+            lo_.append(lo)
+            hi_.append(hi)
+            return len(axis) - 1
+
+        stack = [new_node(0, n)] if n else []
+        while stack:
+            node = stack.pop()
+            lo, hi = lo_[node], hi_[node]
+            if hi - lo <= self.leaf_size:
+                continue
+            sub = pts[perm[lo:hi]]
+            ax = int(np.argmax(sub.max(axis=0) - sub.min(axis=0)))   # widest spread
+            mid = (lo + hi) // 2
+            order = np.argpartition(sub[:, ax], mid - lo)
+            perm[lo:hi] = perm[lo:hi][order]
+            axis[node], value[node] = ax, pts[perm[mid], ax]
+            left[node], right[node] = new_node(lo, mid), new_node(mid, hi)
+            stack += [left[node], right[node]]
+
+        self._perm = perm
+        self._sorted = pts[perm]          # leaf scans read contiguous rows
+        self._axis = axis
+        self._value = value
+        self._left = left
+        self._right = right
+        self._lo = lo_
+        self._hi = hi_
+
+    def query(self, x, k=1):
+        """k nearest points to x: (squared distances (k,), indices (k,)), ascending.
+
+        Fewer than k points in the tree leave inf / -1 in the tail.
+        """
+        x = np.asarray(x, dtype=float)
+        best_d = np.full(k, np.inf)
+        best_i = np.full(k, -1, dtype=np.int64)
+        if not len(self.points):
+            return best_d, best_i
+        axis, value, left, right = self._axis, self._value, self._left, self._right
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_d[-1]:
+                continue
+            if left[node] < 0:                          # leaf: scan it in one go
+                lo, hi = self._lo[node], self._hi[node]
+                diff = self._sorted[lo:hi] - x
+                d = np.einsum("ij,ij->i", diff, diff)
+                cand_d = np.concatenate([best_d, d])
+                cand_i = np.concatenate([best_i, self._perm[lo:hi]])
+                keep = np.argsort(cand_d, kind="stable")[:k]
+                best_d, best_i = cand_d[keep], cand_i[keep]
+                continue
+            delta = x[axis[node]] - value[node]
+            near, far = (left[node], right[node]) if delta < 0 else (right[node], left[node])
+            stack.append((far, max(bound, delta * delta)))
+            stack.append((near, bound))                 # popped first
+        return best_d, best_i
+
+    def query_many(self, X, k=1):
+        """query() for each row of X: ((M, k) squared distances, (M, k) indices)."""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        D = np.empty((len(X), k))
+        I = np.empty((len(X), k), dtype=np.int64)
+        for m, x in enumerate(X):
+            D[m], I[m] = self.query(x, k)
+        return D, I
+
+
+class GrowingKDTree:
+    """Append-only point set with nearest-neighbour queries (e.g. an RRT)."""
+
+    def __init__(self, dim, capacity=1024, leaf_size=32, min_tail=256):
+        self.points = np.empty((capacity, dim))
+        self.n = 0
+        self.leaf_size = leaf_size
+        self.min_tail = min_tail
+        self._tree = None
+        self._indexed = 0               # points[:_indexed] are in _tree
+
+    def __len__(self):
+        return self.n
+
+    def add(self, x):
+        """Append a point; returns its index."""
+        if self.n == len(self.points):
+            grown = np.empty((2 * len(self.points), self.points.shape[1]))
+            grown[:self.n] = self.points
+            self.points = grown
+        self.points[self.n] = x
+        self.n += 1
+        if self.n - self._indexed > max(self.min_tail, self._indexed):
+            self._tree = KDTree(self.points[:self.n], self.leaf_size)
+            self._indexed = self.n
+        return self.n - 1
+
+    def nearest(self, x):
+        """(squared distance, index) of the closest point to x."""
+        tail = self.points[self._indexed:self.n] - x
+        d = np.einsum("ij,ij->i", tail, tail)
+        j = int(np.argmin(d)) if len(d) else -1
+        best = (d[j], self._indexed + j) if j >= 0 else (np.inf, -1)
+        if self._tree is not None:
+            td, ti = self._tree.query(x, 1)
+            if td[0] < best[0]:
+                best = (td[0], int(ti[0]))
+        return best
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    for dim in (2, 3):
+        P = rng.uniform(-np.pi, np.pi, size=(100_000, dim))
+        t0 = time.perf_counter()
+        tree = KDTree(P)
+        t_build = time.perf_counter() - t0
+        X = rng.uniform(-np.pi, np.pi, size=(2_000, dim))
+        t0 = time.perf_counter()
+        D, I = tree.query_many(X, k=8)
+        t_query = (time.perf_counter() - t0) / len(X)
+        brute = np.sort(((X[:200, None] - P[None]) ** 2).sum(-1), axis=1)[:, :8]
+        print(f"{dim}D, 100k points: build {t_build * 1e3:.0f} ms, 8-NN query "
+              f"{t_query * 1e6:.0f} µs, max err vs brute force {np.abs(D[:200] - brute).max():.1e}")
+
+    grow = GrowingKDTree(3, capacity=16)
+    for x in P[:5_000]:
+        grow.add(x)
+    d, i = grow.nearest(X[0])
+    print(f"growing tree, 5,000 inserts: nearest err {d - ((P[:5_000] - X[0]) ** 2).sum(1).min():.1e}")
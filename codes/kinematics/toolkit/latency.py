@@ -0,0 +1,221 @@
+# latency.py
+# Opt-in per-call latency histograms for the kinematics functions and GUI callbacks.
+# Requirements: none (standard library only)
+#
+# Turn it on with an environment variable
+#   ARM_PROFILE=1 python 2-links_2d.py             # table on stderr at exit
+#   ARM_PROFILE=lat.json python 2-links_2d.py      # also write JSON
+# or around a block of code
+#   with profiling():
+#       runpy.run_path("2-links_2d.py")
+# `@instrument` returns the function unchanged when profiling is off at
+# definition time, so the disabled cost is exactly zero. When on, each call
+# adds two perf_counter_ns() reads and one bucket increment in a log-scale
+# histogram (4 buckets per factor of two, so percentiles are within ~20%).
+# On POSIX, `kill -USR1 <pid>` prints the table of a running GUI on demand.
+
+import atexit
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+
+_SUB = 4                    # histogram buckets per octave
+_N_BUCKETS = 64 * _SUB
+
+_active = bool(os.environ.get("ARM_PROFILE"))
+_histograms = {}
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Call count, total / max time and a log-scale histogram of durations (ns)."""
+
+    __slots__ = ("name", "count", "total", "max", "buckets")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * _N_BUCKETS
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        b = ns.bit_length()
+        # 2 bits below the leading one pick the quarter-octave
+        sub = (ns >> (b - 3)) & 3 if b >= 3 else 0
+        self.buckets[b * _SUB + sub] += 1
+
+    @staticmethod
+    def _upper(i):
+        b, sub = divmod(i, _SUB)
+        if b < 3:
+            return 1 << b
+        return (1 << (b - 1)) + (sub + 1) * (1 << (b - 3))
+
+    def percentile(self, p):
+        """Upper edge of the bucket holding the p-th percentile, in ns."""
+        if not self.count:
+            return 0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, c in enumerate(self.buckets):
+            seen += c
+            if c and seen >= rank:
+                return min(self._upper(i), self.max)
+        return self.max
+
+    def summary(self):
+        us = 1e-3
+        return {"calls": self.count,
+                "total_ms": self.total * 1e-6,
+                "mean_us": self.total / self.count * us if self.count else 0.0,
+                "p50_us": self.percentile(50) * us,
+                "p90_us": self.percentile(90) * us,
+                "p99_us": self.percentile(99) * us,
+                "max_us": self.max * us}
+
+
+def enabled():
+    return _active
+
+
+def histogram(name):
+    h = _histograms.get(name)
+    if h is None:
+        with _lock:
+            h = _histograms.setdefault(name, Histogram(name))
+    return h
+
+
+def instrument(fn=None, name=None):
+    """Time every call of fn under `name` (default: its qualified name).
+
+    Usable as @instrument, @instrument(name="...") or instrument(fn, "...").
+    Returns fn itself when profiling is off.
+    """
+    if fn is None:
+        return lambda f: instrument(f, name)
+    if not _active:
+        return fn
+    h = histogram(name or getattr(fn, "__qualname__", repr(fn)))
+    clock = perf_counter_ns
+
+    @wraps(fn)
+    def timed(*args, **kwargs):
+        t0 = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            h.add(clock() - t0)
+    timed.__wrapped_timing__ = h
+    return timed
+
+
+def patch(obj, *names, prefix=None):
+    """Instrument attributes of a module / class / instance in place.
+
+    Returns a function that restores the originals.
+    """
+    saved = []
+    for n in names:
+        original = getattr(obj, n)
+        label = f"{prefix}.{n}" if prefix else getattr(original, "__qualname__", n)
+        saved.append((n, original))
+        setattr(obj, n, instrument(original, label))
+    return lambda: [setattr(obj, n, f) for n, f in saved]
+
+
+def report(file=None):
+    """Print the percentile table (slowest total time first)."""
+    file = file or sys.stderr
+    rows = sorted((h for h in _histograms.values() if h.count), key=lambda h: -h.total)
+    if not rows:
+        return
+    print(f"{'latency (µs)':32s} {'calls':>8s} {'mean':>9s} {'p50':>9s} {'p90':>9s} "
+          f"{'p99':>9s} {'max':>9s} {'total ms':>10s}", file=file)
+    for h in rows:
+        s = h.summary()
+        print(f"{h.name[:32]:32s} {s['calls']:8d} {s['mean_us']:9.1f} {s['p50_us']:9.1f} "
+              f"{s['p90_us']:9.1f} {s['p99_us']:9.1f} {s['max_us']:9.1f} {s['total_ms']:10.1f}",
+              file=file)
+
+
+def dump(path):
+    """Write {name: summary} as JSON."""
+    with open(path, "w") as f:
+        json.dump({name: h.summary() for name, h in _histograms.items()}, f, indent=2)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+@contextmanager
+def profiling(path=None, quiet=False):
+    """Enable instrumentation inside the block; print (and optionally dump) at the end.
+
+    Functions decorated inside the block (e.g. a script run with runpy) are
+    timed; for already-defined ones use patch().
+    """
+    global _active
+    before = _active
+    _active = True
+    try:
+        yield _histograms
+    finally:
+        _active = before
+        if not quiet:
+            report()
+        if path:
+            dump(path)
+
+
+def _at_exit():
+    report()
+    target = os.environ.get("ARM_PROFILE", "")
+    if target.endswith(".json"):
+        dump(target)
+
+
+if _active:
+    atexit.register(_at_exit)
+    try:
+        import signal
+        signal.signal(signal.SIGUSR1, lambda *_: report())
+    except (AttributeError, ValueError):
+        pass            # no SIGUSR1 (Windows) or not in the main thread
+
+
+if __name__ == "__main__":
+    import math
+    import time
+
+    def work(n):
+        return sum(math.sin(i) for i in range(n))
+
+    N = 200_000
+    t0 = time.perf_counter()
+    for _ in range(N):
+        work(1)
+    t_plain = time.perf_counter() - t0
+
+    with profiling():
+        timed = instrument(work, "work(1)")
+        t0 = time.perf_counter()
+        for _ in range(N):
+            timed(1)
+        t_timed = time.perf_counter() - t0
+        mixed = instrument(work, "work(1 or 1000)")
+        for i in range(N // 10):
+            mixed(1000 if i % 100 == 0 else 1)
+    print(f"\noverhead per call: {(t_timed - t_plain) / N * 1e9:.0f} ns; disabled: "
+          f"instrument(work) is work -> {instrument(work) is work}")
@@ -0,0 +1,120 @@
+# manipulability.py
+# Yoshikawa manipulability and minimum singular value over a dense joint grid.
+# Requirements: python -m pip install numpy matplotlib
+#
+# For the planar arms (2R in 2-links_2d.py, 3R / 4R in Task-2) both measures come
+# from the 2x2 matrix A = J J^T = [[a, b], [b, d]]:
+#   w         = sqrt(det A)                       (Yoshikawa manipulability)
+#   sigma_min = sqrt((a+d)/2 - sqrt(((a-d)/2)² + b²))
+# They are zero at singular poses such as theta2 = 0 / π for the 2R arm.
+#
+# Rotating the whole arm about the base does not change either measure, so the
+# grid only spans joints 2..n; a full grid is np.broadcast_to(result, ...) along
+# theta1. The grid is split into chunks on a process pool and every worker
+# writes its slice straight into .npy files opened as memory maps, so neither
+# the parent nor the workers ever hold more than one chunk (a 10^8-cell grid is
+# 400 MB per measure on disk, ~chunk-sized in RAM).
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from jacobian import planar_fk_jacobian
+
+
+def planar_manipulability(q, lengths):
+    """(w, sigma_min) for a batch of planar poses, each (M,)."""
+    _, J = planar_fk_jacobian(q, lengths)
+    a = np.einsum("ij,ij->i", J[:, 0], J[:, 0])
+    b = np.einsum("ij,ij->i", J[:, 0], J[:, 1])
+    d = np.einsum("ij,ij->i", J[:, 1], J[:, 1])
+    w = np.sqrt(np.maximum(a*d - b*b, 0.0))
+    half = 0.5*(a + d)
+    sigma_min = np.sqrt(np.maximum(half - np.sqrt(0.25*(a - d)**2 + b*b), 0.0))
+    return w, sigma_min
+
+
+def _grid_chunk(task):
+    """Worker: evaluate flat cells [start, stop) and write them into the memmaps."""
+    out_dir, start, stop, lengths, axes = task
+    shape = tuple(len(ax) for ax in axes)
+    idx = np.unravel_index(np.arange(start, stop), shape)
+    q = np.zeros((stop - start, len(lengths)))
+    for j, (ax, i) in enumerate(zip(axes, idx)):
+        q[:, j + 1] = ax[i]                 # theta1 stays 0 (no effect)
+    w, s = planar_manipulability(q, lengths)
+    for name, values in (("manipulability", w), ("sigma_min", s)):
+        arr = np.load(os.path.join(out_dir, name + ".npy"), mmap_mode="r+")
+        arr.reshape(-1)[start:stop] = values
+        arr.flush()
+        del arr
+    return stop - start
+
+
+def manipulability_map(lengths, out_dir, res=100, joint_limits=None,
+                       chunk=250_000, workers=None):
+    """Evaluate w and sigma_min on a res^(n-1) grid over joints 2..n.
+
+    out_dir gets manipulability.npy, sigma_min.npy (float32, one axis per joint
+    2..n) and grid.json describing the axes. Returns the two arrays opened as
+    read-only memory maps.
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    n = lengths.size
+    if joint_limits is None:
+        joint_limits = [[-np.pi, np.pi]] * (n - 1)
+    axes = [np.linspace(lo, hi, res) for lo, hi in joint_limits]
+    shape = tuple(len(ax) for ax in axes)
+    total = int(np.prod(shape))
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ("manipulability", "sigma_min"):
+        np.lib.format.open_memmap(os.path.join(out_dir, name + ".npy"), mode="w+",
+                                  dtype=np.float32, shape=shape).flush()
+    with open(os.path.join(out_dir, "grid.json"), "w") as f:
+        json.dump({"lengths": lengths.tolist(), "joints": list(range(2, n + 1)),
+                   "limits": [[float(a[0]), float(a[-1])] for a in axes], "res": res}, f)
+
+    tasks = [(out_dir, s, min(s + chunk, total), lengths, axes)
+             for s in range(0, total, chunk)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            _grid_chunk(task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_grid_chunk, tasks):
+                pass
+
+    return (np.load(os.path.join(out_dir, "manipulability.npy"), mmap_mode="r"),
+            np.load(os.path.join(out_dir, "sigma_min.npy"), mmap_mode="r"))
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    import matplotlib.pyplot as plt
+
+    out = tempfile.mkdtemp()
+    L = [1.5, 1.0, 1.5]
+    t0 = time.perf_counter()
+    w, s = manipulability_map(L, os.path.join(out, "3r"), res=720)
+    dt = time.perf_counter() - t0
+    print(f"3R: {w.size:,} cells in {dt:.2f} s ({w.size/dt:,.0f} cells/s), "
+          f"{np.mean(s < 0.1):.1%} of the grid within sigma_min < 0.1")
+
+    w2, _ = manipulability_map([1.5, 1.0], os.path.join(out, "2r"), res=361)
+    th2 = np.linspace(-180, 180, 361)
+    print(f"2R: w = L1·L2·|sin θ2| -> max error {np.abs(w2 - 1.5*np.abs(np.sin(np.radians(th2)))).max():.1e}")
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5.5))
+    ext = (-180, 180, -180, 180)
+    im = ax1.imshow(np.asarray(w).T, origin="lower", extent=ext, cmap="viridis")
+    fig.colorbar(im, ax=ax1)
+    ax1.set_title("3R manipulability w"); ax1.set_xlabel("θ2 (deg)"); ax1.set_ylabel("θ3 (deg)")
+    im = ax2.imshow(np.asarray(s).T, origin="lower", extent=ext, cmap="magma")
+    fig.colorbar(im, ax=ax2)
+    ax2.set_title("3R minimum singular value"); ax2.set_xlabel("θ2 (deg)"); ax2.set_ylabel("θ3 (deg)")
+    plt.show()
@@ -0,0 +1,99 @@
+# planar_fk.py
+# Batched forward kinematics for N-link planar arms.
+# Requirements: python -m pip install numpy
+#
+# Instead of calling a scalar fk(theta1, theta2, ...) once per pose, pass an
+# (M, n) array of joint angles and get all (M, n+1, 2) joint positions back
+# from a single NumPy pass:
+#
+#   phi_k = theta_1 + ... + theta_k          (absolute link angles, cumsum)
+#   p_k   = sum_{i<=k} L_i * (cos phi_i, sin phi_i)
+
+import numpy as np
+
+
+def _as_batch(q, lengths):
+    """Return (q as (M, n) float array, lengths as (n,), single-pose flag)."""
+    q = np.asarray(q, dtype=float)
+    single = q.ndim == 1
+    q = np.atleast_2d(q)
+    L = np.asarray(lengths, dtype=float)
+    if q.ndim != 2 or L.shape != (q.shape[1],):
+        raise ValueError(f"expected q of shape (M, {L.size}) for {L.size} links, got {q.shape}")
+    return q, L, single
+
+
+def fk_planar(q, lengths, out=None):
+    """Joint positions for a batch of planar arm poses (angles in radians).
+
+    q       : (M, n) joint angles, or a single (n,) pose
+    lengths : (n,) link lengths
+    out     : optional (M, n+1, 2) array to write into
+
+    Returns (M, n+1, 2): [:, 0] is the base (origin), [:, -1] the end-effector.
+    """
+    q, L, single = _as_batch(q, lengths)
+    M, n = q.shape
+    if out is None:
+        out = np.empty((M, n + 1, 2))
+    elif out.shape != (M, n + 1, 2):
+        raise ValueError(f"out must have shape {(M, n + 1, 2)}, got {out.shape}")
+
+    phi = np.cumsum(q, axis=1)          # absolute link angles
+    xs = out[:, 1:, 0]
+    ys = out[:, 1:, 1]
+    np.cos(phi, out=xs)
+    np.sin(phi, out=ys)
+    xs *= L
+    ys *= L
+    np.cumsum(xs, axis=1, out=xs)       # chain the link vectors
+    np.cumsum(ys, axis=1, out=ys)
+    out[:, 0] = 0.0
+    return out[0] if single else out
+
+
+def fk_planar_ee(q, lengths):
+    """End-effector positions only, (M, 2) (or (2,) for a single pose)."""
+    q, L, single = _as_batch(q, lengths)
+    phi = np.cumsum(q, axis=1)
+    ee = np.stack((np.cos(phi) @ L, np.sin(phi) @ L), axis=-1)
+    return ee[0] if single else ee
+
+
+# ---------- benchmark against the scalar fk from 2-links_2d.py ----------
+def _scalar_fk(theta1, theta2, L1=1.5, L2=1.0):
+    x1 = L1*np.cos(theta1)
+    y1 = L1*np.sin(theta1)
+    x2 = x1 + L2*np.cos(theta1 + theta2)
+    y2 = y1 + L2*np.sin(theta1 + theta2)
+    return (0, 0), (x1, y1), (x2, y2)
+
+
+if __name__ == "__main__":
+    import time
+
+    lengths = np.array([1.5, 1.0])
+    rng = np.random.default_rng(0)
+
+    M_scalar = 100_000
+    q = rng.uniform(-np.pi, np.pi, size=(M_scalar, 2))
+    t0 = time.perf_counter()
+    ref = [_scalar_fk(t1, t2) for t1, t2 in q]
+    t_scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pts = fk_planar(q, lengths)
+    t_batch = time.perf_counter() - t0
+
+    err = np.abs(pts - np.array(ref, dtype=float)).max()
+    print(f"scalar fk : {M_scalar/t_scalar:12,.0f} poses/s")
+    print(f"fk_planar : {M_scalar/t_batch:12,.0f} poses/s  ({t_scalar/t_batch:.0f}x, max err {err:.1e})")
+
+    # larger sweep, chunked so memory stays bounded
+    M_sweep, chunk = 5_000_000, 500_000
+    buf = np.empty((chunk, 3, 2))
+    t0 = time.perf_counter()
+    for _ in range(M_sweep // chunk):
+        fk_planar(rng.uniform(-np.pi, np.pi, size=(chunk, 2)), lengths, out=buf)
+    t_sweep = time.perf_counter() - t0
+    print(f"sweep     : {M_sweep:,} poses in {t_sweep:.2f} s (incl. sampling)")
@@ -0,0 +1,88 @@
+# planar_ik.py
+# Closed-form inverse kinematics for a 2R planar arm, batched over targets.
+# Requirements: python -m pip install numpy
+#
+# Same math as ik_2r() in inverse-kinematics/py/2_links_2d.py, but for an
+# (M, 2) array of targets at once and without any Python-level branching:
+# reachability is returned as a boolean mask instead of an empty list.
+
+import numpy as np
+
+
+def ik_2r_batch(targets, L1=1.5, L2=1.0, tol=1e-9):
+    """Both elbow solutions for every (x, y) target.
+
+    targets : (M, 2) array of (x, y), or a single (2,) target
+    returns : (sols, reachable)
+        sols      – (M, 2, 2) as [target, branch, (theta1, theta2)] in radians,
+                    branch 0 = elbow-down (theta2 >= 0), 1 = elbow-up.
+                    Unreachable targets are filled with NaN.
+        reachable – (M,) bool mask
+    """
+    targets = np.asarray(targets, dtype=float)
+    single = targets.ndim == 1
+    targets = np.atleast_2d(targets)
+    x = targets[:, 0]
+    y = targets[:, 1]
+
+    r2 = x*x + y*y
+    reachable = (r2 <= (L1 + L2)**2 + tol) & (r2 >= (L1 - L2)**2 - tol)
+
+    c2 = (r2 - L1*L1 - L2*L2) / (2.0 * L1 * L2)
+    np.clip(c2, -1.0, 1.0, out=c2)
+    s2 = np.sqrt(1.0 - c2*c2)            # elbow-down; elbow-up is -s2
+    t2 = np.arctan2(s2, c2)              # >= 0
+
+    # theta1 = atan2(y, x) -/+ atan2(L2 s2, L1 + L2 c2)
+    base = np.arctan2(y, x)
+    offset = np.arctan2(L2*s2, L1 + L2*c2)
+
+    sols = np.empty((targets.shape[0], 2, 2))
+    sols[:, 0, 0] = base - offset
+    sols[:, 0, 1] = t2
+    sols[:, 1, 0] = base + offset
+    sols[:, 1, 1] = -t2
+    sols[~reachable] = np.nan
+
+    if single:
+        return sols[0], reachable[0]
+    return sols, reachable
+
+
+# ---------- benchmark against the scalar ik_2r from 2_links_2d.py ----------
+def _scalar_ik_2r(x, y, L1=1.5, L2=1.0):
+    r2 = x*x + y*y
+    if r2 > (L1 + L2)**2 + 1e-9 or r2 < (L1 - L2)**2 - 1e-9:
+        return []
+    c2 = (r2 - L1*L1 - L2*L2) / (2.0 * L1 * L2)
+    c2 = np.clip(c2, -1.0, 1.0)
+    s2_pos = np.sqrt(1.0 - c2*c2)
+    t2a = np.arctan2(s2_pos, c2)
+    t2b = np.arctan2(-s2_pos, c2)
+    def t1_for(t2):
+        return np.arctan2(y, x) - np.arctan2(L2*np.sin(t2), L1 + L2*np.cos(t2))
+    return [(t1_for(t2a), t2a), (t1_for(t2b), t2b)]
+
+
+if __name__ == "__main__":
+    import time
+    from planar_fk import fk_planar_ee
+
+    rng = np.random.default_rng(0)
+    M = 50_000
+    targets = rng.uniform(-2.7, 2.7, size=(M, 2))
+
+    t0 = time.perf_counter()
+    ref = [_scalar_ik_2r(x, y) for x, y in targets]
+    t_scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sols, ok = ik_2r_batch(targets)
+    t_batch = time.perf_counter() - t0
+
+    assert np.array_equal(ok, np.array([len(r) > 0 for r in ref]))
+    ee = fk_planar_ee(sols[ok].reshape(-1, 2), [1.5, 1.0]).reshape(-1, 2, 2)
+    err = np.abs(ee - targets[ok][:, None, :]).max()
+    print(f"reachable : {ok.mean():.1%} of {M:,} targets, max FK round-trip err {err:.1e}")
+    print(f"ik_2r       : {M/t_scalar:12,.0f} targets/s")
+    print(f"ik_2r_batch : {M/t_batch:12,.0f} targets/s  ({t_scalar/t_batch:.0f}x)")
@@ -0,0 +1,563 @@
+# planner.py
+# Sampling-based motion planning in joint space: RRT-Connect and PRM.
+# Requirements: python -m pip install numpy
+#
+# A JointSpace bundles the joint limits with a batched validity test,
+# is_free((M, n) q) -> (M,) bool. Ready-made spaces cover the planar arms
+# (fk_planar + collision.Obstacles + self-collision), precomputed C-space
+# bitmaps (cspace.CSpaceMap) and the yaw/shoulder/elbow arm of 2_links_3d.py
+# among spherical obstacles.
+#
+# Edges are straight lines in joint space, checked at states no more than
+# `resolution` radians apart. Joints whose limits span a full turn (the ±π
+# default) are periodic: differences, distances and nearest-neighbour queries
+# take the short way around, and interpolated states are wrapped back into the
+# limits, so a path may cross ±π. All states of all edges under test go through a
+# single is_free call, so a PRM validates its whole k-NN graph in a few large
+# batches, and an RRT-Connect CONNECT step checks its full segment at once and
+# keeps the free prefix. Nearest neighbours come from kdtree.py.
+#
+# A PRM roadmap depends only on the scene, so it can be cached on disk and
+# reused by every query in that scene (~/.cache/aurora_roadmaps, or
+# $AURORA_ROADMAP_CACHE):
+#
+#   space = planar_space([1.5, 1.0], obstacles, radius=0.05)
+#   path = rrt_connect(space, q_start, q_goal)          # (K, n) waypoints or None
+#   prm = roadmap(space, n_nodes=1500)                  # built once, then loaded
+#   path = prm.query(q_start, q_goal)
+#   path = shortcut(space, path)                        # optional smoothing
+#
+# Smoothing is opt-in (smooth=True or shortcut()): its edge checks cost more
+# than the roadmap search itself, and would push PRM queries past 10 ms.
+
+import hashlib
+import heapq
+import itertools
+import json
+import os
+
+import numpy as np
+
+from collision import SelfCollision
+from kdtree import GrowingKDTree, KDTree
+from planar_fk import fk_planar
+from workspace import points_yaw_shoulder_elbow
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AURORA_ROADMAP_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "aurora_roadmaps"))
+
+_EDGE_STATES = 1 << 16          # states per is_free call when validating many edges
+_loaded = {}                    # key -> Roadmap, so repeated calls in one process are free
+
+
+class JointSpace:
+    def __init__(self, limits, is_free, resolution=0.02, key=None):
+        """
+        limits     : (n, 2) [min, max] per joint (radians)
+        is_free    : callable, (M, n) joint vectors -> (M,) bool
+        resolution : largest joint step between two checked states of an edge
+        key        : text describing the scene, used to cache roadmaps (None = no caching)
+        """
+        self.limits = np.asarray(limits, dtype=float)
+        self.n = len(self.limits)
+        self.is_free = is_free
+        self.resolution = resolution
+        self.key = key
+        # full turns wrap around (same rule as cspace.CSpaceMap)
+        self.periodic = np.isclose(self.limits[:, 1] - self.limits[:, 0], 2 * np.pi)
+
+    def sample(self, rng, m):
+        return rng.uniform(self.limits[:, 0], self.limits[:, 1], size=(m, self.n))
+
+    def wrap(self, q):
+        """q with periodic joints mapped into [min, min + 2π)."""
+        if not self.periodic.any():
+            return q
+        lo = self.limits[:, 0]
+        return np.where(self.periodic, lo + np.mod(q - lo, 2 * np.pi), q)
+
+    def difference(self, A, B):
+        """B - A, the short way around on periodic joints."""
+        d = B - A
+        if self.periodic.any():
+            d = np.where(self.periodic, np.mod(d + np.pi, 2 * np.pi) - np.pi, d)
+        return d
+
+    def distance(self, A, B):
+        return np.linalg.norm(self.difference(A, B), axis=-1)
+
+    def _images(self, x, radius):
+        """Copies of x shifted by ±2π on the periodic joints that lie within
+        `radius` of a limit: the extra points a nearest-neighbour search must
+        try so that neighbours across ±π are found."""
+        options = []
+        for j in np.flatnonzero(self.periodic):
+            o = [0.0]
+            if x[j] - self.limits[j, 0] < radius:
+                o.append(2 * np.pi)
+            if self.limits[j, 1] - x[j] < radius:
+                o.append(-2 * np.pi)
+            options.append(o)
+        out = []
+        for shift in itertools.product(*options):
+            if any(shift):
+                img = x.copy()
+                img[self.periodic] += shift
+                out.append(img)
+        return out
+
+    def knn(self, query, x, k):
+        """k nearest neighbours of x under the wrapped distance.
+
+        query(x, k) -> (squared distances, indices), ascending, as KDTree.query.
+        """
+        d2, idx = query(x, k)
+        images = self._images(x, np.sqrt(d2[-1]))
+        if not images:
+            return d2, idx
+        for img in images:
+            d2_i, idx_i = query(img, k)
+            d2, idx = np.concatenate([d2, d2_i]), np.concatenate([idx, idx_i])
+        order = np.argsort(d2, kind="stable")
+        d2, idx = d2[order], idx[order]
+        _, first = np.unique(idx, return_index=True)     # a point seen twice: keep the shorter
+        keep = np.sort(first)[:k]
+        d2, idx = d2[keep], idx[keep]
+        if len(idx) < k:                                   # fewer than k points in the tree
+            d2 = np.concatenate([d2, np.full(k - len(idx), np.inf)])
+            idx = np.concatenate([idx, np.full(k - len(idx), -1, dtype=idx.dtype)])
+        return d2, idx
+
+    def valid(self, q):
+        """(M,) validity of joint vectors (inside the limits and collision-free)."""
+        q = np.atleast_2d(np.asarray(q, dtype=float))
+        inside = np.all((q >= self.limits[:, 0]) & (q <= self.limits[:, 1]), axis=1)
+        free = np.zeros(len(q), dtype=bool)
+        if inside.any():
+            free[inside] = self.is_free(q[inside])
+        return free
+
+    def _edge_states(self, A, B):
+        """States along edges A[e] -> B[e] (A excluded, B included) and states per edge."""
+        D = self.difference(A, B)
+        counts = np.maximum(1, np.ceil(np.abs(D).max(axis=1) / self.resolution)).astype(np.int64)
+        edge = np.repeat(np.arange(len(A)), counts)
+        first = np.cumsum(counts) - counts
+        t = (np.arange(counts.sum()) - first[edge] + 1) / counts[edge]
+        return self.wrap(A[edge] + t[:, None] * D[edge]), counts
+
+    def edges_free(self, A, B):
+        """(E,) True where the straight edge A[e] -> B[e] is collision-free.
+
+        The start states A are assumed valid. Edges are validated in batches of
+        about _EDGE_STATES states.
+        """
+        A, B = np.atleast_2d(A).astype(float), np.atleast_2d(B).astype(float)
+        A = np.broadcast_to(A, B.shape) if len(A) == 1 else A
+        ok = np.empty(len(B), dtype=bool)
+        span = np.abs(self.difference(A, B)).max(axis=1) / self.resolution + 1
+        per_batch = max(1, int(_EDGE_STATES // max(span.mean(), 1.0))) if len(B) else 1
+        for s in range(0, len(B), per_batch):
+            states, counts = self._edge_states(A[s:s + per_batch], B[s:s + per_batch])
+            free = self.valid(states)
+            ok[s:s + per_batch] = np.logical_and.reduceat(free, np.cumsum(counts) - counts)
+        return ok
+
+    def steer(self, a, b, block=16):
+        """Farthest free state on the segment a -> b: (state, reached_b).
+
+        Returns a itself when no step can be taken, and b wrapped into the
+        limits when the whole segment is free.
+
+        States are checked in blocks that double in size, so a segment that is
+        blocked early (the common case for CONNECT) costs one small batch.
+        """
+        states, _ = self._edge_states(a[None], b[None])
+        lo = 0
+        while lo < len(states):
+            hi = min(lo + block, len(states))
+            free = self.valid(states[lo:hi])
+            if not free.all():
+                first_hit = lo + int(np.argmin(free))
+                return (states[first_hit - 1] if first_hit else a), False
+            lo, block = hi, 2 * block
+        return states[-1], True
+
+
+# ---------- spaces ----------
+def _scene_key(**fields):
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+def planar_space(lengths, obstacles=None, radius=0.0, self_collision=True,
+                 joint_limits=None, resolution=0.02):
+    """Planar N-link arm (fk_planar) among collision.Obstacles, links `radius` thick."""
+    L = np.asarray(lengths, dtype=float)
+    n = L.size
+    limits = np.array([[-np.pi, np.pi]] * n) if joint_limits is None else joint_limits
+    selfc = SelfCollision(n, thickness=radius) if self_collision and n > 2 else None
+    has_obstacles = obstacles is not None and len(obstacles) > 0
+
+    def is_free(q):
+        pts = fk_planar(q, L)
+        hit = np.zeros(len(q), dtype=bool)
+        if has_obstacles:
+            hit |= obstacles.collides(pts, radius=radius)
+        if selfc is not None:
+            hit |= selfc.collides(pts)
+        return ~hit
+
+    key = _scene_key(kind="planar", lengths=L.tolist(), radius=float(radius),
+                     scene=obstacles.digest() if has_obstacles else None,
+                     self_collision=selfc is not None,
+                     limits=np.asarray(limits, dtype=float).tolist(), resolution=resolution)
+    return JointSpace(limits, is_free, resolution, key)
+
+
+def cspace_space(cmap, resolution=None):
+    """Plan on a precomputed cspace.CSpaceMap: validity is a table lookup."""
+    resolution = resolution or float(cmap.step.min()) / 2
+    key = _scene_key(kind="cspace", grid=hashlib.sha256(np.packbits(cmap.grid).tobytes()).hexdigest(),
+                     limits=cmap.limits.tolist(), resolution=resolution)
+    return JointSpace(cmap.limits, lambda q: ~cmap.occupied(q), resolution, key)
+
+
+def arm3d_space(spheres, lengths=(1.5, 1.0), radius=0.0, joint_limits=None, resolution=0.02):
+    """Yaw/shoulder/elbow arm among spheres [(center (3,), r), ...]."""
+    centers = np.array([c for c, _ in spheres], dtype=float).reshape(-1, 3)
+    radii = np.array([r for _, r in spheres], dtype=float) + radius
+    limits = np.array([[-np.pi, np.pi]] * 3) if joint_limits is None else joint_limits
+
+    def is_free(q):
+        p = points_yaw_shoulder_elbow(q, lengths)
+        a, ab = p[:, :-1, None], (p[:, 1:] - p[:, :-1])[:, :, None]    # (M, 2, 1, 3)
+        ac = centers - a                                              # (M, 2, S, 3)
+        t = np.clip((ac * ab).sum(-1) / np.maximum((ab * ab).sum(-1), 1e-300), 0.0, 1.0)
+        d = ac - t[..., None] * ab
+        return ((d * d).sum(-1) > radii ** 2).all(axis=(1, 2))
+
+    key = _scene_key(kind="arm3d", lengths=list(map(float, lengths)), radius=float(radius),
+                     spheres=np.column_stack([centers, radii]).round(12).tolist(),
+                     limits=np.asarray(limits, dtype=float).tolist(), resolution=resolution)
+    return JointSpace(limits, is_free, resolution, key)
+
+
+# ---------- RRT-Connect ----------
+class _Tree:
+    def __init__(self, root):
+        self.kd = GrowingKDTree(len(root))
+        self.parent = []
+        self.add(root, -1)
+
+    def add(self, q, parent):
+        self.parent.append(parent)
+        return self.kd.add(q)
+
+    def branch(self, i):
+        """Node states from node i back to the root."""
+        out = []
+        while i >= 0:
+            out.append(self.kd.points[i])
+            i = self.parent[i]
+        return out
+
+
+def _nearest(space, tree, x):
+    """(squared distance, index) of the tree node closest to x, wrapped."""
+    d2, idx = space.knn(lambda y, k: tuple(np.array([v]) for v in tree.kd.nearest(y)), x, 1)
+    return d2[0], int(idx[0])
+
+
+def rrt_connect(space, start, goal, step=1.0, max_iter=5000, seed=None, smooth=False):
+    """Bidirectional RRT with greedy CONNECT. Returns (K, n) waypoints or None.
+
+    step   : EXTEND length towards each random sample (radians)
+    smooth : run shortcut() on the path found
+    """
+    start, goal = np.asarray(start, dtype=float), np.asarray(goal, dtype=float)
+    if not space.valid(np.stack([start, goal])).all():
+        return None
+    if space.edges_free(start, goal[None])[0]:
+        return np.stack([start, goal])
+    rng = np.random.default_rng(seed)
+    trees = [_Tree(start), _Tree(goal)]
+    samples = space.sample(rng, 256)
+
+    for it in range(max_iter):
+        a, b = trees[it % 2], trees[1 - it % 2]
+        if it % 256 == 255:
+            samples = space.sample(rng, 256)
+        q_rand = samples[it % 256]
+
+        # EXTEND a towards the sample
+        d2, i_near = _nearest(space, a, q_rand)
+        q_near = a.kd.points[i_near]
+        dist = np.sqrt(d2)
+        target = q_rand if dist <= step else q_near + space.difference(q_near, q_rand) * (step / dist)
+        q_new, _ = space.steer(q_near, target)
+        if q_new is q_near:
+            continue
+        j = a.add(q_new, i_near)
+
+        # CONNECT b to the new node: one batched check of the whole segment
+        _, k_near = _nearest(space, b, q_new)
+        q_b = b.kd.points[k_near]
+        q_reach, reached = space.steer(q_b, q_new)
+        if reached:
+            path_a, path_b = a.branch(j)[::-1], b.branch(k_near)
+            path = np.array(path_a + path_b)
+            if a is trees[1]:
+                path = path[::-1]
+            return shortcut(space, path) if smooth else path
+        if q_reach is not q_b:
+            b.add(q_reach, k_near)
+    return None
+
+
+def shortcut(space, path):
+    """Drop waypoints whose neighbours see each other, until none can be dropped.
+
+    Each round tests every skip-one edge path[i-1] -> path[i+1] in a single
+    batched edges_free call and removes a non-adjacent subset of the skippable
+    waypoints, so the edges checked stay short.
+    """
+    path = np.asarray(path)
+    while len(path) > 2:
+        skippable = space.edges_free(path[:-2], path[2:])
+        drop = np.zeros(len(path), dtype=bool)
+        for i in np.flatnonzero(skippable) + 1:
+            drop[i] = not drop[i - 1]
+        if not drop.any():
+            break
+        path = path[~drop]
+    return path
+
+
+def interpolate(space, path):
+    """Dense path: the states at which the edges were checked, (K', n)."""
+    states, _ = space._edge_states(path[:-1], path[1:])
+    return np.vstack([path[:1], states])
+
+
+# ---------- PRM ----------
+def _components(n, edges):
+    """Connected-component label per node (min-label propagation + pointer jumping)."""
+    label = np.arange(n)
+    if not len(edges):
+        return label
+    u, v = edges[:, 0], edges[:, 1]
+    while True:
+        before = label.copy()
+        np.minimum.at(label, u, label[v])
+        np.minimum.at(label, v, label[u])
+        label = label[label]
+        if np.array_equal(label, before):
+            return label
+
+
+class Roadmap:
+    """Probabilistic roadmap: free nodes, validated k-NN edges, CSR adjacency."""
+
+    def __init__(self, space, nodes, edges, k=10):
+        self.space = space
+        self.nodes = np.asarray(nodes, dtype=float)
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.k = k
+        n = len(self.nodes)
+        both = np.concatenate([self.edges, self.edges[:, ::-1]])
+        order = np.argsort(both[:, 0], kind="stable")
+        both = both[order]
+        self.indptr = np.searchsorted(both[:, 0], np.arange(n + 1))
+        self.indices = both[:, 1]
+        self.weights = space.distance(self.nodes[both[:, 0]], self.nodes[both[:, 1]])
+        self.component = _components(n, self.edges)
+        self.tree = KDTree(self.nodes)
+        # per-node [(neighbour, weight), ...] lists for the search loop: iterating
+        # them is much cheaper than indexing ndarrays
+        nbrs = list(zip(self.indices.tolist(), self.weights.tolist()))
+        ptr = self.indptr.tolist()
+        self._adj = [nbrs[ptr[u]:ptr[u + 1]] for u in range(n)]
+
+    @classmethod
+    def build(cls, space, n_nodes=1500, k=10, seed=0):
+        """Sample n_nodes free states, connect each to its k nearest neighbours."""
+        rng = np.random.default_rng(seed)
+        nodes = np.empty((0, space.n))
+        while len(nodes) < n_nodes:
+            q = space.sample(rng, 2 * (n_nodes - len(nodes)) + 64)
+            nodes = np.vstack([nodes, q[space.valid(q)]])
+        nodes = nodes[:n_nodes]
+        tree = KDTree(nodes)
+        d2, nn = tree.query_many(nodes, k + 1)
+        for i in range(n_nodes):                # nodes near ±π: redo with wrapped images
+            if space._images(nodes[i], np.sqrt(d2[i, -1])):
+                d2[i], nn[i] = space.knn(tree.query, nodes[i], k + 1)
+        pairs = np.column_stack([np.repeat(np.arange(n_nodes), k), nn[:, 1:].ravel()])
+        pairs = pairs[pairs[:, 1] >= 0]
+        pairs = np.unique(np.sort(pairs, axis=1), axis=0)
+        ok = space.edges_free(nodes[pairs[:, 0]], nodes[pairs[:, 1]])
+        return cls(space, nodes, pairs[ok], k)
+
+    def _neighbours(self, q):
+        """The k roadmap nodes nearest to q, with distances."""
+        d2, idx = self.space.knn(self.tree.query, q, self.k)
+        return idx[idx >= 0], np.sqrt(d2[idx >= 0])
+
+    def query(self, start, goal, smooth=False):
+        """(K, n) waypoints from start to goal through the roadmap, or None.
+
+        smooth : run shortcut() on the path found (several ms on 3R arms)
+        """
+        start, goal = np.asarray(start, dtype=float), np.asarray(goal, dtype=float)
+        if not self.space.valid(np.stack([start, goal])).all():
+            return None
+        if self.space.edges_free(start, goal[None])[0]:
+            return np.stack([start, goal])
+        s_idx, s_cost = self._neighbours(start)
+        g_idx, g_cost = self._neighbours(goal)
+        # attach edges of both ends in one batched check
+        ok = self.space.edges_free(np.repeat(np.stack([start, goal]), [len(s_idx), len(g_idx)], axis=0),
+                                   self.nodes[np.concatenate([s_idx, g_idx])])
+        s_ok, g_ok = ok[:len(s_idx)], ok[len(s_idx):]
+        s_idx, s_cost, g_idx, g_cost = s_idx[s_ok], s_cost[s_ok], g_idx[g_ok], g_cost[g_ok]
+        shared = np.intersect1d(self.component[s_idx], self.component[g_idx])
+        if not len(shared):
+            return None
+        keep = np.isin(self.component[s_idx], shared)
+        node_path = self._astar(s_idx[keep], s_cost[keep], dict(zip(g_idx.tolist(), g_cost.tolist())), goal)
+        if node_path is None:
+            return None
+        path = np.vstack([start, self.nodes[node_path], goal])
+        return shortcut(self.space, path) if smooth else path
+
+    def _astar(self, sources, costs, goal_cost, goal):
+        adj = self._adj
+        h = self.space.distance(self.nodes, goal).tolist()
+        inf = float("inf")
+        g = [inf] * len(h)
+        parent = [-1] * len(h)
+        closed = bytearray(len(h))
+        heap = []
+        for s, c in zip(sources.tolist(), costs.tolist()):
+            if c < g[s]:
+                g[s] = c
+                heapq.heappush(heap, (c + h[s], s))
+        best, best_node = inf, -1
+        push, pop = heapq.heappush, heapq.heappop
+        while heap:
+            f, u = pop(heap)
+            if f >= best:
+                break
+            if closed[u]:
+                continue
+            closed[u] = 1
+            gu = g[u]
+            if u in goal_cost and gu + goal_cost[u] < best:
+                best, best_node = gu + goal_cost[u], u
+            for v, w in adj[u]:
+                gv = gu + w
+                if gv < g[v]:
+                    g[v], parent[v] = gv, u
+                    push(heap, (gv + h[v], v))
+        if best_node < 0:
+            return None
+        out = [best_node]
+        while parent[out[-1]] >= 0:
+            out.append(parent[out[-1]])
+        return out[::-1]
+
+    def save(self, path):
+        np.savez(path, nodes=self.nodes, edges=self.edges, k=self.k)
+
+    @classmethod
+    def load(cls, path, space):
+        with np.load(path) as f:
+            return cls(space, f["nodes"], f["edges"], int(f["k"]))
+
+
+def roadmap(space, n_nodes=1500, k=10, seed=0, cache_dir=None):
+    """Roadmap.build, cached in-process and on disk per (scene, n_nodes, k, seed).
+
+    cache_dir : default ~/.cache/aurora_roadmaps (or $AURORA_ROADMAP_CACHE);
+                False, or a space without a key, disables the disk cache
+    """
+    if space.key is None:
+        return Roadmap.build(space, n_nodes, k, seed)
+    key = _scene_key(version=CACHE_VERSION, space=space.key, n_nodes=n_nodes, k=k, seed=seed)
+    if key in _loaded:
+        return _loaded[key]
+    cache_path = None
+    if cache_dir is not False:
+        cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        cache_path = os.path.join(cache_dir, f"{key[:24]}.npz")
+    if cache_path and os.path.exists(cache_path):
+        prm = Roadmap.load(cache_path, space)
+    else:
+        prm = Roadmap.build(space, n_nodes, k, seed)
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = cache_path[:-4] + f".{os.getpid()}.tmp.npz"
+            prm.save(tmp)
+            os.replace(tmp, cache_path)         # atomic: readers never see half a file
+    _loaded[key] = prm
+    return prm
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from collision import Obstacles
+
+    TARGET_MS = 10.0                        # p90 query latency goal
+
+    def bench(name, space, n_queries=60, seed=1, **prm_kw):
+        t0 = time.perf_counter()
+        prm = roadmap(space, cache_dir=cache, **prm_kw)
+        t_build = time.perf_counter() - t0
+        _loaded.clear()                     # a new process: only the disk cache is warm
+        t0 = time.perf_counter()
+        prm = roadmap(space, cache_dir=cache, **prm_kw)
+        t_load = time.perf_counter() - t0
+        print(f"{name}: roadmap of {len(prm.nodes)} nodes / {len(prm.edges)} edges built in "
+              f"{t_build:.2f} s, loaded from cache in {t_load * 1e3:.1f} ms")
+
+        # random free start / goal pairs, unfiltered: pairs in different free
+        # regions of the joint space count as failures for both planners (PRM
+        # rejects them from its component labels, RRT runs to max_iter)
+        rng = np.random.default_rng(seed)
+        q = space.sample(rng, 8 * n_queries)
+        q = q[space.valid(q)]
+        queries = list(zip(q[::2], q[1::2]))[:n_queries]
+        # latencies are over the solved queries: instant rejects would flatter the tail
+        for label, plan in (("rrt-connect", lambda a, b: rrt_connect(space, a, b, max_iter=2000, seed=0)),
+                            ("prm", prm.query),
+                            ("prm+smooth", lambda a, b: prm.query(a, b, smooth=True))):
+            times, valid = [], 0
+            for a, b in queries:
+                t0 = time.perf_counter()
+                path = plan(a, b)
+                if path is not None:
+                    times.append(time.perf_counter() - t0)
+                    valid += bool(space.valid(interpolate(space, path)).all())
+            p50, p90 = np.percentile(times, [50, 90]) * 1e3
+            verdict = "meets" if p90 < TARGET_MS else "misses"
+            print(f"  {label:12s} failed {len(queries) - len(times):2d}/{len(queries)} "
+                  f"({1 - len(times) / len(queries):4.0%}), {valid:2d} valid paths   "
+                  f"p50 {p50:6.2f} ms   p90 {p90:7.2f} ms   ({verdict} the {TARGET_MS:g} ms target)")
+
+    cache = tempfile.mkdtemp(prefix="roadmaps_")
+    obstacles = (Obstacles()
+                 .add_circle((1.2, 1.2), 0.3)
+                 .add_box((-2.0, -0.4), (-1.2, 0.4))
+                 .add_polygon([(1.6, -0.6), (2.4, -0.3), (2.2, -1.2)]))
+
+    bench("2R (2-links_2d.py)", planar_space([1.5, 1.0], obstacles, radius=0.05))
+    bench("3R (3-link_2d.py)", planar_space([1.5, 1.0, 1.5], obstacles, radius=0.05), n_nodes=3000)
+    spheres = [((1.2, 0.8, 0.5), 0.4), ((-0.5, -1.5, 0.0), 0.5), ((0.0, 0.0, 1.8), 0.5)]
+    bench("3D yaw/shoulder/elbow", arm3d_space(spheres, radius=0.05), n_nodes=3000)
+
+    from cspace import cspace_map
+    cmap = cspace_map([1.5, 1.0], obstacles, resolution=512, radius=0.05, cache_dir=cache)
+    bench("2R on a 512^2 C-space map", cspace_space(cmap))
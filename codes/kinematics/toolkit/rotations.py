@@ -0,0 +1,320 @@
+# rotations.py
+# Batched 3D rotations: elementary matrices, axis-angle, quaternions, roll-pitch-yaw.
+# Requirements: python -m pip install numpy
+#
+# Every function takes arrays of angles / vectors and returns stacks of results:
+# N angles -> (N, 3, 3) matrices, a scalar angle -> a single (3, 3) matrix.
+# Conventions:
+#   quaternion  (w, x, y, z), w = cos(angle/2)
+#   roll-pitch-yaw  R = Rz(yaw) · Ry(pitch) · Rx(roll)   (fixed x-y-z axes)
+#   axis-angle  unit axis (3,) and angle in radians; rotvec = axis * angle
+#
+# The matrices are written element by element into one preallocated array, so
+# there is no per-call np.array literal and no Python loop over the batch.
+
+import numpy as np
+
+
+def _out(shape, out):
+    if out is None:
+        return np.empty(shape)
+    if out.shape != shape:
+        raise ValueError(f"out must have shape {shape}, got {out.shape}")
+    return out
+
+
+def _elementary(t, i, j, out):
+    """Rotation about the axis that is neither i nor j, (N, 3, 3)."""
+    t = np.asarray(t, dtype=float)
+    R = _out(t.shape + (3, 3), out)
+    c, s = np.cos(t), np.sin(t)
+    k = 3 - i - j
+    R[...] = 0.0
+    R[..., k, k] = 1.0
+    R[..., i, i] = c
+    R[..., j, j] = c
+    R[..., i, j] = -s
+    R[..., j, i] = s
+    return R
+
+
+def rot_x(t, out=None):
+    """Rotation(s) about x by t radians: (3, 3) for a scalar, (N, 3, 3) for (N,)."""
+    return _elementary(t, 1, 2, out)
+
+
+def rot_y(t, out=None):
+    """Rotation(s) about y by t radians."""
+    return _elementary(t, 2, 0, out)
+
+
+def rot_z(t, out=None):
+    """Rotation(s) about z by t radians."""
+    return _elementary(t, 0, 1, out)
+
+
+def rot_axis(axis, t, out=None):
+    """Rotation about the named axis 'x' / 'y' / 'z' (case-insensitive)."""
+    try:
+        fn = {"x": rot_x, "y": rot_y, "z": rot_z}[axis.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"axis must be 'x', 'y' or 'z', got {axis!r}") from None
+    return fn(t, out=out)
+
+
+# ---------- axis-angle ----------
+def axis_angle_to_matrix(axis, angle, out=None):
+    """Rodrigues' formula. axis (..., 3) (normalised here), angle (...) -> (..., 3, 3)."""
+    axis = np.asarray(axis, dtype=float)
+    axis = axis / np.linalg.norm(axis, axis=-1, keepdims=True)
+    angle = np.asarray(angle, dtype=float)
+    shape = np.broadcast_shapes(axis.shape[:-1], angle.shape)
+    R = _out(shape + (3, 3), out)
+    x, y, z = axis[..., 0], axis[..., 1], axis[..., 2]
+    c, s = np.cos(angle), np.sin(angle)
+    C = 1.0 - c
+    R[..., 0, 0] = c + x*x*C
+    R[..., 0, 1] = x*y*C - z*s
+    R[..., 0, 2] = x*z*C + y*s
+    R[..., 1, 0] = y*x*C + z*s
+    R[..., 1, 1] = c + y*y*C
+    R[..., 1, 2] = y*z*C - x*s
+    R[..., 2, 0] = z*x*C - y*s
+    R[..., 2, 1] = z*y*C + x*s
+    R[..., 2, 2] = c + z*z*C
+    return R
+
+
+def matrix_to_axis_angle(R):
+    """(N, 3, 3) -> (axis (N, 3), angle (N,)), angle in [0, π]; via quaternions."""
+    return quat_to_axis_angle(matrix_to_quat(R))
+
+
+# ---------- quaternions ----------
+def quat_normalize(q):
+    q = np.asarray(q, dtype=float)
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def quat_conjugate(q):
+    q = np.array(q, dtype=float)
+    q[..., 1:] *= -1.0
+    return q
+
+
+def quat_multiply(a, b, out=None):
+    """Hamilton product a ⊗ b (rotation b first, then a), broadcast over (..., 4)."""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    q = _out(np.broadcast_shapes(a.shape, b.shape), out)
+    w = aw*bw - ax*bx - ay*by - az*bz
+    x = aw*bx + ax*bw + ay*bz - az*by
+    y = aw*by - ax*bz + ay*bw + az*bx
+    z = aw*bz + ax*by - ay*bx + az*bw
+    q[..., 0], q[..., 1], q[..., 2], q[..., 3] = w, x, y, z
+    return q
+
+
+def quat_rotate(q, v):
+    """Rotate vectors v (..., 3) by unit quaternions q (..., 4) without building matrices."""
+    q = np.asarray(q, dtype=float)
+    v = np.asarray(v, dtype=float)
+    w, u = q[..., :1], q[..., 1:]
+    t = 2.0 * np.cross(u, v)
+    return v + w*t + np.cross(u, t)
+
+
+def quat_to_matrix(q, out=None):
+    """Unit quaternions (..., 4) -> rotation matrices (..., 3, 3)."""
+    q = np.asarray(q, dtype=float)
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    R = _out(q.shape[:-1] + (3, 3), out)
+    xx, yy, zz = x*x, y*y, z*z
+    xy, xz, yz = x*y, x*z, y*z
+    wx, wy, wz = w*x, w*y, w*z
+    R[..., 0, 0] = 1 - 2*(yy + zz)
+    R[..., 0, 1] = 2*(xy - wz)
+    R[..., 0, 2] = 2*(xz + wy)
+    R[..., 1, 0] = 2*(xy + wz)
+    R[..., 1, 1] = 1 - 2*(xx + zz)
+    R[..., 1, 2] = 2*(yz - wx)
+    R[..., 2, 0] = 2*(xz - wy)
+    R[..., 2, 1] = 2*(yz + wx)
+    R[..., 2, 2] = 1 - 2*(xx + yy)
+    return R
+
+
+def matrix_to_quat(R):
+    """Rotation matrices (..., 3, 3) -> unit quaternions (..., 4) with w >= 0.
+
+    Shepperd's method: every row uses whichever of w, x, y, z is largest as the
+    pivot, so the result stays accurate near 180° rotations.
+    """
+    R = np.asarray(R, dtype=float)
+    m00, m11, m22 = R[..., 0, 0], R[..., 1, 1], R[..., 2, 2]
+    # 4·w², 4·x², 4·y², 4·z² (up to the shared +1)
+    diag = np.stack([m00 + m11 + m22, m00 - m11 - m22,
+                     -m00 + m11 - m22, -m00 - m11 + m22], axis=-1)
+    k = np.argmax(diag, axis=-1)
+    r = np.sqrt(np.maximum(1.0 + np.take_along_axis(diag, k[..., None], -1)[..., 0], 1e-300))
+    h = 0.5 / r
+    a = R[..., 2, 1] - R[..., 1, 2]
+    b = R[..., 0, 2] - R[..., 2, 0]
+    c = R[..., 1, 0] - R[..., 0, 1]
+    d = R[..., 0, 1] + R[..., 1, 0]
+    e = R[..., 0, 2] + R[..., 2, 0]
+    f = R[..., 1, 2] + R[..., 2, 1]
+    cand = np.stack([
+        np.stack([0.5*r, a*h, b*h, c*h], axis=-1),
+        np.stack([a*h, 0.5*r, d*h, e*h], axis=-1),
+        np.stack([b*h, d*h, 0.5*r, f*h], axis=-1),
+        np.stack([c*h, e*h, f*h, 0.5*r], axis=-1)], axis=-2)
+    q = np.take_along_axis(cand, k[..., None, None], -2)[..., 0, :]
+    return q * np.where(q[..., :1] < 0, -1.0, 1.0)
+
+
+def axis_angle_to_quat(axis, angle):
+    """axis (..., 3), angle (...) -> quaternions (..., 4)."""
+    axis = np.asarray(axis, dtype=float)
+    axis = axis / np.linalg.norm(axis, axis=-1, keepdims=True)
+    half = 0.5*np.asarray(angle, dtype=float)[..., None]
+    return np.concatenate([np.cos(half), np.sin(half)*axis], axis=-1)
+
+
+def quat_to_axis_angle(q):
+    """Quaternions (..., 4) -> (axis (..., 3), angle (...)), angle in [0, π].
+
+    The axis is arbitrary ([1, 0, 0]) for the identity rotation.
+    """
+    q = quat_normalize(q)
+    q = q * np.where(q[..., :1] < 0, -1.0, 1.0)
+    s = np.linalg.norm(q[..., 1:], axis=-1)
+    angle = 2.0*np.arctan2(s, q[..., 0])
+    tiny = s < 1e-12
+    axis = q[..., 1:] / np.where(tiny, 1.0, s)[..., None]
+    axis[tiny] = (1.0, 0.0, 0.0)
+    return axis, angle
+
+
+def quat_slerp(a, b, t):
+    """Spherical interpolation between unit quaternions a, b (..., 4) at t (...)."""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    t = np.asarray(t, dtype=float)[..., None]
+    dot = np.sum(a*b, axis=-1, keepdims=True)
+    b = np.where(dot < 0, -b, b)                # shortest arc
+    dot = np.abs(dot)
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_t = np.sin(theta)
+    small = sin_t < 1e-9
+    wa = np.where(small, 1.0 - t, np.sin((1.0 - t)*theta) / np.where(small, 1.0, sin_t))
+    wb = np.where(small, t, np.sin(t*theta) / np.where(small, 1.0, sin_t))
+    return quat_normalize(wa*a + wb*b)
+
+
+# ---------- roll-pitch-yaw ----------
+def rpy_to_matrix(roll, pitch, yaw, out=None):
+    """R = Rz(yaw) · Ry(pitch) · Rx(roll), closed form, (N, 3, 3)."""
+    roll, pitch, yaw = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                             for a in (roll, pitch, yaw)))
+    R = _out(roll.shape + (3, 3), out)
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    R[..., 0, 0] = cy*cp
+    R[..., 0, 1] = cy*sp*sr - sy*cr
+    R[..., 0, 2] = cy*sp*cr + sy*sr
+    R[..., 1, 0] = sy*cp
+    R[..., 1, 1] = sy*sp*sr + cy*cr
+    R[..., 1, 2] = sy*sp*cr - cy*sr
+    R[..., 2, 0] = -sp
+    R[..., 2, 1] = cp*sr
+    R[..., 2, 2] = cp*cr
+    return R
+
+
+def matrix_to_rpy(R):
+    """(N, 3, 3) -> (roll, pitch, yaw), each (N,). At pitch = ±π/2 roll is set to 0."""
+    R = np.asarray(R, dtype=float)
+    cp = np.hypot(R[..., 0, 0], R[..., 1, 0])
+    pitch = np.arctan2(-R[..., 2, 0], cp)
+    gimbal = cp < 1e-12
+    roll = np.where(gimbal, 0.0, np.arctan2(R[..., 2, 1], R[..., 2, 2]))
+    yaw = np.where(gimbal, np.arctan2(-R[..., 0, 1], R[..., 1, 1]),
+                   np.arctan2(R[..., 1, 0], R[..., 0, 0]))
+    return roll, pitch, yaw
+
+
+def rpy_to_quat(roll, pitch, yaw):
+    """Roll-pitch-yaw -> quaternions (..., 4) without going through matrices."""
+    hr, hp, hy = (0.5*np.asarray(a, dtype=float) for a in (roll, pitch, yaw))
+    cr, sr = np.cos(hr), np.sin(hr)
+    cp, sp = np.cos(hp), np.sin(hp)
+    cy, sy = np.cos(hy), np.sin(hy)
+    return np.stack([cy*cp*cr + sy*sp*sr,
+                     cy*cp*sr - sy*sp*cr,
+                     cy*sp*cr + sy*cp*sr,
+                     sy*cp*cr - cy*sp*sr], axis=-1)
+
+
+# ---------- composition ----------
+def compose(A, B, out=None):
+    """Batched A · B for (..., 3, 3) stacks (broadcasting), optionally into out."""
+    return np.matmul(A, B, out=out)
+
+
+def chain(R):
+    """Running products R[0], R[0]·R[1], ..., R[0]···R[N-1] of an (N, 3, 3) stack.
+
+    Uses a log-step scan: ceil(log2 N) batched matmuls instead of N small ones.
+    """
+    out = np.array(R, dtype=float)
+    step = 1
+    while step < len(out):
+        out[step:] = np.matmul(out[:-step], out[step:])
+        step *= 2
+    return out
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    N = 1_000_000
+    roll, pitch, yaw = rng.uniform(-np.pi, np.pi, size=(3, N))
+    pitch *= 0.5
+
+    t0 = time.perf_counter()
+    R = rpy_to_matrix(roll, pitch, yaw)
+    t_rpy = time.perf_counter() - t0
+    ref = rot_z(yaw) @ rot_y(pitch) @ rot_x(roll)
+    print(f"rpy_to_matrix  : {N/t_rpy:12,.0f} rotations/s  (err vs Rz·Ry·Rx {np.abs(R - ref).max():.1e})")
+
+    t0 = time.perf_counter()
+    q = matrix_to_quat(R)
+    t_q = time.perf_counter() - t0
+    print(f"matrix_to_quat : {N/t_q:12,.0f} rotations/s  (round trip err "
+          f"{np.abs(quat_to_matrix(q) - R).max():.1e}, vs rpy_to_quat "
+          f"{np.abs(q - rpy_to_quat(roll, pitch, yaw) * np.sign(rpy_to_quat(roll, pitch, yaw)[:, :1])).max():.1e})")
+
+    r2, p2, y2 = matrix_to_rpy(R)
+    print(f"matrix_to_rpy  : round trip err {np.abs(rpy_to_matrix(r2, p2, y2) - R).max():.1e}")
+    axis, ang = matrix_to_axis_angle(R)
+    print(f"axis-angle     : round trip err {np.abs(axis_angle_to_matrix(axis, ang) - R).max():.1e}")
+
+    # per-sample composition of a 1 kHz orientation stream
+    steps = rot_z(rng.normal(0, 0.01, size=100_000)) @ rot_x(rng.normal(0, 0.01, size=100_000))
+    t0 = time.perf_counter()
+    acc, ref = np.eye(3), []
+    for S in steps[:10_000]:
+        acc = acc @ S
+        ref.append(acc)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    run = chain(steps)
+    t_chain = time.perf_counter() - t0
+    print(f"loop matmul    : {10_000/t_loop:12,.0f} samples/s")
+    print(f"chain          : {len(steps)/t_chain:12,.0f} samples/s  "
+          f"(err {np.abs(run[:10_000] - np.array(ref)).max():.1e})")
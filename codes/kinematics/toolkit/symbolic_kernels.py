@@ -0,0 +1,139 @@
+# symbolic_kernels.py
+# Turn SymPy transform chains into vectorized NumPy functions, cached on disk.
+# Requirements: python -m pip install numpy sympy
+#
+# transformation.py builds TO_A * TA_E symbolically and calls simplify() every
+# run. compile_kernel() does the simplify + code generation once, writes the
+# generated NumPy source to a cache directory keyed by a hash of the expression,
+# and on later runs just imports that file.
+#
+#   T = compile_kernel(TO_A * TA_E, [theta1, theta2, L_1, L_2], name="TO_E")
+#   T(th1_array, th2_array, 1.5, 1.0)   # -> (..., 3, 3) array
+#   T.simplified                         # simplified SymPy matrix, for printing
+
+import hashlib
+import importlib.util
+import os
+import tempfile
+
+import sympy
+from sympy.printing.numpy import NumPyPrinter
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AURORA_KERNEL_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "aurora_kernels"))
+
+_loaded = {}        # key -> kernel, so repeated calls in one process are free
+
+
+def expression_key(expr, args, simplify=True):
+    """Stable hash of an expression, its argument list and the compile options."""
+    text = "|".join([str(CACHE_VERSION), sympy.__version__, str(bool(simplify)),
+                     sympy.srepr(expr), sympy.srepr(tuple(args))])
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _generate_source(expr, args, func_name):
+    """NumPy source for `expr` with each entry written into a broadcast output array."""
+    params = [f"a{i}" for i in range(len(args))]
+    expr = expr.xreplace({s: sympy.Symbol(p) for s, p in zip(args, params)})
+    is_matrix = isinstance(expr, sympy.MatrixBase)
+    entries = list(expr) if is_matrix else [expr]
+
+    subexprs, reduced = sympy.cse(entries, symbols=sympy.numbered_symbols("c"))
+    printer = NumPyPrinter({"fully_qualified_modules": True})
+
+    lines = [f"def {func_name}({', '.join(params)}):"]
+    lines += [f"    {p} = numpy.asarray({p}, dtype=float)" for p in params]
+    lines.append(f"    shape = numpy.broadcast({', '.join(params)}).shape"
+                 if len(params) > 1 else f"    shape = {params[0]}.shape")
+    for sym, sub in subexprs:
+        lines.append(f"    {sym} = {printer.doprint(sub)}")
+    if is_matrix:
+        rows, cols = expr.shape
+        lines.append(f"    out = numpy.empty(shape + ({rows}, {cols}))")
+        for k, e in enumerate(reduced):
+            lines.append(f"    out[..., {k // cols}, {k % cols}] = {printer.doprint(e)}")
+    else:
+        lines.append("    out = numpy.empty(shape)")
+        lines.append(f"    out[...] = {printer.doprint(reduced[0])}")
+    lines.append("    return out")
+    return "\n".join(lines)
+
+
+def _load_module(path, key):
+    spec = importlib.util.spec_from_file_location(f"_aurora_kernel_{key[:16]}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def compile_kernel(expr, args, name="kernel", simplify=True, cache_dir=None):
+    """Vectorized NumPy function for a SymPy expression or matrix.
+
+    expr      : sympy expression or Matrix
+    args      : ordered list of symbols that become the function's parameters
+    simplify  : run sympy.simplify before code generation (only on a cache miss)
+    cache_dir : where generated modules live (default ~/.cache/aurora_kernels,
+                or $AURORA_KERNEL_CACHE)
+
+    The returned function broadcasts its arguments and returns an array of shape
+    broadcast_shape (+ matrix shape). It also carries `.simplified` (the
+    simplified SymPy expression) and `.source_path`.
+    """
+    key = expression_key(expr, args, simplify)
+    if key in _loaded:
+        return _loaded[key]
+
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    path = os.path.join(cache_dir, f"{name}_{key[:16]}.py")
+    if not os.path.exists(path):
+        target = sympy.simplify(expr) if simplify else expr
+        source = "\n".join([
+            f"# Generated by symbolic_kernels.py from {name}; do not edit.",
+            f"# key: {key}",
+            "import numpy",
+            "",
+            f"SIMPLIFIED = {sympy.srepr(target)!r}",
+            "",
+            "",
+            _generate_source(target, args, name),
+            "",
+        ])
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(source)
+        os.replace(tmp, path)       # atomic: concurrent runs never see half a file
+
+    module = _load_module(path, key)
+    kernel = getattr(module, name)
+    kernel.simplified = sympy.sympify(module.SIMPLIFIED)
+    kernel.source_path = path
+    _loaded[key] = kernel
+    return kernel
+
+
+if __name__ == "__main__":
+    import time
+    import numpy as np
+    from sympy import symbols, cos, sin, Matrix, pprint
+
+    th1, th2, L_1, L_2 = symbols("theta1,theta2,L_1,L_2")
+    TO_A = Matrix([[cos(th1), -sin(th1), L_1*cos(th1)],
+                   [sin(th1),  cos(th1), L_1*sin(th1)],
+                   [0, 0, 1]])
+    TA_E = Matrix([[cos(th2), -sin(th2), L_2*cos(th2)],
+                   [sin(th2),  cos(th2), L_2*sin(th2)],
+                   [0, 0, 1]])
+
+    t0 = time.perf_counter()
+    TO_E = compile_kernel(TO_A * TA_E, [th1, th2, L_1, L_2], name="TO_E")
+    print(f"compile/load: {time.perf_counter() - t0:.3f} s  ({TO_E.source_path})")
+    pprint(TO_E.simplified)
+
+    q = np.random.default_rng(0).uniform(-np.pi, np.pi, size=(1_000_000, 2))
+    t0 = time.perf_counter()
+    T = TO_E(q[:, 0], q[:, 1], 1.5, 1.0)
+    print(f"evaluated {len(q):,} poses in {time.perf_counter() - t0:.3f} s -> {T.shape}")
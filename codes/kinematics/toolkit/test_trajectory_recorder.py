@@ -0,0 +1,89 @@
+# test_trajectory_recorder.py
+# Requirements: python -m pip install numpy pytest
+#
+#   python -m pytest test_trajectory_recorder.py
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from trajectory_recorder import TrajectoryPlayer, TrajectoryRecorder
+
+
+class _Timer:
+    """Stand-in for a canvas timer: tick() runs the callbacks by hand."""
+
+    def __init__(self):
+        self.callbacks = []
+        self.running = False
+
+    def add_callback(self, fn):
+        self.callbacks.append(fn)
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def tick(self):
+        for fn in self.callbacks:
+            fn()
+
+
+def _figure(timer):
+    return SimpleNamespace(canvas=SimpleNamespace(new_timer=lambda interval: timer))
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "session.bin")
+    q = np.arange(20.0).reshape(10, 2)
+    with TrajectoryRecorder(path, 2, capacity=4) as rec:      # grows twice
+        for i, qi in enumerate(q):
+            rec.record(qi, t=0.1 * i)
+    player = TrajectoryPlayer(path)
+    assert len(player) == 10
+    assert np.array_equal(player.joints, q)
+    assert player.sample_at(0.45) == 4
+
+
+def test_empty_recording(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    TrajectoryRecorder(path, 3).close()
+    player = TrajectoryPlayer(path)
+    assert len(player) == 0 and player.duration == 0.0
+    with pytest.raises(ValueError):
+        player.sample_at(0.0)
+
+    done = []
+    timer = _Timer()
+    assert player.play(_figure(timer), apply=done.append, on_done=lambda: done.append("done")) is None
+    assert done == ["done"] and not timer.running
+
+
+def test_play_reaches_last_sample(tmp_path):
+    path = str(tmp_path / "session.bin")
+    with TrajectoryRecorder(path, 1) as rec:
+        for i in range(3):
+            rec.record([float(i)], t=0.0)
+    applied, done = [], []
+    timer = _Timer()
+    TrajectoryPlayer(path).play(_figure(timer), apply=applied.append,
+                                on_done=lambda: done.append(True))
+    timer.tick()
+    assert applied[-1][0] == 2.0 and done == [True] and not timer.running
+
+
+def test_row_count_survives_a_crash(tmp_path):
+    path = str(tmp_path / "crash.bin")
+    rec = TrajectoryRecorder(path, 2, flush_interval=0.0)
+    for i in range(5):
+        rec.record([i, -i], t=float(i))
+    # no close(): the sidecar must already describe every flushed row
+    with open(path + ".json") as f:
+        assert json.load(f)["rows"] == 5
+    player = TrajectoryPlayer(path)
+    assert np.array_equal(player.joints[:, 0], np.arange(5.0))
+    rec.close()
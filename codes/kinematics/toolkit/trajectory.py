@@ -0,0 +1,113 @@
+# trajectory.py
+# Cartesian straight-line trajectories for the 2R arm, planned in batches.
+# Requirements: python -m pip install numpy
+#
+# Implements the plan_trajectory() stub from tasks/Task-2/Tikuochi/improvs/:
+#   1. interpolate Cartesian waypoints between start and end (cubic time scaling,
+#      so the arm starts and stops smoothly),
+#   2. solve IK for every waypoint of every move in one ik_2r_batch call,
+#   3. stitch the two elbow branches into continuous tracks and keep the track
+#      with the smallest total joint motion.
+# Step 3 is vectorized: instead of walking the path, each step's branch pair is
+# compared with the previous one, "swap" flags mark where the two IK branches
+# exchange roles (passing through the straight-arm singularity), and a cumulative
+# parity of those flags relabels the branches into continuous tracks.
+
+import numpy as np
+
+from planar_ik import ik_2r_batch
+
+
+def _time_scaling(steps, profile):
+    s = np.linspace(0.0, 1.0, steps)
+    if profile == "cubic":
+        return s*s*(3.0 - 2.0*s)       # zero velocity at both ends
+    if profile == "linear":
+        return s
+    raise ValueError(f"unknown profile {profile!r}")
+
+
+def plan_trajectories(starts, ends, steps=50, L1=1.5, L2=1.0, q_start=None,
+                      profile="cubic"):
+    """Plan K straight-line moves at once.
+
+    starts, ends : (K, 2) Cartesian start / end points
+    q_start      : optional (K, 2) current joint angles; the branch closest to
+                   them is preferred and the path is unwrapped to start near them
+    returns (q, waypoints, ok)
+        q         – (K, steps, 2) joint angles in radians (NaN where infeasible)
+        waypoints – (K, steps, 2) Cartesian points
+        ok        – (K,) True if every waypoint of the move is reachable
+    """
+    starts = np.atleast_2d(np.asarray(starts, dtype=float))
+    ends = np.atleast_2d(np.asarray(ends, dtype=float))
+    K = starts.shape[0]
+
+    s = _time_scaling(steps, profile)[None, :, None]
+    waypoints = starts[:, None, :] + s*(ends - starts)[:, None, :]
+
+    sols, reach = ik_2r_batch(waypoints.reshape(-1, 2), L1, L2)
+    sols = sols.reshape(K, steps, 2, 2)            # [move, step, branch, joint]
+    ok = reach.reshape(K, steps).all(axis=1)
+
+    # unwrap each branch along the path so ±π crossings don't look like jumps
+    sols = np.unwrap(sols, axis=1)
+
+    # relabel branches into continuous tracks (vectorized branch tracking)
+    prev, cur = sols[:, :-1], sols[:, 1:]
+    stay = np.abs(cur - prev).sum(axis=(2, 3))
+    swap = np.abs(cur - prev[:, :, ::-1]).sum(axis=(2, 3))
+    flips = np.concatenate([np.zeros((K, 1), dtype=int),
+                            np.cumsum(swap < stay, axis=1) % 2], axis=1)
+    idx = np.stack([flips, 1 - flips], axis=-1)   # which branch feeds each track
+    tracks = np.take_along_axis(sols, idx[..., None], axis=2)
+    tracks = np.unwrap(tracks, axis=1)
+
+    # cost of each track: total joint motion (+ distance from the current pose)
+    motion = np.abs(np.diff(tracks, axis=1)).sum(axis=(1, 3))
+    if q_start is not None:
+        q_start = np.atleast_2d(np.asarray(q_start, dtype=float))
+        d0 = tracks[:, 0] - q_start[:, None, :]
+        d0 -= 2*np.pi*np.round(d0 / (2*np.pi))     # compare modulo 2π
+        motion += np.abs(d0).sum(axis=2)
+    best = np.nan_to_num(motion, nan=np.inf).argmin(axis=1)
+    q = tracks[np.arange(K), :, best]
+
+    if q_start is not None:
+        # shift whole turns so the path starts next to the current pose
+        q -= 2*np.pi*np.round((q[:, :1] - q_start[:, None, :]) / (2*np.pi))
+    q[~ok] = np.nan
+    return q, waypoints, ok
+
+
+def plan_trajectory(start_pos, end_pos, steps=50, L1=1.5, L2=1.0, q_start=None):
+    """Single move: (steps, 2) joint angles, or None if the line leaves the workspace."""
+    q, _, ok = plan_trajectories([start_pos], [end_pos], steps, L1, L2,
+                                 None if q_start is None else [q_start])
+    return q[0] if ok[0] else None
+
+
+if __name__ == "__main__":
+    import time
+    from planar_fk import fk_planar_ee
+
+    rng = np.random.default_rng(0)
+    K, steps = 10_000, 50
+    # short moves inside the annulus 0.5 < r < 2.5
+    r = rng.uniform(0.8, 2.3, K)
+    a = rng.uniform(-np.pi, np.pi, K)
+    starts = np.stack([r*np.cos(a), r*np.sin(a)], axis=1)
+    ends = starts + rng.normal(0, 0.15, size=(K, 2))
+
+    t0 = time.perf_counter()
+    q, wp, ok = plan_trajectories(starts, ends, steps)
+    dt = time.perf_counter() - t0
+
+    ee = fk_planar_ee(q[ok].reshape(-1, 2), [1.5, 1.0]).reshape(-1, steps, 2)
+    err = np.abs(ee - wp[ok]).max()
+    jump = np.abs(np.diff(q[ok], axis=1)).max()
+    print(f"{K:,} moves x {steps} steps in {dt*1e3:.1f} ms ({K/dt:,.0f} moves/s)")
+    print(f"feasible {ok.mean():.1%}, max FK error {err:.1e}, max joint step {np.degrees(jump):.2f}°")
+
+    path = plan_trajectory((2.0, 0.5), (-0.5, 1.8), q_start=(0.0, 0.5))
+    print("single move, first/last joints (deg):", np.degrees(path[[0, -1]]).round(1).tolist())
@@ -0,0 +1,234 @@
+# trajectory_recorder.py
+# Record timestamped joint vectors to a growable memory-mapped file, and replay them.
+# Requirements: python -m pip install numpy matplotlib
+#
+# A recording is two files:
+#   session.bin       raw float64 rows: (t, q1, ..., qn), t in seconds from the start
+#   session.bin.json  {"columns": [...], "rows": N}
+# The .bin file is preallocated and doubled with truncate() when full, and both
+# recorder and player go through np.memmap, so multi-hour sessions never have
+# to fit in RAM. The row count in the sidecar is refreshed every flush_interval
+# seconds while recording, so a crashed session can still be replayed up to its
+# last refresh.
+#
+# In the slider GUIs:
+#   ARM_RECORD=session.bin python 2-links_2d.py     # record slider moves
+#   ARM_REPLAY=session.bin python 2-links_2d.py     # replay them (ARM_REPLAY_SPEED=4 for 4x)
+
+import atexit
+import bisect
+import json
+import os
+import time
+
+import numpy as np
+
+
+class TrajectoryRecorder:
+    def __init__(self, path, n_joints, columns=None, capacity=65536, flush_interval=1.0):
+        """
+        path           : .bin file to create (overwritten)
+        n_joints       : joint values per sample
+        columns        : optional joint names (default q1..qn)
+        capacity       : initial number of rows; the file doubles when full
+        flush_interval : seconds between flushes of the data and the row count
+                         (None: only on grow / flush() / close())
+        """
+        self.path = path
+        self.columns = ["t"] + list(columns or [f"q{i+1}" for i in range(n_joints)])
+        if len(self.columns) != n_joints + 1:
+            raise ValueError("need one column name per joint")
+        self.rows = 0
+        self.flush_interval = flush_interval
+        self._t0 = None
+        with open(path, "wb") as f:
+            f.truncate(capacity * len(self.columns) * 8)
+        self._map = np.memmap(path, dtype=np.float64, mode="r+",
+                              shape=(capacity, len(self.columns)))
+        self._buf = self._map.view(np.ndarray)      # plain view: cheaper indexing
+        self._write_meta()
+        self._last_flush = time.perf_counter()
+        atexit.register(self.close)
+
+    def record(self, q, t=None):
+        """Append one joint vector; t defaults to seconds since the first sample."""
+        now = time.perf_counter()
+        if self._t0 is None:
+            self._t0 = now
+        if self.rows == len(self._buf):
+            self._grow()
+        self._buf[self.rows, 0] = now - self._t0 if t is None else t
+        self._buf[self.rows, 1:] = q
+        self.rows += 1
+        if self.flush_interval is not None and now - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def attach(self, sliders):
+        """Record [s.val for s in sliders] every time one of them changes."""
+        def on_change(_):
+            self.record([s.val for s in sliders])
+        for s in sliders:
+            s.on_changed(on_change)
+        on_change(None)                 # initial pose
+
+    def _grow(self):
+        cap = len(self._map)
+        self._map.flush()
+        del self._map, self._buf
+        with open(self.path, "r+b") as f:
+            f.truncate(2 * cap * len(self.columns) * 8)
+        self._map = np.memmap(self.path, dtype=np.float64, mode="r+",
+                              shape=(2 * cap, len(self.columns)))
+        self._buf = self._map.view(np.ndarray)
+        self._write_meta()
+
+    def _write_meta(self):
+        tmp = f"{self.path}.json.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"columns": self.columns, "rows": self.rows}, f)
+        os.replace(tmp, self.path + ".json")    # atomic: a crash never leaves half a file
+
+    def flush(self):
+        """Write the recorded rows to disk and the row count to the sidecar."""
+        self._map.flush()
+        self._write_meta()
+        self._last_flush = time.perf_counter()
+
+    def close(self):
+        """Flush, trim the preallocated tail and write the final row count."""
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map = self._buf = None
+        with open(self.path, "r+b") as f:
+            f.truncate(self.rows * len(self.columns) * 8)
+        self._write_meta()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryPlayer:
+    def __init__(self, path):
+        """Open a recording read-only; samples are paged in on demand."""
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        self.columns = meta["columns"]
+        self.rows = meta["rows"]
+        if self.rows:
+            self._map = np.memmap(path, dtype=np.float64, mode="r",
+                                  shape=(self.rows, len(self.columns)))
+        else:
+            self._map = np.empty((0, len(self.columns)))
+        self.times = self._map[:, 0]
+        self.joints = self._map[:, 1:]
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def duration(self):
+        return float(self.times[-1]) if self.rows else 0.0
+
+    def sample_at(self, t, hint=0):
+        """Index of the latest sample recorded at or before time t.
+
+        A plain bisection touches only O(log n) pages of the file (np.searchsorted
+        would first copy the strided time column). Pass the previous index as
+        `hint` when playing forward. Raises ValueError on an empty recording.
+        """
+        if not self.rows:
+            raise ValueError("recording has no samples")
+        return max(bisect.bisect_right(self.times, t, lo=hint) - 1, 0)
+
+    def iter_samples(self, speed=1.0):
+        """Yield (t, q) pacing to the recording; speed=None yields as fast as possible."""
+        start = time.perf_counter()
+        for i in range(self.rows):
+            t = self.times[i]
+            if speed:
+                wait = t / speed - (time.perf_counter() - start)
+                if wait > 0:
+                    time.sleep(wait)
+            yield t, self.joints[i]
+
+    def play(self, fig, apply, speed=1.0, fps=60.0, on_done=None):
+        """Replay inside a GUI event loop.
+
+        apply(q) is called on a canvas timer with the latest sample due at the
+        current (scaled) time; when the display can't keep up, intermediate
+        samples are skipped rather than slowing the replay down.
+        Returns the timer (keep a reference to it); an empty recording starts
+        no timer, calls on_done right away and returns None.
+        """
+        if not self.rows:
+            if on_done is not None:
+                on_done()
+            return None
+        state = {"start": None, "i": -1}
+        timer = fig.canvas.new_timer(interval=int(1000 / fps))
+
+        def tick():
+            now = time.perf_counter()
+            if state["start"] is None:
+                state["start"] = now
+            i = self.sample_at((now - state["start"]) * speed, hint=max(state["i"], 0))
+            if i != state["i"]:
+                state["i"] = i
+                apply(self.joints[i])
+            if i >= self.rows - 1:
+                timer.stop()
+                if on_done is not None:
+                    on_done()
+
+        timer.add_callback(tick)
+        timer.start()
+        return timer
+
+
+def session_from_env(fig, sliders):
+    """Record or replay the GUI sliders if ARM_RECORD / ARM_REPLAY is set.
+
+    Replay drives the sliders with set_val, so every sample goes through the
+    script's normal update -> fk -> draw path. Returns the recorder/timer (or None).
+    """
+    if os.environ.get("ARM_REPLAY"):
+        player = TrajectoryPlayer(os.environ["ARM_REPLAY"])
+        speed = float(os.environ.get("ARM_REPLAY_SPEED", "1"))
+
+        def apply(q):
+            for s, v in zip(sliders, q):
+                s.set_val(float(v))
+        return player.play(fig, apply, speed=speed)
+    if os.environ.get("ARM_RECORD"):
+        recorder = TrajectoryRecorder(os.environ["ARM_RECORD"], len(sliders),
+                                      columns=[s.label.get_text() for s in sliders])
+        recorder.attach(sliders)
+        fig.canvas.mpl_connect("close_event", lambda _: recorder.close())
+        return recorder
+    return None
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "session.bin")
+    N = 1_000_000
+    rng = np.random.default_rng(0)
+    q = np.cumsum(rng.normal(0, 0.5, size=(N, 2)), axis=0)
+
+    t0 = time.perf_counter()
+    with TrajectoryRecorder(path, 2, capacity=1024) as rec:
+        for i in range(N):
+            rec.record(q[i], t=i * 0.01)
+    print(f"recorded {N:,} samples in {time.perf_counter() - t0:.2f} s "
+          f"({os.path.getsize(path) / 1e6:.0f} MB on disk)")
+
+    player = TrajectoryPlayer(path)
+    print(f"replay: {len(player):,} samples, {player.duration:.0f} s of recording, "
+          f"sample at t=1234.5 s -> {player.joints[player.sample_at(1234.5)]}")
+    assert np.array_equal(player.joints, q)
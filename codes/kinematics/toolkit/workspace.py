@@ -0,0 +1,172 @@
+# workspace.py
+# Memory-bounded reachability heatmaps: joint samples -> batched FK -> occupancy grid.
+# Requirements: python -m pip install numpy matplotlib
+#
+# Joint-space samples are generated in fixed-size chunks, pushed through batched
+# FK and binned into a 2D (planar arms) or 3D occupancy histogram. Chunks are
+# spread over a process pool; each worker only ever holds one chunk plus its
+# partial grid, so memory stays flat no matter how many samples are requested.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from planar_fk import fk_planar_ee
+
+
+def points_yaw_shoulder_elbow(q, lengths):
+    """Joint points of the 3D arm in 2_links_3d.py (yaw about z, then two pitches about y).
+
+    q : (M, 3) as (yaw, shoulder, elbow); lengths : (L1, L2).
+    Returns (M, 3, 3): base, elbow and tip positions.
+    """
+    q = np.atleast_2d(np.asarray(q, dtype=float))
+    L1, L2 = lengths
+    sh = q[:, 1]
+    el = sh + q[:, 2]
+    cy, sy = np.cos(q[:, 0]), np.sin(q[:, 0])
+    out = np.zeros((q.shape[0], 3, 3))
+    for k, (L, pitch) in enumerate(((L1, sh), (L2, el)), start=1):
+        r = L*np.cos(pitch)                   # reach in the arm's vertical plane
+        out[:, k, 0] = out[:, k - 1, 0] + r*cy
+        out[:, k, 1] = out[:, k - 1, 1] + r*sy
+        out[:, k, 2] = out[:, k - 1, 2] - L*np.sin(pitch)
+    return out
+
+
+def ee_yaw_shoulder_elbow(q, lengths):
+    """End-effector of the same arm, (M, 3); see points_yaw_shoulder_elbow."""
+    return points_yaw_shoulder_elbow(q, lengths)[:, -1]
+
+
+def _default_bounds(lengths, dim):
+    reach = float(np.sum(lengths)) * 1.05
+    return np.array([[-reach, reach]] * dim)
+
+
+def _bin_chunk(task):
+    """Worker: sample one chunk, run FK and return its flat occupancy counts."""
+    seed, n, fk_ee, lengths, limits, lo, span, bins = task
+    rng = np.random.default_rng(seed)
+    q = rng.uniform(limits[:, 0], limits[:, 1], size=(n, len(limits)))
+    p = fk_ee(q, lengths)
+
+    idx = ((p - lo) / span * bins).astype(np.int64)
+    inside = np.all((idx >= 0) & (idx < bins), axis=1)
+    flat = np.ravel_multi_index(idx[inside].T, (bins,) * p.shape[1])
+    return np.bincount(flat, minlength=bins ** p.shape[1])
+
+
+def stream_reachability(lengths, n_samples=10_000_000, bins=256, chunk=250_000,
+                        joint_limits=None, fk_ee=fk_planar_ee, dim=2,
+                        bounds=None, workers=None, seed=0):
+    """Yield (counts, samples_done) as chunks are accumulated.
+
+    lengths      : link lengths passed to fk_ee
+    joint_limits : (n, 2) array of [min, max] radians per joint (default ±π)
+    fk_ee        : module-level function (M, n) -> (M, dim) end-effector positions
+    bounds       : (dim, 2) Cartesian extent of the grid (default ±1.05·reach)
+    workers      : process count (default: all cores; 1 runs in-process)
+
+    `counts` is the running (bins,)*dim int64 histogram; it is updated in place.
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    if joint_limits is None:
+        joint_limits = np.array([[-np.pi, np.pi]] * len(lengths))
+    limits = np.asarray(joint_limits, dtype=float)
+    bounds = _default_bounds(lengths, dim) if bounds is None else np.asarray(bounds, dtype=float)
+    lo, span = bounds[:, 0], bounds[:, 1] - bounds[:, 0]
+
+    sizes = [chunk] * (n_samples // chunk)
+    if n_samples % chunk:
+        sizes.append(n_samples % chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = ((s, n, fk_ee, lengths, limits, lo, span, bins) for s, n in zip(seeds, sizes))
+
+    counts = np.zeros(bins ** dim, dtype=np.int64)
+    grid = counts.reshape((bins,) * dim)
+    done = 0
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for task in tasks:
+            counts += _bin_chunk(task)
+            done += task[1]
+            yield grid, done
+        return
+
+    # keep only a bounded number of chunks in flight
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for task in tasks:
+            pending.append((task[1], pool.submit(_bin_chunk, task)))
+            if len(pending) >= 2 * workers:
+                n, fut = pending.pop(0)
+                counts += fut.result()
+                done += n
+                yield grid, done
+        for n, fut in pending:
+            counts += fut.result()
+            done += n
+            yield grid, done
+
+
+def reachability_grid(lengths, **kwargs):
+    """Run stream_reachability() to completion.
+
+    Returns (counts, bounds): the occupancy histogram and its Cartesian extent.
+    """
+    dim = kwargs.get("dim", 2)
+    bounds = kwargs.get("bounds")
+    if bounds is None:
+        bounds = _default_bounds(lengths, dim)
+        kwargs["bounds"] = bounds
+    grid = None
+    for grid, _ in stream_reachability(lengths, **kwargs):
+        pass
+    return grid, np.asarray(bounds, dtype=float)
+
+
+def plot_reachability(counts, bounds, ax=None, title="Workspace reachability"):
+    """Red/green heatmap: unreachable cells in red, reachable in green.
+
+    3D grids are shown as their projection onto the XY plane.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+
+    if counts.ndim == 3:
+        counts = counts.sum(axis=2)
+    if ax is None:
+        _, ax = plt.subplots(figsize=(7, 7))
+    reached = (counts > 0).T                 # imshow wants rows = y
+    ax.imshow(reached, origin="lower", cmap=ListedColormap(["#d62728", "#2ca02c"]),
+              vmin=0, vmax=1, interpolation="nearest",
+              extent=(bounds[0, 0], bounds[0, 1], bounds[1, 0], bounds[1, 1]))
+    ax.set_aspect("equal", adjustable="box")
+    ax.set_xlabel("X")
+    ax.set_ylabel("Y")
+    ax.set_title(title)
+    return ax
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    L = [1.5, 1.0]
+    t0 = time.perf_counter()
+    counts, bounds = reachability_grid(L, n_samples=5_000_000, bins=256)
+    dt = time.perf_counter() - t0
+    print(f"2R arm: {5_000_000/dt:,.0f} samples/s, {np.mean(counts > 0):.1%} of cells reached")
+
+    counts3, bounds3 = reachability_grid(L, n_samples=2_000_000, bins=64, dim=3,
+                                         fk_ee=ee_yaw_shoulder_elbow,
+                                         joint_limits=[[-np.pi, np.pi], [-3.12, 3.12], [-3.12, 3.12]])
+    print(f"3D arm: {np.mean(counts3 > 0):.1%} of voxels reached")
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
+    plot_reachability(counts, bounds, ax=ax1, title="2R planar arm")
+    plot_reachability(counts3, bounds3, ax=ax2, title="3D arm (XY projection)")
+    plt.show()
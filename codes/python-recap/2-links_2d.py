@@ -1,20 +1,27 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
-import csv 
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "kinematics", "toolkit"))
+from joint_logger import JointLogger
 
 
 # --- predefined link lengths (in arbitrary units) ---
 L1 = 1.5
 L2 = 1.0
 
+# joint angles are appended to the CSV by a background thread, so logging
+# does not slow down fk (see ../kinematics/toolkit/joint_logger.py); the file
+# is created with a header on first use and is not tracked by git
+logger = JointLogger("joint_angles.csv", columns=["theta1_deg", "theta2_deg"])
+
 def fk(theta1, theta2):
     """Forward kinematics for a 2R planar arm (angles in radians)."""
     x1 = L1*np.cos(theta1)
     y1 = L1*np.sin(theta1)
     x2 = x1 + L2*np.cos(theta1 + theta2)
     y2 = y1 + L2*np.sin(theta1 + theta2)
-    csv.writer(open("joint_angles.csv", "w")).writerow([np.rad2deg(theta1), np.rad2deg(theta2)])
+    logger.log(np.rad2deg(theta1), np.rad2deg(theta2))
     return (0, 0), (x1, y1), (x2, y2)
 
 # --- figure and axes ---
@@ -2,6 +2,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "..", "..", "codes", "kinematics", "toolkit"))
+from blit_render import SliderRenderer  # blitted, rate-limited slider redraws
+from trajectory_recorder import session_from_env  # record / replay sessions
+from collision import SelfCollision  # flags the arm folding onto itself
 
 # --- predefined link lengths (in arbitrary units) ---
 L1 = 1.5  # link length 1
@@ -49,6 +54,9 @@ ee_text = ax.text(0.02, 0.98, "", transform=ax.transAxes,
                   va="top", ha="left", fontsize=10,
                   bbox=dict(boxstyle="round", fc="w", ec="0.7"))
 
+self_collision = SelfCollision(4, thickness=0.05)  # non-adjacent links, 0.1 wide
+arm_color = link_line.get_color()
+
 # --- slider axes (beneath plot) ---
 slider_ax1 = plt.axes([0.15, 0.01, 0.7, 0.03]) #slider for theta1
 slider_ax2 = plt.axes([0.15, 0.06, 0.7, 0.03]) #slider for theta2
@@ -69,12 +77,15 @@ def update(_):
 
     link_line.set_data([b[0], j1[0], j2[0], j3[0], e[0]], [b[1], j1[1], j2[1], j3[1], e[1]]) # updating the arm position
     ee_text.set_text(f"EE: x={e[0]:.3f}, y={e[1]:.3f} \nθ1={np.rad2deg(th1):.1f}°, θ2={np.rad2deg(th2):.1f}° θ3={np.rad2deg(th3):.1f}° θ4={np.rad2deg(th4):.1f}°") # updating the end-effector text
-    plt.draw()
-
-s_theta1.on_changed(update)
-s_theta2.on_changed(update)
-s_theta3.on_changed(update)
-s_theta4.on_changed(update)
+    hit = self_collision.collides(np.array([b, j1, j2, j3, e]))  # links overlapping each other
+    link_line.set_color("red" if hit else arm_color)
+
+# the renderer hooks up the sliders, calls update() at most once per display
+# frame and blits only the arm and EE text (ARM_RENDER=draw: full redraws)
+renderer = SliderRenderer(plt.gcf(), [link_line, ee_text], update,
+                          sliders=[s_theta1, s_theta2, s_theta3, s_theta4])
+# ARM_RECORD=file.bin records the slider moves, ARM_REPLAY=file.bin plays them back
+session = session_from_env(plt.gcf(), [s_theta1, s_theta2, s_theta3, s_theta4])
 update(None)
 
 plt.show()
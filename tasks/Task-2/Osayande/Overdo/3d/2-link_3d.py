@@ -2,6 +2,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "..", "codes", "kinematics", "toolkit"))
+from blit_render import SliderRenderer  # blitted, rate-limited slider redraws
+from trajectory_recorder import session_from_env  # record / replay sessions
 
 # --- predefined link lengths (in arbitrary units) ---
 L1 = 1.5  # link length 1
@@ -68,10 +72,13 @@ def update(_):
                           [b[2], j[2], e[2]]) # updating the arm position
     ee_text.set_text(f"EE: x={e[0]:.3f}, y={e[1]:.3f}, z={e[2]:.3f}\n"
                      f"θ1={np.rad2deg(th1):.1f}°, θ2={np.rad2deg(th2):.1f}°")
-    plt.draw()
 
-s_theta1.on_changed(update) #
-s_theta2.on_changed(update)
+# the renderer hooks up the sliders, calls update() at most once per display
+# frame and blits only the arm and EE text (ARM_RENDER=draw: full redraws)
+renderer = SliderRenderer(fig, [link_line, ee_text], update,
+                          sliders=[s_theta1, s_theta2])
+# ARM_RECORD=file.bin records the slider moves, ARM_REPLAY=file.bin plays them back
+session = session_from_env(fig, [s_theta1, s_theta2])
 update(None)
 
 plt.show()